@@ -0,0 +1,224 @@
+#! /usr/bin/env python
+
+from argparse import ArgumentParser, Namespace
+from json import dump, load
+from os import chmod, environ, makedirs, path, remove
+from platform import python_version
+from statistics import median
+from subprocess import DEVNULL, run
+from sys import executable
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+from typing import Any, Dict, List, Tuple
+
+ROOT_DIRECTORY: str = path.dirname(path.dirname(path.abspath(__file__)))
+WRUNNER: str = path.join(ROOT_DIRECTORY, "wrunner")
+STUBS: List[str] = ["wine", "wine64", "winepath", "wineserver", "umu-run"]
+DXVK_DLLS: List[str] = ["d3d10core.dll", "d3d11.dll", "d3d9.dll", "dxgi.dll"]
+
+# Format is [ (scenario, [wrunner_arguments]) ], the profile used is always bench-0.
+SCENARIOS: List[Tuple[str, List[str]]] = [
+    ("show-ids-cold-index", ["--show-ids"]),
+    ("show-ids", ["--show-ids"]),
+    ("list-aliases", ["bench-0", "--list-aliases"]),
+    ("run", ["bench-0", "--run", "launcher"]),
+    ("init", ["bench-0", "init"]),
+    ("install-dxvk", ["bench-0", "install-dxvk"]),
+]
+
+STUB: str = """#! /bin/sh
+echo "$0 $*" >> "$WRUNNER_BENCH_CALLS"
+[ "$1" = "--version" ] && echo "wine-9.0 (stub)"
+exit 0
+"""
+
+PROFILE: str = """[profile]
+profile_id = "bench-{i}"
+wine_directory = "{root}/bin"
+umu_directory = "{root}/bin"
+application_directory = "{root}/apps/bench-{i}"
+debug = false
+
+[profile.environment_variables]
+WINEDEBUG = "-all"
+
+[profile.executables_aliases]
+launcher = "{root}/game.exe"
+
+[profile.tools]
+dxvk_directory = "{root}/dxvk"
+"""
+
+
+def createTree(root: str, n_profiles: int) -> None:
+    """
+    createTree
+
+    Creates the stub binaries, a fake DXVK release, a prefix for bench-0 and n_profiles profiles.
+
+    :root: Directory where the tree is created.
+    :n_profiles: Number of profiles.
+    :return:
+    """
+
+    makedirs(path.join(root, "bin"))
+    makedirs(path.join(root, "config/profiles"))
+
+    for stub in STUBS:
+        stub_path: str = path.join(root, "bin", stub)
+
+        with open(stub_path, "w") as fp:
+            fp.write(STUB)
+
+        chmod(stub_path, 0o755)
+
+    for arch in ["x32", "x64"]:
+        makedirs(path.join(root, "dxvk", arch))
+
+        for dll in DXVK_DLLS:
+            with open(path.join(root, "dxvk", arch, dll), "wb") as fp:
+                fp.write(bytes(4096))
+
+    for directory in ["system32", "syswow64"]:
+        makedirs(path.join(root, "apps/bench-0/pfx/drive_c/windows", directory))
+
+    open(path.join(root, "game.exe"), "wb").close()
+
+    for i in range(n_profiles):
+        with open(path.join(root, "config/profiles", f"bench-{i}"), "w") as fp:
+            fp.write(PROFILE.format(i = i, root = root))
+
+
+def countCalls(calls_filepath: str) -> int:
+    """
+    countCalls
+
+    Counts the stub invocations, waiting for processes spawned in the background to finish.
+
+    :calls_filepath: File the stubs append to.
+    :return: The number of subprocesses spawned.
+    """
+
+    count: int = -1
+
+    # --run doesn't wait for the stub, so wait until no new invocation shows up.
+    while True:
+        try:
+            with open(calls_filepath) as fp:
+                new_count: int = len(fp.readlines())
+        except FileNotFoundError:
+            new_count = 0
+
+        if new_count == count: return count
+
+        count = new_count
+        sleep(0.05)
+
+
+def measure(root: str, args: List[str], runs: int, cold_index: bool) -> Dict[str, Any]:
+    """
+    measure
+
+    Runs wrunner several times with the given arguments.
+
+    :root: Directory of the synthetic tree.
+    :args: Arguments passed to wrunner.
+    :runs: Number of runs.
+    :cold_index: Removes the profile index before every run.
+    :return: The median wall time in milliseconds and the subprocesses spawned per run.
+    """
+
+    calls_filepath: str = path.join(root, "calls")
+    index_filepath: str = path.join(root, "config/profiles.index")
+    env: Dict[str, str] = dict(environ)
+    env["WRUNNER_CONFIG_DIR"] = path.join(root, "config")
+    env["WRUNNER_BENCH_CALLS"] = calls_filepath
+    timings: List[float] = []
+    calls: List[int] = []
+
+    for _ in range(runs):
+        if cold_index and path.exists(index_filepath): remove(index_filepath)
+        if path.exists(calls_filepath): remove(calls_filepath)
+
+        start: float = perf_counter()
+        run([executable, WRUNNER, *args], env = env, stdout = DEVNULL, stderr = DEVNULL, cwd = root)
+        timings.append((perf_counter() - start) * 1000)
+        calls.append(countCalls(calls_filepath))
+
+    return {"wall_ms": round(median(timings), 3), "subprocesses": max(calls)}
+
+
+def benchmark(sizes: List[int], runs: int) -> Dict[str, Dict[str, Any]]:
+    """
+    benchmark
+
+    Runs every scenario against every profile tree size.
+
+    :sizes: Numbers of profiles.
+    :runs: Runs per scenario.
+    :return: The results keyed by "<size>/<scenario>".
+    """
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for size in sizes:
+        with TemporaryDirectory() as root:
+            createTree(root, size)
+
+            for scenario, args in SCENARIOS:
+                results[f"{size}/{scenario}"] = measure(root, args, runs, scenario.endswith("cold-index"))
+                print(f"{size:>6} {scenario:<20} {results[f'{size}/{scenario}']['wall_ms']:>10.2f} ms "
+                      f"{results[f'{size}/{scenario}']['subprocesses']:>3} subprocesses")
+
+    return results
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]], threshold: float) -> int:
+    """
+    compare
+
+    Compares the results against a baseline.
+
+    :baseline: Results of a previous run.
+    :current: Results of this run.
+    :threshold: Ratio of the wall time over the baseline considered a regression.
+    :return: The number of regressions.
+    """
+
+    regressions: int = 0
+
+    for key, result in current.items():
+        if key not in baseline: continue
+
+        ratio: float = result["wall_ms"] / baseline[key]["wall_ms"] if baseline[key]["wall_ms"] else 1.0
+        more_calls: bool = result["subprocesses"] > baseline[key]["subprocesses"]
+        regressed: bool = ratio > threshold or more_calls
+        regressions += regressed
+
+        print(f"{key:<28} {baseline[key]['wall_ms']:>10.2f} -> {result['wall_ms']:>10.2f} ms ({ratio:5.2f}x) "
+              f"{baseline[key]['subprocesses']:>3} -> {result['subprocesses']:>3} subprocesses"
+              f"{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description = "Benchmarks wrunner's startup and dispatch against stub binaries.")
+    parser.add_argument("-n", "--runs", type = int, default = 5, help = "Runs per scenario.")
+    parser.add_argument("-s", "--sizes", type = int, nargs = "+", default = [1, 100, 1000, 10000], help = "Numbers of profiles.")
+    parser.add_argument("-o", "--output", default = "bench_output.json", help = "File where the results are written.")
+    parser.add_argument("-c", "--compare", metavar = "BASELINE", help = "Compares the results against a previous output.")
+    parser.add_argument("-t", "--threshold", type = float, default = 1.2, help = "Slowdown ratio considered a regression.")
+
+    namespace: Namespace = parser.parse_args()
+    results: Dict[str, Dict[str, Any]] = benchmark(namespace.sizes, namespace.runs)
+
+    with open(namespace.output, "w") as fp:
+        dump({"python": python_version(), "runs": namespace.runs, "results": results}, fp, indent = 4)
+
+    if not namespace.compare: exit(0)
+
+    with open(namespace.compare) as fp:
+        baseline: Dict[str, Dict[str, Any]] = load(fp)["results"]
+
+    exit(1 if compare(baseline, results, namespace.threshold) else 0)
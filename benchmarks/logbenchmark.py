@@ -0,0 +1,137 @@
+#! /usr/bin/env python
+
+from argparse import ArgumentParser, Namespace
+from json import dump
+from os import O_CREAT, O_TRUNC, O_WRONLY, close, devnull, open as osopen, path
+from platform import python_version
+from statistics import median
+from subprocess import DEVNULL, PIPE, STDOUT, Popen
+from sys import executable, path as sys_path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict, IO, List
+
+ROOT_DIRECTORY: str = path.dirname(path.dirname(path.abspath(__file__)))
+sys_path.insert(0, ROOT_DIRECTORY)
+
+from utils.funcs import _print
+from utils.logforwarder import LogForwarder
+
+# Writes size MiB of WINEDEBUG like lines as fast as possible, so the forwarding is the bottleneck.
+PRODUCER: str = """
+from sys import argv, stdout
+line = b"0024:trace:module:load_dll looking for L\\"C:/windows/system32/d3d11.dll\\" in L\\"C:/Game\\"\\n"
+block = line * ((1 << 20) // len(line))
+for _ in range(int(argv[1]) * (1 << 20) // len(block)): stdout.buffer.write(block)
+"""
+
+
+def forwardLines(cmd: List[str], dst_fd: int) -> None:
+    """
+    forwardLines
+
+    The line by line text forwarding runCommand used to do.
+
+    :cmd: Producer command.
+    :dst_fd: Destination file descriptor.
+    :return:
+    """
+
+    with open(dst_fd, "w", closefd = False) as fs:
+        with Popen(cmd, stdout = PIPE, stderr = STDOUT, text = True, encoding = "utf-8") as p:
+            _stdout: IO[str] | None = p.stdout
+
+            if not _stdout: return
+
+            for l in _stdout: _print(l, fs, end = "")
+
+
+def forwardBytes(cmd: List[str], dst_fd: int) -> None:
+    """
+    forwardBytes
+
+    The LogForwarder, splice or buffer copies.
+
+    :cmd: Producer command.
+    :dst_fd: Destination file descriptor.
+    :return:
+    """
+
+    with Popen(cmd, stdout = PIPE, stderr = STDOUT) as p:
+        if p.stdout: LogForwarder(p.stdout.fileno(), [dst_fd]).run()
+
+
+def openDestination(destination: str, directory: str) -> tuple[int, Popen | None]:
+    """
+    openDestination
+
+    Opens the destination of the forwarded output.
+
+    :destination: One of "devnull", "file" or "pipe", the pipe is drained by cat as a terminal would.
+    :directory: Where the file destination is created.
+    :return: The destination file descriptor and the draining process if any.
+    """
+
+    if destination == "devnull": return osopen(devnull, O_WRONLY), None
+
+    if destination == "file": return osopen(path.join(directory, "log"), O_WRONLY | O_CREAT | O_TRUNC, 0o644), None
+
+    drain: Popen = Popen(["cat"], stdin = PIPE, stdout = DEVNULL)
+
+    return drain.stdin.fileno() if drain.stdin else -1, drain
+
+
+def measure(forward: Callable[[List[str], int], None], destination: str, size: int, runs: int) -> float:
+    """
+    measure
+
+    Forwards the producer's output several times.
+
+    :forward: Forwarding strategy.
+    :destination: Destination of the output.
+    :size: MiB produced per run.
+    :runs: Number of runs.
+    :return: The median throughput in MiB/s.
+    """
+
+    cmd: List[str] = [executable, "-c", PRODUCER, str(size)]
+    timings: List[float] = []
+
+    with TemporaryDirectory() as directory:
+        for _ in range(runs):
+            dst_fd, drain = openDestination(destination, directory)
+
+            start: float = perf_counter()
+            forward(cmd, dst_fd)
+
+            if drain and drain.stdin:
+                drain.stdin.close()
+                drain.wait()
+            else:
+                close(dst_fd)
+
+            timings.append(perf_counter() - start)
+
+    return round(size / median(timings), 1)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description = "Benchmarks the debug log forwarding throughput.")
+    parser.add_argument("-n", "--runs", type = int, default = 3, help = "Runs per scenario.")
+    parser.add_argument("-s", "--size", type = int, default = 256, help = "MiB produced per run.")
+    parser.add_argument("-o", "--output", help = "File where the results are written as json.")
+
+    namespace: Namespace = parser.parse_args()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for destination in ["devnull", "file", "pipe"]:
+        lines: float = measure(forwardLines, destination, namespace.size, namespace.runs)
+        forwarder: float = measure(forwardBytes, destination, namespace.size, namespace.runs)
+        results[destination] = {"lines_mib_s": lines, "forwarder_mib_s": forwarder}
+
+        print(f"{destination:<8} lines {lines:>9.1f} MiB/s  forwarder {forwarder:>9.1f} MiB/s ({forwarder / lines:5.1f}x)")
+
+    if not namespace.output: exit(0)
+
+    with open(namespace.output, "w") as fp:
+        dump({"python": python_version(), "size_mib": namespace.size, "results": results}, fp, indent = 4)
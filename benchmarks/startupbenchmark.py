@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+
+from argparse import ArgumentParser, Namespace
+from os import O_RDONLY, POSIX_FADV_DONTNEED, close, environ, open as oopen, path, posix_fadvise, walk
+from statistics import median
+from subprocess import DEVNULL, run
+from sys import executable, path as sys_path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+ROOT_DIRECTORY: str = path.dirname(path.dirname(path.abspath(__file__)))
+sys_path.insert(0, path.join(ROOT_DIRECTORY, "tools"))
+
+from buildzipapp import build
+
+
+def evictFromPageCache(paths: List[str]) -> None:
+    """
+    evictFromPageCache
+
+    Asks the kernel to drop the given files (and every file under the given directories) from the page cache,
+    the closest to a cold start after boot that doesn't need root.
+
+    :paths: Files or directories.
+    :return:
+    """
+
+    files: List[str] = []
+
+    for p in paths:
+        if path.isfile(p):
+            files.append(p)
+
+            continue
+
+        for dirpath, _, filenames in walk(p):
+            files.extend(path.join(dirpath, f) for f in filenames)
+
+    for f in files:
+        fd: int = oopen(f, O_RDONLY)
+
+        try:
+            posix_fadvise(fd, 0, 0, POSIX_FADV_DONTNEED)
+        finally:
+            close(fd)
+
+
+def measure(cmd: List[str], env: Dict[str, str], runs: int, cold_paths: List[str] | None, pycache_root: str) -> float:
+    """
+    measure
+
+    Runs a command several times.
+
+    :cmd: The command to be measured.
+    :env: Environment of the command.
+    :runs: Number of runs.
+    :cold_paths: Paths evicted from the page cache before every run, when measuring a cold start.
+    :pycache_root: Directory under which the bytecode cache is written.
+    :return: The median wall time in milliseconds.
+    """
+
+    timings: List[float] = []
+
+    for i in range(runs):
+        run_env: Dict[str, str] = dict(env)
+
+        # A fresh bytecode cache per run forces the source tree to be compiled again.
+        run_env["PYTHONPYCACHEPREFIX"] = path.join(pycache_root, str(i) if cold_paths is not None else "warm")
+
+        if cold_paths is not None: evictFromPageCache(cold_paths)
+
+        start: float = perf_counter()
+        run(cmd, env = run_env, stdout = DEVNULL, stderr = DEVNULL, check = True)
+        timings.append((perf_counter() - start) * 1000)
+
+    return median(timings)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description = "Compares cold and warm starts of the source tree and the zipapp.")
+    parser.add_argument("-n", "--runs", type = int, default = 20, help = "Runs per measurement.")
+    parser.add_argument("args", nargs = "*", default = ["--show-ids"], help = "Arguments passed to wrunner.")
+
+    namespace: Namespace = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        bundle: str = path.join(tmp, "wrunner")
+        build(bundle, 1, executable)
+
+        env: Dict[str, str] = dict(environ)
+        env.setdefault("WRUNNER_CONFIG_DIR", path.join(tmp, "config"))
+
+        source_cmd: List[str] = [executable, path.join(ROOT_DIRECTORY, "wrunner"), *namespace.args]
+        bundle_cmd: List[str] = [executable, bundle, *namespace.args]
+        source_paths: List[str] = [path.join(ROOT_DIRECTORY, p) for p in ["wrunner", "handlers", "utils"]]
+
+        # Sets up the configuration directory and the profile index, so only startup is measured.
+        run(source_cmd, env = env, stdout = DEVNULL, stderr = DEVNULL)
+
+        results: Dict[str, float] = {
+            "source cold": measure(source_cmd, env, namespace.runs, source_paths, path.join(tmp, "pycache-source")),
+            "source warm": measure(source_cmd, env, namespace.runs, None, path.join(tmp, "pycache-source")),
+            "bundle cold": measure(bundle_cmd, env, namespace.runs, [bundle], path.join(tmp, "pycache-bundle")),
+            "bundle warm": measure(bundle_cmd, env, namespace.runs, None, path.join(tmp, "pycache-bundle")),
+        }
+
+    print(f"wrunner {' '.join(namespace.args)} ({namespace.runs} runs, median)")
+
+    for name, value in results.items():
+        print(f"{name:<12} {value:8.2f} ms")
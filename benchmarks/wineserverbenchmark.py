@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+
+from argparse import ArgumentParser, Namespace
+from os import environ, path
+from statistics import median
+from subprocess import DEVNULL, run
+from sys import path as sys_path
+from time import perf_counter
+from typing import Dict, List
+
+sys_path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from utils.wineserver import WineserverSession
+
+
+# A cheap command that still needs the wineserver and the prefix's registry.
+COMMAND: List[str] = ["reg", "query", r"HKEY_CURRENT_USER\Software\Wine"]
+
+
+def runCommands(wine: str, env: Dict[str, str], commands: int) -> float:
+    """
+    runCommands
+
+    :wine: Path to the wine binary.
+    :env: Environment with WINEPREFIX.
+    :commands: Number of commands run in a row.
+    :return: The wall time in milliseconds.
+    """
+
+    start: float = perf_counter()
+
+    for _ in range(commands):
+        run([wine, *COMMAND], env = env, stdout = DEVNULL, stderr = DEVNULL)
+
+    return (perf_counter() - start) * 1000
+
+
+def benchmark(wine_directory: str, prefix: str, commands: int, runs: int) -> None:
+    """
+    benchmark
+
+    Runs the commands with wine's own wineserver handling (started by the first command, and again after
+    the default persistence of 3 seconds if nothing uses it) and within a wineserver session like the one
+    install-dxvk uses.
+
+    :wine_directory: Directory with the wine and wineserver binaries.
+    :prefix: Path to an existing prefix.
+    :commands: Commands per run, install-dxvk runs up to 8.
+    :runs: Runs per scenario.
+    :return:
+    """
+
+    wine: str = path.join(wine_directory, "wine")
+    wineserver: str = path.join(wine_directory, "wineserver")
+    env: Dict[str, str] = {**environ, "WINEPREFIX": prefix, "WINEDEBUG": "-all"}
+    cold: List[float] = []
+    session: List[float] = []
+
+    for _ in range(runs):
+        run([wineserver, "-k"], env = env, stdout = DEVNULL, stderr = DEVNULL)
+        run([wineserver, "-w"], env = env)
+        cold.append(runCommands(wine, env, commands))
+
+        run([wineserver, "-k"], env = env, stdout = DEVNULL, stderr = DEVNULL)
+        run([wineserver, "-w"], env = env)
+
+        start: float = perf_counter()
+        wineserver_session: WineserverSession = WineserverSession(wineserver, prefix, env, 2)
+        wineserver_session.start()
+        runCommands(wine, env, commands)
+        wineserver_session.stop(kill = True)
+        session.append((perf_counter() - start) * 1000)
+
+    print(f"{'no session':<12} {median(cold):>10.2f} ms")
+    print(f"{'session':<12} {median(session):>10.2f} ms")
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description = "Benchmarks wine commands run with and without a wineserver session.")
+    parser.add_argument("wine_directory", help = "Directory with the wine and wineserver binaries.")
+    parser.add_argument("prefix", help = "Path to an existing prefix, its wineserver is killed between runs.")
+    parser.add_argument("-c", "--commands", type = int, default = 8, help = "Commands per run.")
+    parser.add_argument("-n", "--runs", type = int, default = 5, help = "Runs per scenario.")
+
+    namespace: Namespace = parser.parse_args()
+
+    benchmark(namespace.wine_directory, namespace.prefix, namespace.commands, namespace.runs)
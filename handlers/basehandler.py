@@ -1,10 +1,23 @@
 from abc import ABC
-from subprocess import Popen, PIPE, DEVNULL, STDOUT, run
-from shutil import rmtree
-from sys import stderr
-from os import environ, path, chdir, mkdir
-from typing import List, Dict, IO, Callable, Optional, NoReturn
-from utils.funcs import die, negate, _print, restoreEnvar
+from contextlib import contextmanager
+from subprocess import CompletedProcess, Popen, PIPE, DEVNULL, STDOUT, run
+from sys import exit, stderr, stdout
+from os import O_CREAT, O_TRUNC, O_WRONLY, close, devnull, dup2, execvpe, path, chdir, mkdir, remove, rename
+from os import open as osopen, sched_getaffinity, wait4, waitpid, waitstatus_to_exitcode
+from time import monotonic
+from typing import TYPE_CHECKING, Any, List, Dict, IO, Callable, Generator, Mapping, NoReturn, Set
+from utils.funcs import copyFile, die, handleExceptionIfAny, negate, _print
+from utils.environment import Environment
+from utils.probecache import ProbeCache
+from utils.tracer import tracer
+
+# The modules of the optional features are imported by the options and the verbs using them.
+if TYPE_CHECKING:
+    from utils.launchhistory import LaunchKey, Usage
+    from utils.launchwrappers import Wrapper
+    from utils.prefixprocesses import PrefixProcess
+    from utils.procsampler import ProcessSampler
+    from utils.scheduling import Scheduling
 
 
 class BaseHandler(ABC):
@@ -22,29 +35,68 @@ class BaseHandler(ABC):
     :environment_variables: The environment variables to be used within wine's environment.
     :debug: Tell whether should display logs.
     :debug_filepath: Path to the file where logs should be saved if debug is set to true.
+    :launch_mode: How applications are launched, "spawn" or "exec" to replace wrunner with the application.
+    :log_options: LogSink options from the [profile.logging] table, None to keep writing to debug_filepath.
+    :accounting: Waits for the launched applications and records the resources they used in the launch history.
+    :sampling_interval: Seconds between samples of the launched applications' processes, None to not sample them.
+    :scheduling_options: Scheduling options from the [profile.scheduling] table.
+    :dry_run: Prints the commands and their settings instead of running them.
+    :launch_wrappers: Commands placed in front of the runner when launching applications, the first is the outermost.
+    :environment: (Optional) Environment the handler's environment is built on, defaults to wrunner's own environment.
+    :wineserver_options: (Optional) Options from the [profile.wineserver] table, "session" and "persist".
     """
 
+    # Seconds the prefix's processes have to exit on kill-all before they're killed.
+    _KILL_TIMEOUT: float = 1.0
+
     def __init__(
         self,
         profile_id: str,
         wine_bin_path: str | None,
         wine64_bin_path: str | None,
         application_directory: str,
-        runner: Callable[[str, Optional[List[str]]], None],
+        runner: Callable[..., None],
         executables_aliases: Dict[str, str],
         environment_variables: Dict[str, str] | None = None,
         debug: bool = False,
-        debug_filepath: str | None = None
+        debug_filepath: str | None = None,
+        launch_mode: str = "spawn",
+        log_options: Dict[str, Any] | None = None,
+        accounting: bool = False,
+        sampling_interval: float | None = None,
+        scheduling_options: Dict[str, Any] | None = None,
+        dry_run: bool = False,
+        launch_wrappers: List["Wrapper"] | None = None,
+        environment: Environment | None = None,
+        wineserver_options: Dict[str, Any] | None = None
     ):
         self._profile_id: str                                   = profile_id
         self._wine_bin_path: str | None                         = wine_bin_path
         self._wine64_bin_path: str | None                       = wine64_bin_path
         self._application_directory: str                        = application_directory
-        self._runner: Callable[[str, Optional[List[str]]], None]= runner
+        self._runner: Callable[..., Usage | None]               = runner
         self._executables_aliases: Dict[str, str]               = executables_aliases
         self._prefix: str                                       = path.join(application_directory, "pfx")
         self._debug: bool                                       = debug
         self._debug_filepath: str | None                        = debug_filepath
+        self._launch_mode: str                                  = launch_mode
+        self._log_options: Dict[str, Any] | None                = log_options
+        self._accounting: bool                                  = accounting
+        self._sampling_interval: float | None                   = sampling_interval
+        self._scheduling: Scheduling | None                     = None
+        self._dry_run: bool                                     = dry_run
+        self._launch_wrappers: List[Wrapper]                    = launch_wrappers if launch_wrappers else []
+        self._probe_cache: ProbeCache                           = ProbeCache()
+        self._prefix_arch: str | None                           = None
+        self._environment: Environment                          = environment if environment else Environment()
+        self._wineserver_options: Dict[str, Any]                = wineserver_options if wineserver_options \
+                                                                  else {"session": True, "persist": 300}
+
+        if scheduling_options:
+            # Only needed when the profile has a [profile.scheduling] table.
+            from utils.scheduling import Scheduling
+
+            self._scheduling = Scheduling(**scheduling_options)
 
         if self._wine_bin_path and not path.exists(self._wine_bin_path):
             _print(f"Wine binary not found at: {self._wine_bin_path}", stderr)
@@ -55,160 +107,487 @@ class BaseHandler(ABC):
             _print(f"Defaulting to system's wine: {self._wine_bin_path}", stderr)
 
         if self._wine_bin_path:
-            status_code: int = self.runCommandStatusChecked([self._wine_bin_path, "--version"]) \
-                               if path.exists(self._wine_bin_path) else -1
-
-            if status_code != 0:
-                die(f"Wine binary not found at: {self._wine_bin_path}. Exiting...")
+            with tracer.phase("BaseHandler.__init__ version probe"):
+                if not self._probeVersion(self._wine_bin_path):
+                    die(f"Wine binary not found at: {self._wine_bin_path}. Exiting...")
 
-            environ["PATH"] += ":" + path.dirname(self._wine_bin_path)
+            self._environment = self._environment.withPath(path.dirname(self._wine_bin_path))
 
-        environ["WINEPREFIX"] = self._prefix
+        self._environment = self._environment.updated({"WINEPREFIX": self._prefix})
 
-        if environment_variables: self._setEnvironmentVariables(environment_variables)
+        if environment_variables: self._environment = self._environment.updated(environment_variables)
 
-        self._keepConsistentSyncMethod()
+        with tracer.phase("_keepConsistentSyncMethod"):
+            self._environment = self._environment.updated(self._keepConsistentSyncMethod(self._environment))
 
         if path.exists(self._prefix) and self._wine_bin_path and self._wine64_bin_path:
-            if self.runCommandStatusChecked([self._wine64_bin_path, "winepath"]) == 0:
-                environ["WINE"] = self._wine64_bin_path
-            elif self.runCommandStatusChecked([self._wine_bin_path, "winepath"]) == 0:
-                environ["WINE"] = self._wine_bin_path
-            else:
-                die(f"Failed to check if the prefix {self._prefix} is 32 or 64 bits.")
+            with tracer.phase("BaseHandler.__init__ prefix probe"):
+                prefix_wine_path: str | None = self._getPrefixWinePath()
+
+                if not prefix_wine_path: die(f"Failed to check if the prefix {self._prefix} is 32 or 64 bits.")
+
+                self._environment = self._environment.updated({"WINE": prefix_wine_path})
 
-        default_wine_path: str | None = environ.get("WINE")
+        default_wine_path: str | None = self._environment.get("WINE")
 
         self._default_wine_path: str | None = default_wine_path if default_wine_path \
                                                                 else self._wine64_bin_path if self._wine64_bin_path \
                                                                 else self._wine_bin_path
 
 
+    def _probeVersion(self, bin_path: str, fallback: str | None = None) -> str | None:
+        """
+        _probeVersion
+
+        Gets the version of a binary with --version, only running it if the binary changed since the last probe.
+
+        :bin_path: Path to the binary.
+        :fallback: (Optional) Version cached if --version fails, for binaries already known to be executable
+                   whose older releases have no --version.
+        :return: The first line printed by the binary, the fallback or None if the binary doesn't work.
+        """
+
+        version: str | None = self._probe_cache.get("version", bin_path)
+
+        if version: return version
+
+        if not path.exists(bin_path): return None
+
+        p: CompletedProcess[str] = run([bin_path, "--version"], stdout = PIPE, stderr = DEVNULL, text = True)
+
+        version = (p.stdout.strip().split("\n", 1)[0] or "unknown") if p.returncode == 0 else fallback
+
+        if version: self._probe_cache.set("version", bin_path, version)
+
+        return version
+
+
+    def _detectPrefixArch(self) -> str | None:
+        """
+        _detectPrefixArch
+
+        Detects the prefix architecture from its files, without launching wine.
+        system.reg starts with a "#arch=win32" or "#arch=win64" header, and only 64 bits prefixes
+        (including new WoW64 ones) have a syswow64 directory.
+
+        :return: "win32", "win64" or None if the files are missing or contradict each other.
+        """
+
+        header_arch: str | None = None
+
+        try:
+            with open(path.join(self._prefix, "system.reg"), "rb") as fp:
+                for line in fp.read(512).splitlines():
+                    if line.startswith(b"#arch="):
+                        header_arch = line[6:].strip().decode(errors = "replace")
+
+                        break
+        except OSError:
+            pass
+
+        windows_directory: str = path.join(self._prefix, "drive_c/windows")
+        directory_arch: str | None = None if not path.isdir(windows_directory) \
+                                     else "win64" if path.isdir(path.join(windows_directory, "syswow64")) \
+                                     else "win32"
+
+        if header_arch not in ["win32", "win64", None]: return None
+
+        if header_arch and directory_arch and header_arch != directory_arch: return None
+
+        return header_arch or directory_arch
+
+
+    def _probePrefixWine(self) -> str | None:
+        """
+        _probePrefixWine
+
+        Finds which wine binary works with the prefix by running winepath, wine64 for 64 bits prefixes and wine
+        for 32 bits ones. Only used when the prefix files are ambiguous, the result is cached for the prefix
+        and the wine binary.
+
+        :return: The path to the wine binary that works with the prefix or None if none of them works.
+        """
+
+        if not self._wine_bin_path or not self._wine64_bin_path: return None
+
+        cached: str | None = self._probe_cache.get("prefix-wine", self._wine_bin_path, self._prefix)
+
+        if cached in [self._wine64_bin_path, self._wine_bin_path]: return cached
+
+        prefix_wine_path: str | None = None
+
+        if self.runCommandStatusChecked([self._wine64_bin_path, "winepath"], self._environment) == 0:
+            prefix_wine_path = self._wine64_bin_path
+        elif self.runCommandStatusChecked([self._wine_bin_path, "winepath"], self._environment) == 0:
+            prefix_wine_path = self._wine_bin_path
+
+        if prefix_wine_path:
+            self._probe_cache.set("prefix-wine", self._wine_bin_path, prefix_wine_path, self._prefix)
+
+        return prefix_wine_path
+
+
+    def _getPrefixArch(self) -> str | None:
+        """
+        _getPrefixArch
+
+        Gets the prefix architecture, falling back to launching wine only when the prefix files are ambiguous.
+
+        :return: "win32", "win64" or None if it couldn't be found out.
+        """
+
+        if self._prefix_arch: return self._prefix_arch
+
+        self._prefix_arch = self._detectPrefixArch()
+
+        if self._prefix_arch: return self._prefix_arch
+
+        prefix_wine_path: str | None = self._probePrefixWine()
+
+        self._prefix_arch = None if not prefix_wine_path \
+                            else "win64" if prefix_wine_path == self._wine64_bin_path \
+                            else "win32"
+
+        return self._prefix_arch
+
+
+    def _getPrefixWinePath(self) -> str | None:
+        """
+        _getPrefixWinePath
+
+        :return: The path to the wine binary that works with the prefix or None if the architecture is unknown.
+        """
+
+        arch: str | None = self._getPrefixArch()
+
+        if arch == "win32": return self._wine_bin_path
+
+        if arch != "win64": return None
+
+        # New WoW64 builds ship a single wine loader for both architectures.
+        return self._wine64_bin_path if self._wine64_bin_path and path.exists(self._wine64_bin_path) \
+                                     else self._wine_bin_path
+
+
+    def isPrefix64Bit(self) -> bool:
+        """
+        isPrefix64Bit
+
+        :return: True if the prefix is a 64 bits prefix.
+        """
+
+        return self._getPrefixArch() == "win64"
+
+
     @staticmethod
-    def _keepConsistentSyncMethod() -> None:
+    def _keepConsistentSyncMethod(environment: Environment) -> Dict[str, str]:
         """
         _keepConsistentSyncMethod
 
         Keeps consistent method of synchronization chosen.
 
-        :return:
+        :environment: The environment with the synchronization variables specified, if any.
+        :return: The synchronization variables to be set.
         """
 
         sync_methods: List[str] = ["WINEESYNC", "PROTON_NO_ESYNC", "WINEFSYNC", "PROTON_NO_FSYNC"]
+        variables: Dict[str, str] = dict(environment)
         sync_methods_specified: Dict[str, str] = {}
 
-        for k, v in environ.items():
+        for k, v in variables.items():
             if k in sync_methods:
                 sync_methods_specified[k] = v
 
         if not sync_methods_specified:
-            environ["WINEFSYNC"] = "1"
-            environ["PROTON_NO_FSYNC"] = "0"
-            environ["WINEESYNC"] = "0"
-            environ["PROTON_NO_ESYNC"] = "1"
+            variables["WINEFSYNC"] = "1"
+            variables["PROTON_NO_FSYNC"] = "0"
+            variables["WINEESYNC"] = "0"
+            variables["PROTON_NO_ESYNC"] = "1"
 
-            return
+            return {k: variables[k] for k in sync_methods}
 
         for key, str_value in sync_methods_specified.items():
             value: int = int(str_value) if str_value.isdigit() else 0 if key != "PROTON_NO_FSYNC" and key != "PROTON_NO_ESYNC" else 1
 
             if key == "WINEESYNC":
-                environ["WINEESYNC"]        = str(value)
-                environ["PROTON_NO_ESYNC"]  = str(negate(value))
+                variables["WINEESYNC"]        = str(value)
+                variables["PROTON_NO_ESYNC"]  = str(negate(value))
 
-                wine_fsync: str | None      = environ.get("WINEFSYNC") if environ["WINEESYNC"] == "0" else "0"
-                environ["WINEFSYNC"]        = wine_fsync if wine_fsync else "0"
-                environ["PROTON_NO_FSYNC"]  = str(negate(int(environ["WINEFSYNC"])))
+                wine_fsync: str | None        = variables.get("WINEFSYNC") if variables["WINEESYNC"] == "0" else "0"
+                variables["WINEFSYNC"]        = wine_fsync if wine_fsync else "0"
+                variables["PROTON_NO_FSYNC"]  = str(negate(int(variables["WINEFSYNC"])))
 
                 continue
 
             if key == "PROTON_NO_ESYNC":
-                environ["WINEESYNC"]        = str(negate(value))
-                environ["PROTON_NO_ESYNC"]  = str(value)
+                variables["WINEESYNC"]        = str(negate(value))
+                variables["PROTON_NO_ESYNC"]  = str(value)
 
-                wine_fsync: str | None      = environ.get("WINEFSYNC") if environ["WINEESYNC"] == "0" else "0"
-                environ["WINEFSYNC"]        = wine_fsync if wine_fsync else "0"
-                environ["PROTON_NO_FSYNC"]  = str(negate(int(environ["WINEFSYNC"])))
+                wine_fsync: str | None        = variables.get("WINEFSYNC") if variables["WINEESYNC"] == "0" else "0"
+                variables["WINEFSYNC"]        = wine_fsync if wine_fsync else "0"
+                variables["PROTON_NO_FSYNC"]  = str(negate(int(variables["WINEFSYNC"])))
 
                 continue
 
             if key == "WINEFSYNC":
-                environ["WINEFSYNC"]        = str(value)
-                environ["PROTON_NO_FSYNC"]  = str(negate(value))
+                variables["WINEFSYNC"]        = str(value)
+                variables["PROTON_NO_FSYNC"]  = str(negate(value))
 
-                wine_esync: str | None      = environ.get("WINEESYNC") if environ["WINEFSYNC"] == "0" else "0"
-                environ["WINEESYNC"]        = wine_esync if wine_esync else "0"
-                environ["PROTON_NO_ESYNC"]  = str(negate(int(environ["WINEESYNC"])))
+                wine_esync: str | None        = variables.get("WINEESYNC") if variables["WINEFSYNC"] == "0" else "0"
+                variables["WINEESYNC"]        = wine_esync if wine_esync else "0"
+                variables["PROTON_NO_ESYNC"]  = str(negate(int(variables["WINEESYNC"])))
 
                 continue
 
             if key == "PROTON_NO_FSYNC":
-                environ["WINEFSYNC"] = str(negate(value))
-                environ["PROTON_NO_FSYNC"] = str(value)
+                variables["WINEFSYNC"]        = str(negate(value))
+                variables["PROTON_NO_FSYNC"]  = str(value)
 
-                wine_esync: str | None      = environ.get("WINEESYNC") if environ["WINEFSYNC"] == "0" else "0"
-                environ["WINEESYNC"]        = wine_esync if wine_esync else "0"
-                environ["PROTON_NO_ESYNC"]  = str(negate(int(environ["WINEESYNC"])))
+                wine_esync: str | None        = variables.get("WINEESYNC") if variables["WINEFSYNC"] == "0" else "0"
+                variables["WINEESYNC"]        = wine_esync if wine_esync else "0"
+                variables["PROTON_NO_ESYNC"]  = str(negate(int(variables["WINEESYNC"])))
 
                 continue
 
+        return {k: variables[k] for k in sync_methods if k in variables}
+
 
     @staticmethod
-    def _setEnvironmentVariables(environment_variables: Dict[str, str]) -> None:
+    def runCommandStatusChecked(cmd: List[str], env: Mapping[str, str] | None = None) -> int:
         """
-        _setEnvironmentVariables
+        runCommandStatusChecked
 
-        Sets the environment variables.
+        Run a command without producing any logging and return the command exit code.
 
-        :environment_variables: environemnt variables.
+        :cmd: A list with a command as first element and its arguments.
+        :env: (Optional) Environment of the command, defaults to wrunner's own environment.
+        :return: Return code of the command.
+        """
+
+        return run(cmd, stdout = DEVNULL, stderr = DEVNULL, env = env).returncode
+
+
+    def _execCommand(self, cmd: List[str], cwd: str | None = None) -> NoReturn:
+        """
+        _execCommand
+
+        Replaces the wrunner process with the command, so no Python process stays resident while it runs,
+        signals and the exit code go straight to the caller. The profile's logs are written to a single file
+        as nothing is left to rotate them, with a crash buffer they're discarded as nothing is left to hold it,
+        and the profile's scheduling is applied to wrunner itself as it becomes the command.
+
+        :cmd: A list with a command as first element and its arguments.
+        :cwd: (Optional) Working directory of the command.
         :return:
         """
 
-        for k, v in environment_variables.items():
-            environ[k] = v
+        debug: bool = self._debug
+        debug_filepath: str | None = self._debug_filepath
+        log_options: Dict[str, Any] | None = self._log_options
+
+        if debug and log_options and log_options.get("crash_buffer_size"):
+            # Writing the whole session instead would defeat the crash buffer, whose logs never touch the disk.
+            _print("crash_buffer_size is ignored in exec mode, no wrunner process is left to hold the logs, they're discarded.", stderr)
+            debug = False
+        elif debug and log_options:
+            from utils.logsink import LogSink
+
+            debug_filepath = handleExceptionIfAny("Failed to create the logs directory", True, LogSink(**log_options).sessionFilepath)
+
+        tracer.instant("execvpe", {"cmd": cmd})
+        tracer.write()
+
+        stdout.flush()
+        stderr.flush()
+
+        if not debug or debug_filepath:
+            fd: int = osopen(debug_filepath, O_WRONLY | O_CREAT | O_TRUNC, 0o644) if debug and debug_filepath \
+                      else osopen(devnull, O_WRONLY)
+
+            dup2(fd, 1)
+            dup2(fd, 2)
+            close(fd)
+
+        if self._scheduling: self._scheduling.apply()
+
+        if cwd: chdir(cwd)
+
+        execvpe(cmd[0], cmd, {**self._environment, "LC_ALL": "C"})
 
 
     @staticmethod
-    def runCommandStatusChecked(cmd: List[str]) -> int:
+    def _waitForChildren() -> None:
         """
-        runCommandStatusChecked
+        _waitForChildren
 
-        Run a command without producing any logging and return the command exit code.
+        Waits for every process spawned by wrunner that is still running.
 
-        :cmd: A list with a command as first element and its arguments.
-        :return: Return code of the command.
+        :return:
         """
 
-        return run(cmd, stdout = DEVNULL, stderr = DEVNULL).returncode
+        while True:
+            try:
+                waitpid(-1, 0)
+            except ChildProcessError:
+                return
 
 
     @staticmethod
+    def _reapProcess(p: Popen[Any], start: float) -> "Usage":
+        """
+        _reapProcess
+
+        Waits for the process with wait4, which also reports the resources it used.
+
+        :p: The spawned process.
+        :start: Monotonic time from before the process was spawned.
+        :return: The resources used by the process.
+        """
+
+        _, status, rusage = wait4(p.pid, 0)
+        p.returncode = waitstatus_to_exitcode(status)
+
+        return (
+            monotonic() - start,
+            rusage.ru_utime,
+            rusage.ru_stime,
+            rusage.ru_maxrss,
+            rusage.ru_inblock,
+            rusage.ru_oublock,
+            p.returncode
+        )
+
+
+    def launchCommand(
+        self,
+        cmd: List[str],
+        exe: str,
+        exec_replace: bool = False,
+        account: bool = False,
+        sampler: "ProcessSampler | None" = None,
+        cwd: str | None = None,
+        wrap: bool = False
+    ) -> "Usage | None":
+        """
+        launchCommand
+
+        Launches a command with the profile's settings, placing the launch wrappers in front of the runner
+        when launching an application.
+
+        :cmd: A list with the runner as first element and its arguments.
+        :exe: The program launched by the runner, for the {exe} and {exe_directory} template fields.
+        :exec_replace: (Optional) Replaces wrunner with the command instead of spawning it.
+        :account: (Optional) Waits for the command so its resource usage is known.
+        :sampler: (Optional) Samples the command's process tree while it runs.
+        :cwd: (Optional) Working directory of the command.
+        :wrap: (Optional) Places the launch wrappers in front of the runner, only for applications, not wine's tools.
+        :return: The resources used by the command if it was waited for.
+        """
+
+        if wrap and self._launch_wrappers:
+            # Only needed when the profile has launch wrappers.
+            from utils.launchwrappers import LaunchWrappers
+            from utils.scheduling import formatCPUList
+
+            affinity: Set[int] | None = self._scheduling.getAffinity() if self._scheduling else None
+
+            cmd = LaunchWrappers(self._launch_wrappers, self._probe_cache).wrap(cmd, {
+                "profile_id": self._profile_id,
+                "prefix": self._prefix,
+                "application_directory": self._application_directory,
+                "exe": exe,
+                "exe_directory": path.dirname(exe),
+                "affinity": formatCPUList(affinity if affinity else sched_getaffinity(0))
+            }, self._environment.get("PATH", ""))
+
+        return self.runCommand(cmd, exec_replace, account, sampler, cwd)
+
+
     def runCommand(
+        self,
         cmd: List[str],
-        debug: bool = False,
-        debug_filepath: str | None = None
-    ) -> None:
+        exec_replace: bool = False,
+        account: bool = False,
+        sampler: "ProcessSampler | None" = None,
+        cwd: str | None = None,
+        output: str = "profile"
+    ) -> "Usage | None":
         """
         runCommand
 
-        Spawns a new process.
+        Spawns a new process with the handler's environment, or prints it with --dry-run.
 
         :cmd: A list with a command as first element and its arguments.
-        :debug: Tell whether it should log to the command line.
-        :debug_filepath: The path to  the file to write logs in.
-        :return:
+        :exec_replace: (Optional) Replaces wrunner with the command instead of spawning it.
+        :account: (Optional) Waits for the command even without debug, so its resource usage is known.
+        :sampler: (Optional) Samples the command's process tree while it runs, the command is waited for.
+        :cwd: (Optional) Working directory of the command.
+        :output: (Optional) "profile" to apply the profile's debug, logging and scheduling settings to the command,
+                 "terminal" to always display its logs, or "none" to discard them.
+        :return: The resources used by the command if it was waited for.
         """
 
+        scheduling: Scheduling | None = self._scheduling if output == "profile" else None
+
+        if self._dry_run:
+            # Only needed for --dry-run.
+            from shlex import join
+
+            _print(join(cmd))
+
+            if scheduling: _print("    " + scheduling.describe().replace("\n", "\n    "))
+
+            return None
+
+        if exec_replace: self._execCommand(cmd, cwd)
+
+        debug: bool = self._debug if output == "profile" else output == "terminal"
+        debug_filepath: str | None = self._debug_filepath if output == "profile" else None
+        log_options: Dict[str, Any] | None = self._log_options if output == "profile" else None
+        preexec_fn: Callable[[], None] | None = scheduling.apply if scheduling else None
+
         fd: int = PIPE if debug else DEVNULL
-        lc_all: str | None = environ.get("LC_ALL")
-        environ["LC_ALL"] = "C"
+        launch_env: Dict[str, str] = {**self._environment, "LC_ALL": "C"}
+        usage: Usage | None = None
+        start: float = monotonic()
 
         if not debug:
-            Popen(cmd, stdout = fd, stderr = STDOUT)
+            with tracer.phase("Popen", {"cmd": cmd}):
+                p: Popen[bytes] = Popen(cmd, stdout = fd, stderr = STDOUT, preexec_fn = preexec_fn, env = launch_env, cwd = cwd)
 
-            restoreEnvar("LC_ALL", lc_all)
+            if sampler: sampler.start(p.pid)
+            if account or sampler: usage = self._reapProcess(p, start)
+            if sampler: sampler.stop()
 
-            return
+            return usage
+
+        if debug and log_options:
+            # Only needed when the profile has a [profile.logging] table.
+            from utils.logforwarder import LogForwarder
+            from utils.logsink import LogSink
+
+            sink: LogSink = LogSink(**log_options)
+            handleExceptionIfAny("Failed to create the session's log file", True, sink.open)
+
+            try:
+                with Popen(cmd, stdout = PIPE, stderr = STDOUT, preexec_fn = preexec_fn, env = launch_env, cwd = cwd) as p:
+                    tracer.instant("Popen", {"cmd": cmd})
+
+                    if sampler: sampler.start(p.pid)
+
+                    if p.stdout: LogForwarder(p.stdout.fileno(), [], [sink.write]).run()
+
+                    usage = self._reapProcess(p, start)
+
+                    if sampler: sampler.stop()
+            finally:
+                # A negative return code means it was killed by a signal, None that wrunner was interrupted.
+                crash_filepath: str | None = sink.close(usage[6] != 0 if usage else True)
+
+            if crash_filepath:
+                _print(f"{cmd[0]} exited with status {p.returncode}, its last logs were written to: {crash_filepath}", stderr)
+
+            return usage
 
         if debug and debug_filepath:
             with open(debug_filepath, 'w') as f:
@@ -216,31 +595,41 @@ class BaseHandler(ABC):
                     cmd,
                     stdout = f,
                     stderr = STDOUT,
+                    preexec_fn = preexec_fn,
+                    env = launch_env,
+                    cwd = cwd,
                     text = True,
                     encoding="utf-8"
-                ) as p: pass
+                ) as p:
+                    tracer.instant("Popen", {"cmd": cmd})
 
-            restoreEnvar("LC_ALL", lc_all)
+                    if sampler: sampler.start(p.pid)
 
-            return
+                    usage = self._reapProcess(p, start)
 
-        with Popen(
-            cmd,
-            stdout = fd,
-            stderr = STDOUT,
-            text = True,
-            encoding="utf-8"
-        ) as p:
-            _stdout: IO[str] | None = p.stdout
+                    if sampler: sampler.stop()
 
-            if not _stdout:
-                restoreEnvar("LC_ALL", lc_all)
+            return usage
 
-                return
+        # Only needed when the logs are displayed.
+        from utils.logforwarder import LogForwarder
+
+        with Popen(cmd, stdout = fd, stderr = STDOUT, preexec_fn = preexec_fn, env = launch_env, cwd = cwd) as p:
+            tracer.instant("Popen", {"cmd": cmd})
+
+            if sampler: sampler.start(p.pid)
+
+            _stdout: IO[bytes] | None = p.stdout
 
-            for l in _stdout: _print(l, end = "")
+            if _stdout:
+                stdout.flush()
+                LogForwarder(_stdout.fileno(), [stdout.fileno()]).run()
 
-            restoreEnvar("LC_ALL", lc_all)
+            usage = self._reapProcess(p, start)
+
+            if sampler: sampler.stop()
+
+        return usage
 
 
     def runExe(
@@ -257,29 +646,89 @@ class BaseHandler(ABC):
         """
 
         exe: str | None = args[0] if  args else None
+        runner_args: List[str] | None = None
+        alias: str | None = None
+
+        with tracer.phase("runExe alias resolution"):
+            for k, v in self._executables_aliases.items():
+                if exe and k != exe and v != exe: continue
 
-        for k, v in self._executables_aliases.items():
-            if not exe:
                 if not path.exists(v):
                     _print(f"Path: {v} does not exist.")
 
                     continue
 
-                chdir(path.dirname(v))
-                self._runner(mode, [v, *args])
+                runner_args = [v, *args[1:]] if exe else [v, *args]
+                alias = k
 
-                return
+                break
 
-            if k == exe or v == exe:
-                if not path.exists(v):
-                    _print(f"Path: {v} does not exist.")
+        if not runner_args or not alias: return
 
-                    continue
+        exec_replace: bool = self.isExecReplaced(mode)
+        sampler: ProcessSampler | None = None
 
-                chdir(path.dirname(v))
-                self._runner(mode, [v, *args[1:]])
+        if exec_replace and self._sampling_interval:
+            _print("sampling_interval is ignored in exec mode, no wrunner process is left to sample the launch.", stderr)
 
-                return
+        if exec_replace and self._accounting:
+            _print("accounting is ignored in exec mode, no wrunner process is left to record the launch.", stderr)
+
+        if self._sampling_interval and not exec_replace:
+            # Only needed when the profile has a sampling interval.
+            from utils.procsampler import ProcessSampler
+
+            sampler = ProcessSampler(self._profile_id, self._prefix, self._sampling_interval)
+
+        usage: Usage | None = self._runner(
+            mode,
+            runner_args,
+            exec_replace = exec_replace,
+            account = self._accounting and not exec_replace,
+            sampler = sampler,
+            cwd = path.dirname(runner_args[0]),
+            wrap = True
+        )
+
+        if self._accounting and usage:
+            # Only needed when the profile has accounting enabled.
+            from utils.launchhistory import LaunchHistory
+
+            LaunchHistory(self._profile_id).append(alias, self._getLaunchKey(), usage)
+
+        # The runner's exit status becomes wrunner's, a signal as 128 + its number like the shells do.
+        if mode == "waitforexitandrun" and usage and usage[6]: exit(usage[6] if usage[6] > 0 else 128 - usage[6])
+
+
+    def _isDXVKEnabled(self) -> bool:
+        """
+        _isDXVKEnabled
+
+        Checks the prefix's DLL overrides for the native d3d11 installed with DXVK, without launching wine.
+
+        :return: True if DXVK is installed in the prefix.
+        """
+
+        try:
+            with open(path.join(self._prefix, "user.reg"), "rb") as fp:
+                return b'"d3d11"="native' in fp.read()
+        except OSError:
+            return False
+
+
+    def _getLaunchKey(self) -> "LaunchKey":
+        """
+        _getLaunchKey
+
+        :return: The settings that change the performance of a launch, used to group the launch history.
+        """
+
+        runner: str = (self._probeVersion(self._wine_bin_path) if self._wine_bin_path else None) \
+                      or path.basename(self._environment.get("PROTONPATH", "").rstrip("/")) or "umu"
+        sync: str = "fsync" if self._environment.get("WINEFSYNC") == "1" \
+                    else "esync" if self._environment.get("WINEESYNC") == "1" else "none"
+
+        return (("runner", runner), ("sync", sync), ("dxvk", "on" if self._isDXVKEnabled() else "off"))
 
 
     def wineboot(self, args: List[str] | None = None) -> None:
@@ -299,12 +748,71 @@ class BaseHandler(ABC):
         """
         killAll
 
-        Calls wineboot with --kill flag.
+        Terminates the prefix's processes, wineserver included, and kills the ones still running after a second.
+        Unlike wineboot --kill, no wine process is started, so it works with a wineserver that stopped responding.
 
         :return:
         """
 
-        raise NotImplementedError(f"Method {self.killAll.__name__} not implemented.")
+        # Only needed for kill-all.
+        from utils.prefixprocesses import findPrefixProcesses, killPrefixProcesses
+
+        if self._dry_run:
+            _print(f"SIGTERM, then SIGKILL after {self._KILL_TIMEOUT:g}s: " \
+                   + (" ".join(str(p[0]) for p in findPrefixProcesses(self._prefix)) or "no processes"))
+
+            return
+
+        with tracer.phase("killPrefixProcesses"):
+            terminated, killed = killPrefixProcesses(self._prefix, self._KILL_TIMEOUT)
+
+        _print(f"{terminated} processes terminated" + (f", {killed} killed." if killed else ".") if terminated or killed \
+               else f"No processes running in the prefix: {self._prefix}")
+
+
+    def ps(self) -> None:
+        """
+        ps
+
+        Lists the prefix's processes with their CPU usage and resident memory.
+
+        :return:
+        """
+
+        # Only needed for ps.
+        from utils.prefixprocesses import findPrefixProcesses, formatPrefixProcesses
+
+        processes: List[PrefixProcess] = findPrefixProcesses(self._prefix)
+
+        _print(formatPrefixProcesses(processes) if processes else f"No processes running in the prefix: {self._prefix}")
+
+
+    def prewarm(self) -> None:
+        """
+        prewarm
+
+        Starts the prefix's wineserver ahead of the launches.
+
+        :return:
+        """
+
+        raise NotImplementedError(f"Method {self.prewarm.__name__} not implemented.")
+
+
+    @contextmanager
+    def wineserverSession(self, shared: bool = False, keep: bool = False) -> Generator[None, None, None]:
+        """
+        wineserverSession
+
+        Keeps a wineserver running for the prefix while the commands of a verb run, without it every command
+        may start its own. The runner manages it by itself by default.
+
+        :shared: (Optional) The session spans several verbs, the wineserver stays up between them.
+        :keep: (Optional) Leaves the wineserver running afterwards, for sessions ending with a launch.
+        :return:
+        """
+
+        yield
 
 
     def initWinePrefix(self) -> None:
@@ -318,7 +826,7 @@ class BaseHandler(ABC):
 
         _print("Initiating prefix.")
 
-        if not path.exists(self._application_directory):
+        if not self._dry_run and not path.exists(self._application_directory):
             mkdir(self._application_directory)
 
         self.wineboot(["--init"])
@@ -460,6 +968,17 @@ class BaseHandler(ABC):
         raise NotImplementedError(f"Method {self.winecfg.__name__} not implemented.")
 
 
+    def isExecReplaced(self, mode: str) -> bool:
+        """
+        isExecReplaced
+
+        :mode: The mode the application is launched with.
+        :return: True if launching the application replaces wrunner.
+        """
+
+        return self._launch_mode == "exec" and mode in ["run", "waitforexitandrun"]
+
+
     def getProfileId(self) -> str:
         """
         getProfileId
@@ -481,14 +1000,83 @@ class BaseHandler(ABC):
         :return:
         """
 
+        if self._dry_run:
+            self.runCommand(["rm", "-rf", self._application_directory], output = "none")
+
+            return
+
+        from shutil import rmtree
+
         _print(f"Removing prefix: {self._prefix}.")
 
         if path.exists(self._application_directory):
            rmtree(self._application_directory, ignore_errors=True)
 
+        self._probe_cache.invalidate(self._prefix)
+        self._prefix_arch = None
+
         _print(f"Removed prefix: {self._prefix}.")
 
 
+    def _copyFile(self, src: str, dst: str) -> None:
+        """
+        _copyFile
+
+        Copies a file into the prefix, with --dry-run the copy is only printed.
+
+        :src: Path to the file.
+        :dst: Path to the destination file or directory.
+        :return:
+        """
+
+        if self._dry_run:
+            self.runCommand(["cp", src, dst], output = "none")
+
+            return
+
+        copyFile(src, dst)
+        _print(f"{src} -> {dst}")
+
+
+    def _removeFile(self, filepath: str) -> None:
+        """
+        _removeFile
+
+        Removes a file from the prefix, with --dry-run the removal is only printed.
+
+        :filepath: Path to the file.
+        :return:
+        """
+
+        if self._dry_run:
+            self.runCommand(["rm", filepath], output = "none")
+
+            return
+
+        remove(filepath)
+        _print(f"Removed: {filepath}")
+
+
+    def _renameFile(self, src: str, dst: str) -> None:
+        """
+        _renameFile
+
+        Renames a file of the prefix, with --dry-run the renaming is only printed.
+
+        :src: Path to the file.
+        :dst: Its new path.
+        :return:
+        """
+
+        if self._dry_run:
+            self.runCommand(["mv", src, dst], output = "none")
+
+            return
+
+        rename(src, dst)
+        _print(f"Renamed: {src} -> {dst}")
+
+
     def getWinePath(self) -> str:
         """
         getWinePath
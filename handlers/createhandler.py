@@ -1,7 +1,10 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, List
 from utils.funcs import die
 from handlers import UMUHandler, WineHandler
 
+# Only imported with the launch wrappers.
+if TYPE_CHECKING: from utils.launchwrappers import Wrapper
+
 
 def createHandler(
         default_runner: str,
@@ -17,7 +20,16 @@ def createHandler(
         dxvk_directory: str | None = None,
         dxvk_nvapi_directory: str | None = None,
         winetricks_path: str | None = None,
-        gallium_nine_directory: str | None = None
+        gallium_nine_directory: str | None = None,
+        launch_mode: str = "spawn",
+        log_options: Dict[str, Any] | None = None,
+        accounting: bool = False,
+        sampling_interval: float | None = None,
+        scheduling_options: Dict[str, Any] | None = None,
+        dry_run: bool = False,
+        launch_wrappers: List["Wrapper"] | None = None,
+        wineserver_options: Dict[str, Any] | None = None,
+        prefix_templates: bool = True
     ) -> UMUHandler | WineHandler:
     """
     createHandler
@@ -36,6 +48,15 @@ def createHandler(
     :dxvk_nvapi_directory: Path to DXVK NVAPI.
     :winetricks_path: Path to the winetricks script.
     :gallium_nine_directory: Path to GalliumNine directory.
+    :launch_mode: How applications are launched, "spawn" or "exec" to replace wrunner with the application.
+    :log_options: LogSink options from the [profile.logging] table.
+    :accounting: Waits for the launched applications and records the resources they used in the launch history.
+    :sampling_interval: Seconds between samples of the launched applications' processes.
+    :scheduling_options: Scheduling options from the [profile.scheduling] table.
+    :dry_run: Prints the commands and their settings instead of running them.
+    :launch_wrappers: Commands placed in front of the runner when launching applications.
+    :wineserver_options: Options from the [profile.wineserver] table.
+    :prefix_templates: Clones new prefixes from a template of the wine build instead of running wineboot --init, wine only.
     :return: A handler of type UMUHandler or WineHandler.
     """
 
@@ -48,7 +69,15 @@ def createHandler(
             executables_aliases,
             environment_variables,
             debug,
-            debug_filepath
+            debug_filepath,
+            launch_mode,
+            log_options,
+            accounting,
+            sampling_interval,
+            scheduling_options,
+            dry_run,
+            launch_wrappers,
+            wineserver_options
         )
 
     if default_runner == "wine":
@@ -63,7 +92,16 @@ def createHandler(
             dxvk_directory,
             dxvk_nvapi_directory,
             winetricks_path,
-            gallium_nine_directory
+            gallium_nine_directory,
+            launch_mode,
+            log_options,
+            accounting,
+            sampling_interval,
+            scheduling_options,
+            dry_run,
+            launch_wrappers,
+            wineserver_options,
+            prefix_templates
         )
 
     die("No wine, umu or proton specified, exiting.")
@@ -1,9 +1,17 @@
-from os import environ, path, mkdir
+from os import X_OK, access, path, mkdir
 from sys import stderr
-from typing import List, Dict
+from typing import TYPE_CHECKING, Any, List, Dict
 from utils.funcs import die, _print
+from utils.tracer import tracer
+from utils.environment import Environment
 from handlers import BaseHandler
 
+# The modules of the optional features are imported by the options and the verbs using them.
+if TYPE_CHECKING:
+    from utils.launchhistory import Usage
+    from utils.launchwrappers import Wrapper
+    from utils.procsampler import ProcessSampler
+
 
 class UMUHandler(BaseHandler):
     """
@@ -17,6 +25,14 @@ class UMUHandler(BaseHandler):
     :environment_variables: The environment variables to be used within wine's environment.
     :debug: Tell whether should display logs.
     :debug_filepath: Path to the file where logs should be saved if debug is set to true.
+    :launch_mode: How applications are launched, "spawn" or "exec" to replace wrunner with the application.
+    :log_options: LogSink options from the [profile.logging] table.
+    :accounting: Waits for the launched applications and records the resources they used in the launch history.
+    :sampling_interval: Seconds between samples of the launched applications' processes.
+    :scheduling_options: Scheduling options from the [profile.scheduling] table.
+    :dry_run: Prints the commands and their settings instead of running them.
+    :launch_wrappers: Commands placed in front of the runner when launching applications.
+    :wineserver_options: Options from the [profile.wineserver] table.
     """
 
     def __init__(
@@ -28,7 +44,15 @@ class UMUHandler(BaseHandler):
         executables_aliases: Dict[str, str],
         environment_variables: Dict[str, str] | None = None,
         debug: bool = False,
-        debug_filepath: str | None = None
+        debug_filepath: str | None = None,
+        launch_mode: str = "spawn",
+        log_options: Dict[str, Any] | None = None,
+        accounting: bool = False,
+        sampling_interval: float | None = None,
+        scheduling_options: Dict[str, Any] | None = None,
+        dry_run: bool = False,
+        launch_wrappers: List["Wrapper"] | None = None,
+        wineserver_options: Dict[str, Any] | None = None
     ):
         self._umu_directory: str
 
@@ -48,27 +72,25 @@ class UMUHandler(BaseHandler):
         self._debug: bool                   = debug
         self._debug_filepath: str | None    = debug_filepath
 
-        exit_code: int = self.runCommandStatusChecked([self._umu_run_path, "--help"])
-
-        if exit_code != 0 and self.runCommandStatusChecked([self._umu_run_path, "--help"]) != 0:
-            die(f"umu-run not found at: {self._umu_run_path}")
-
         if not path.isfile(self._umu_run_path):
             die(f"umu-run path isn't a file: {self._umu_run_path}")
 
+        if not access(self._umu_run_path, X_OK):
+            die(f"umu-run isn't executable: {self._umu_run_path}")
+
+        environment: Environment = Environment().withPath(path.dirname(self._umu_run_path))
+
         if self._proton_directory and path.exists(self._proton_directory):
             proton_path: str = path.join(self._proton_directory, "proton")
 
             if path.exists(proton_path):
-                environ["PROTONPATH"] = self._proton_directory
+                environment = environment.updated({"PROTONPATH": self._proton_directory})
             else:
                 _print(
                     f"Proton wasn't found at the directory: {self._proton_directory}\n"
                     f"Defaulting to UMU's proton path.", stderr
                 )
 
-        environ["PATH"] += ":" + path.dirname(self._umu_run_path)
-
         super().__init__(
             self._profile_id,
             None, # No need to specify wine path
@@ -78,24 +100,63 @@ class UMUHandler(BaseHandler):
             executables_aliases,
             environment_variables,
             self._debug,
-            self._debug_filepath
+            self._debug_filepath,
+            launch_mode,
+            log_options,
+            accounting,
+            sampling_interval,
+            scheduling_options,
+            dry_run,
+            launch_wrappers,
+            environment,
+            wineserver_options
         )
 
+        # Cached by the binary's identity, umu-run only runs again after it's updated
+        # or after wrunner --refresh-probes. Older umu-run versions have no --version,
+        # as umu-run was checked to be executable their version is cached as unknown.
+        with tracer.phase("UMUHandler.__init__ umu-run probe"):
+            if not self._probeVersion(self._umu_run_path, "unknown"):
+                die(f"umu-run not found at: {self._umu_run_path}")
+
 
-    def umuRun(self, mode: str = "waitforexitandrun", args: List[str] | None = None) -> None:
+    def umuRun(
+        self,
+        mode: str = "waitforexitandrun",
+        args: List[str] | None = None,
+        exec_replace: bool = False,
+        account: bool = False,
+        sampler: "ProcessSampler | None" = None,
+        cwd: str | None = None,
+        wrap: bool = False
+    ) -> "Usage | None":
         """
         umuRun
 
         Run the program with UMU.
 
-        :mode: The mode that should be used, defaults to waitforexitandrun.
+        :mode: The mode that should be used, defaults to waitforexitandrun, umu-run waits for the wineserver by itself
+               and wrunner waits for umu-run.
         :args: A list with the program and its arguments.
-        :return:
+        :exec_replace: (Optional) Replaces wrunner with umu-run instead of spawning it.
+        :account: (Optional) Waits for umu-run so the resources it used are known.
+        :sampler: (Optional) Samples umu-run's process tree while it runs.
+        :cwd: (Optional) Working directory of the program.
+        :wrap: (Optional) Places the launch wrappers in front of the runner.
+        :return: The resources used if umu-run was waited for.
         """
 
         _args: List[str] = args if args else ["--help"]
 
-        self.runCommand([self._umu_run_path, mode, *_args], self._debug, self._debug_filepath)
+        return self.launchCommand(
+            [self._umu_run_path, mode, *_args],
+            _args[0],
+            exec_replace,
+            account or mode == "waitforexitandrun",
+            sampler,
+            cwd,
+            wrap
+        )
 
 
     def wineboot(self, args: List[str] | None = None) -> None:
@@ -110,7 +171,7 @@ class UMUHandler(BaseHandler):
 
         _args: List[str] = args if args else ["--help"]
 
-        self.runCommand([self._umu_run_path, "run", "wineboot", *_args], True)
+        self.runCommand([self._umu_run_path, "run", "wineboot", *_args], output = "terminal")
 
 
     def winecfg(self) -> None:
@@ -120,17 +181,4 @@ class UMUHandler(BaseHandler):
         :return:
         """
 
-        self.runCommand([self._umu_run_path, "run", "winecfg"], self._debug, self._debug_filepath)
-
-
-    def killAll(self) -> None:
-        """
-        killAll
-
-        Calls wineboot with --kill flag.
-
-        :return:
-        """
-
-        self.runCommand([self._umu_run_path, "wineboot", "--kill"], True)
-
+        self.runCommand([self._umu_run_path, "run", "winecfg"])
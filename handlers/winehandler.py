@@ -1,9 +1,18 @@
-from os import chdir, path, mkdir, rename, remove
-from typing import List, Dict
-from utils.funcs import die, getPackageUrl, findFiles, _print
-from utils.downloader import Downloader
+from contextlib import contextmanager
+from os import path, mkdir
+from time import monotonic
+from typing import TYPE_CHECKING, Any, List, Dict, Generator
+from utils.funcs import die, findFiles, handleExceptionIfAny, _print
+from utils.tracer import tracer
 from handlers import BaseHandler
-from shutil import copy
+
+# The modules of the optional features are imported by the options and the verbs using them.
+if TYPE_CHECKING:
+    from utils.launchhistory import Usage
+    from utils.launchwrappers import Wrapper
+    from utils.prefixtemplates import CloneCounts
+    from utils.procsampler import ProcessSampler
+    from utils.wineserver import WineserverSession
 
 
 class WineHandler(BaseHandler):
@@ -21,8 +30,20 @@ class WineHandler(BaseHandler):
     :dxvk_nvapi_directory: Path to DXVK NVAPI.
     :winetricks_path: Path to winetricks.
     :gallium_nine_directory: Path to gallium nine directory.
+    :launch_mode: How applications are launched, "spawn" or "exec" to replace wrunner with the application.
+    :log_options: LogSink options from the [profile.logging] table.
+    :accounting: Waits for the launched applications and records the resources they used in the launch history.
+    :sampling_interval: Seconds between samples of the launched applications' processes.
+    :scheduling_options: Scheduling options from the [profile.scheduling] table.
+    :dry_run: Prints the commands and their settings instead of running them.
+    :launch_wrappers: Commands placed in front of the runner when launching applications.
+    :wineserver_options: Options from the [profile.wineserver] table.
+    :prefix_templates: Clones new prefixes from a template of the wine build instead of running wineboot --init.
     """
 
+    # Seconds the wineserver of a session stays up between the verb's commands.
+    _SESSION_PERSIST: int = 2
+
     def __init__(
         self,
         profile_id: str,
@@ -35,7 +56,16 @@ class WineHandler(BaseHandler):
         dxvk_directory: str | None = None,
         dxvk_nvapi_directory: str | None = None,
         winetricks_path: str | None = None,
-        gallium_nine_directory : str | None = None
+        gallium_nine_directory : str | None = None,
+        launch_mode: str = "spawn",
+        log_options: Dict[str, Any] | None = None,
+        accounting: bool = False,
+        sampling_interval: float | None = None,
+        scheduling_options: Dict[str, Any] | None = None,
+        dry_run: bool = False,
+        launch_wrappers: List["Wrapper"] | None = None,
+        wineserver_options: Dict[str, Any] | None = None,
+        prefix_templates: bool = True
     ):
         self._wine_directory: str | None        = wine_directory
 
@@ -51,6 +81,8 @@ class WineHandler(BaseHandler):
         self._gallium_nine_directory: str | None= gallium_nine_directory
         self._system32_dir: str                 = path.join(self._prefix, "drive_c/windows/system32")
         self._syswow64_dir: str                 = path.join(self._prefix, "drive_c/windows/syswow64")
+        self._session: WineserverSession | None = None
+        self._prefix_templates: bool            = prefix_templates
 
         super().__init__(
             profile_id,
@@ -61,23 +93,81 @@ class WineHandler(BaseHandler):
             executables_aliases,
             environment_variables,
             self._debug,
-            self._debug_filepath
+            self._debug_filepath,
+            launch_mode,
+            log_options,
+            accounting,
+            sampling_interval,
+            scheduling_options,
+            dry_run,
+            launch_wrappers,
+            None,
+            wineserver_options
         )
 
 
-    def wine(self, mode: str = "waitforexitandrun", args: List[str] | None = None) -> None:
+    def wine(
+        self,
+        mode: str = "waitforexitandrun",
+        args: List[str] | None = None,
+        exec_replace: bool = False,
+        account: bool = False,
+        sampler: "ProcessSampler | None" = None,
+        cwd: str | None = None,
+        wrap: bool = False
+    ) -> "Usage | None":
         """
         Run the program with wine.
 
-        :mode: The mode that should be used, defaults to waitforexitandrun (on wine does nothing).
+        :mode: The mode that should be used, defaults to waitforexitandrun, which waits for the prefix's wineserver
+               to exit before the launch and, with the program's processes, after it. In a wineserver session started
+               by wrunner only the program is waited for. Other modes are the same as run.
         :args: A list with the program and its arguments.
-        :return:
+        :exec_replace: (Optional) Replaces wrunner with wine instead of spawning it.
+        :account: (Optional) Waits for wine so the resources it used are known.
+        :sampler: (Optional) Samples wine's process tree while it runs.
+        :cwd: (Optional) Working directory of the program.
+        :wrap: (Optional) Places the launch wrappers in front of the runner.
+        :return: The resources used if wine was waited for, the wall time lasting until the wineserver exited.
         """
 
         _args: List[str] = args if args else ["--help"]
-        _: str = mode
 
-        self.runCommand([self.getDefaultWinePath(), *_args], self._debug, self._debug_filepath)
+        if mode != "waitforexitandrun":
+            return self.launchCommand([self.getDefaultWinePath(), *_args], _args[0], exec_replace, account, sampler, cwd, wrap)
+
+        # The wineserver of a session started by this invocation belongs to it, it keeps serving the launch
+        # and only exits persist seconds after it, so only a foreign wineserver is waited for.
+        owned: bool = self._session is not None and self._session.isStarted()
+
+        if not owned: self._waitForWineserver("Waiting for the prefix's wineserver to exit.")
+
+        start: float = monotonic()
+        usage: Usage | None = self.launchCommand([self.getDefaultWinePath(), *_args], _args[0], exec_replace, True, sampler, cwd, wrap)
+
+        if not owned: self._waitForWineserver()
+
+        return (monotonic() - start, *usage[1:]) if usage else None
+
+
+    def _waitForWineserver(self, message: str | None = None) -> None:
+        """
+        _waitForWineserver
+
+        Waits until the prefix's wineserver exits, which happens once every wine process of the prefix exited.
+
+        :message: (Optional) Printed if there's a wineserver to wait for.
+        :return:
+        """
+
+        session: WineserverSession | None = self._getWineserverSession(self._SESSION_PERSIST)
+
+        if not session or not (self._dry_run or session.isRunning()): return
+
+        if message and not self._dry_run: _print(message)
+
+        with tracer.phase("wineserver wait"):
+            self.runCommand([session.getPath(), "-w"], account = True, output = "none")
 
 
     def wineboot(self, args: List[str] | None = None) -> None:
@@ -92,23 +182,150 @@ class WineHandler(BaseHandler):
 
         _args: List[str] = args if args else ["--help"]
 
-        self.runCommand([self.getDefaultWinePath(), "wineboot", *_args], True)
+        self.runCommand([self.getDefaultWinePath(), "wineboot", *_args], output = "terminal")
+
+
+    def initWinePrefix(self) -> None:
+        """
+        initWinePrefix
+
+        Setups a new prefix by cloning the template of the wine build and architecture, only running wineboot -u
+        if the template is outdated. Without a template the prefix is created by wineboot --init and stored as one.
+
+        :return:
+        """
+
+        if not self._prefix_templates or self._dry_run or path.exists(self._prefix):
+            super().initWinePrefix()
+
+            return
+
+        # Only needed when a prefix is created.
+        from utils.prefixtemplates import PrefixTemplates, isUpdateNeeded
+
+        wine_path: str = self.getDefaultWinePath()
+        arch: str = self._environment.get("WINEARCH") or "win64"
+        templates: PrefixTemplates = PrefixTemplates()
+        template: str | None = templates.get(wine_path, arch)
+
+        if template:
+            _print(f"Cloning prefix from template: {template}")
+
+            if not path.exists(self._application_directory): mkdir(self._application_directory)
+
+            with tracer.phase("prefix template clone"):
+                counts: CloneCounts | None = handleExceptionIfAny("Failed to clone the prefix template", False, \
+                                                                  PrefixTemplates.clonePrefix, template, self._prefix)
+
+            if counts:
+                _print(f"Prefix created, {counts[0]} files reflinked, {counts[1]} hardlinked and {counts[2]} copied.")
+
+                if isUpdateNeeded(self._prefix, wine_path): self.wineboot(["-u"])
+
+                return
+
+            # Only needed when the clone failed halfway.
+            from shutil import rmtree
 
+            rmtree(self._prefix, ignore_errors = True)
 
-    def killAll(self) -> None:
+        super().initWinePrefix()
+
+        # The registry is only written once the wineserver exits, the one of a session is shut down gracefully.
+        if self._session:
+            self._waitForChildren()
+            self._session.stop()
+
+        self._waitForWineserver()
+
+        with tracer.phase("prefix template create"):
+            created: CloneCounts | None = templates.create(self._prefix, wine_path, arch)
+
+        if created: _print(f"Prefix stored as the template of {wine_path} ({arch}).")
+
+
+    def _getWineserverSession(self, persist: int) -> "WineserverSession | None":
+        """
+        _getWineserverSession
+
+        :persist: Seconds the wineserver stays up after the last wine process exits.
+        :return: A session with the wineserver next to the wine binary, or None if there's none.
+        """
+
+        wineserver_path: str = path.join(path.dirname(self.getDefaultWinePath()), "wineserver")
+
+        if not path.isfile(wineserver_path): return None
+
+        # Only needed by the verbs and launches talking to the wineserver.
+        from utils.wineserver import WineserverSession
+
+        return WineserverSession(wineserver_path, self._prefix, self._environment, persist)
+
+
+    def prewarm(self) -> None:
+        """
+        prewarm
+
+        Starts a persistent wineserver for the prefix, so the next launches don't pay for its startup.
+        It stays up for [profile.wineserver] persist seconds after the last wine process exits.
+
+        :return:
+        """
+
+        if not path.isdir(self._prefix): die(f"Prefix not found at: {self._prefix}. Run init first.")
+
+        session: WineserverSession | None = self._getWineserverSession(self._wineserver_options["persist"])
+
+        if not session: die(f"wineserver not found next to: {self.getDefaultWinePath()}")
+
+        with tracer.phase("wineserver prewarm"):
+            elapsed: float | None = session.start()
+
+        if elapsed is None: die(f"Failed to start wineserver for the prefix: {self._prefix}")
+
+        _print("wineserver is already running." if not elapsed \
+               else f"wineserver ready in {elapsed * 1000:.0f}ms, it stays up {self._wineserver_options['persist']}s " \
+                    + "after the last wine process exits.")
+
+
+    @contextmanager
+    def wineserverSession(self, shared: bool = False, keep: bool = False) -> Generator[None, None, None]:
         """
-        killAll
+        wineserverSession
 
-        Calls wineboot with --kill flag.
+        Starts a wineserver for the prefix before the verb's commands and shuts it down once they exited,
+        so the commands share a single wineserver. A wineserver already running is reused and left running.
 
+        :shared: (Optional) The session spans several verbs, the wineserver stays up [profile.wineserver] persist
+                 seconds between their commands (e.g. while downloading DXVK) instead of a couple of seconds.
+        :keep: (Optional) Leaves the wineserver running once the commands exited, it shuts down by itself persist
+               seconds after the last wine process exits, so a launch ending the session isn't killed with it.
         :return:
         """
 
-        self.runCommand([self.getDefaultWinePath(), "wineboot", "--kill"], True)
+        session: WineserverSession | None = self._getWineserverSession(self._wineserver_options["persist"] if shared else self._SESSION_PERSIST) \
+                                            if self._wineserver_options["session"] and not self._dry_run and path.isdir(self._prefix) \
+                                            else None
+
+        if session:
+            with tracer.phase("wineserver session start"):
+                session.start()
+
+        self._session = session
 
+        try:
+            yield
+        finally:
+            self._session = None
 
-    @staticmethod
-    def _download(url: str, directory: str) -> str:
+            if session and not keep:
+                with tracer.phase("wineserver session stop"):
+                    # The commands that weren't waited for are still clients of the wineserver.
+                    self._waitForChildren()
+                    session.stop(kill = True)
+
+
+    def _download(self, url: str, directory: str) -> str | None:
         """
         _download
 
@@ -116,9 +333,17 @@ class WineHandler(BaseHandler):
 
         :url: Latest url release of the project.
         :directory: A relative directory to the Wine Runner data directory.
-        :return: The path where the package was extracted to.
+        :return: The path where the package was extracted to, None with --dry-run as nothing is downloaded.
         """
 
+        if self._dry_run:
+            _print(f"Would download the latest release of: {url}")
+
+            return None
+
+        # The network and tar machinery is only needed by the install verbs.
+        from utils.downloader import Downloader, getPackageUrl
+
         package_url: str = getPackageUrl(url)
         downloader: Downloader = Downloader(package_url, directory)
         downloader.download()
@@ -136,11 +361,12 @@ class WineHandler(BaseHandler):
         if not self._dxvk_directory or not path.exists(self._dxvk_directory):
             self._dxvk_directory = self._download("https://github.com/doitsujin/dxvk/releases/latest", "dxvk")
 
+            # Without the package, the files that would be installed aren't known.
+            if self._dry_run: return
+
         if not self._dxvk_directory or not path.exists(self._dxvk_directory):
             die(f"DXVK directory not found at: {self._dxvk_directory}.")
 
-        chdir(self._dxvk_directory)
-
         dxvk_dlls: List[str] = ["d3d10core.dll", "d3d11.dll", "d3d9.dll", "dxgi.dll"]
         x32_dir: str = path.join(self._dxvk_directory, "x32")
         x64_dir: str = path.join(self._dxvk_directory, "x64")
@@ -159,25 +385,22 @@ class WineHandler(BaseHandler):
 
         _print("Installing DXVK.")
 
-        status_code: int = self.runCommandStatusChecked([self.getWine64Path(), "winepath"])
+        is_64bit: bool = self.isPrefix64Bit()
 
-        if status_code != 0:
+        if not is_64bit:
              for dll in dlls_x32:
-                _print(f"{dll} -> {self._system32_dir}")
-                copy(dll, self._system32_dir)
+                self._copyFile(dll, self._system32_dir)
                 self.reg(path.splitext(path.basename(dll))[0], "add", "native")
                 _print("DXVK installed.")
 
                 return
 
         for dll in dlls_x32:
-            _print(f"{dll} -> {self._syswow64_dir}")
-            copy(dll, self._syswow64_dir)
+            self._copyFile(dll, self._syswow64_dir)
             self.reg(path.splitext(path.basename(dll))[0], "add", "native")
 
         for dll in dlls_x64:
-            _print(f"{dll} -> {self._system32_dir}")
-            copy(dll, self._system32_dir)
+            self._copyFile(dll, self._system32_dir)
             self.reg(path.splitext(path.basename(dll))[0], "add", "native")
 
         _print("DXVK installed.")
@@ -202,14 +425,12 @@ class WineHandler(BaseHandler):
         for dll in system32_dlls:
             if not path.exists(dll): continue
 
-            _print(f"Removed: {dll}")
-            remove(dll)
+            self._removeFile(dll)
 
         for dll in syswow64_dlls:
             if not path.exists(dll): continue
 
-            _print(f"Removed: {dll}")
-            remove(dll)
+            self._removeFile(dll)
 
         self.wineboot(["-u"])
         _print("DXVK uninstalled.")
@@ -232,8 +453,7 @@ class WineHandler(BaseHandler):
         if not path.exists(self._system32_dir): die(f"The directory system32 not found in prefix: {self._prefix}.")
 
         for dll in nvngx_dlls:
-            copy(dll, self._system32_dir)
-            _print(f"{dll} -> {self._system32_dir}")
+            self._copyFile(dll, self._system32_dir)
             self.reg(path.splitext(path.basename(dll))[0], "add", "native")
 
 
@@ -253,8 +473,7 @@ class WineHandler(BaseHandler):
         for dll in nvngx_dlls:
             if not path.exists(dll): continue
 
-            remove(dll)
-            _print(f"Removed: {dll}")
+            self._removeFile(dll)
             self.reg(path.splitext(path.basename(dll))[0], "delete")
 
         _print("NVNGX uninstalled.")
@@ -272,22 +491,23 @@ class WineHandler(BaseHandler):
         if not self._dxvk_nvapi_directory or not path.exists(self._dxvk_nvapi_directory):
             self._dxvk_nvapi_directory = self._download("https://github.com/jp7677/dxvk-nvapi/releases/latest", "dxvk-nvapi")
 
+            # Without the package, the files that would be installed aren't known.
+            if self._dry_run: return
+
         if not self._dxvk_nvapi_directory or not path.exists(self._dxvk_nvapi_directory):
             die(f"DXVK directory not found at: {self._dxvk_nvapi_directory}.")
 
-        status_code: int = self.runCommandStatusChecked([self.getWine64Path(), "winepath"])
+        is_64bit: bool = self.isPrefix64Bit()
         dxvk_dlls: List[str] = ["d3d10core.dll", "d3d11.dll", "d3d9.dll", "dxgi.dll"]
 
-        if status_code != 0 and not all(path.exists(path.join(self._system32_dir, dll)) for dll in dxvk_dlls):
+        if not is_64bit and not all(path.exists(path.join(self._system32_dir, dll)) for dll in dxvk_dlls):
             _print("DXVK NVAPI needs DXVK to be installed first, installing DXVK.")
             self.installDXVK()
-        elif status_code == 0 and not all(path.exists(path.join(self._syswow64_dir, dll)) for dll in dxvk_dlls) \
-        or status_code == 0 and not all(path.exists(path.join(self._system32_dir, dll)) for dll in dxvk_dlls):
+        elif is_64bit and not all(path.exists(path.join(self._syswow64_dir, dll)) for dll in dxvk_dlls) \
+        or is_64bit and not all(path.exists(path.join(self._system32_dir, dll)) for dll in dxvk_dlls):
             _print("DXVK NVAPI needs DXVK to be installed first, installing DXVK.")
             self.installDXVK()
 
-        chdir(self._dxvk_nvapi_directory)
-
         x32_dir: str = path.join(self._dxvk_nvapi_directory, "x32")
         x64_dir: str = path.join(self._dxvk_nvapi_directory, "x64")
 
@@ -307,20 +527,17 @@ class WineHandler(BaseHandler):
 
         self._installNVNGX()
 
-        if status_code != 0:
-            copy(dll_x32, self._system32_dir)
-            _print(f"{dll_x32} -> {self._system32_dir}")
+        if not is_64bit:
+            self._copyFile(dll_x32, self._system32_dir)
             self.reg(path.splitext(path.basename(dll_x32))[0], "add", "native")
             _print("DXVK NVAPI installed.")
 
             return
 
-        copy(dll_x32, self._syswow64_dir)
-        _print(f"{dll_x32} -> {self._syswow64_dir}")
+        self._copyFile(dll_x32, self._syswow64_dir)
         self.reg(path.splitext(path.basename(dll_x32))[0], "add", "native")
 
-        copy(dll_x64, self._system32_dir)
-        _print(f"{dll_x64} -> {self._system32_dir}")
+        self._copyFile(dll_x64, self._system32_dir)
         self.reg(path.splitext(path.basename(dll_x64))[0], "add", "native")
 
         _print("DXVK NVAPI installed.")
@@ -335,19 +552,17 @@ class WineHandler(BaseHandler):
         :return:
         """
 
-        status_code: int = self.runCommandStatusChecked([self.getWine64Path(), "winepath"])
-        system32_dll: str = path.join(self._system32_dir, "nvapi64.dll" if status_code == 0 else "nvapi.dll")
+        is_64bit: bool = self.isPrefix64Bit()
+        system32_dll: str = path.join(self._system32_dir, "nvapi64.dll" if is_64bit else "nvapi.dll")
         syswow64_dll: str = path.join(self._syswow64_dir, "nvapi.dll")
 
         _print("Uninstalling DXVK NVAPI.")
 
         if path.exists(system32_dll):
-            _print(f"Removed: {system32_dll}")
-            remove(system32_dll)
+            self._removeFile(system32_dll)
 
         if path.exists(syswow64_dll):
-            _print(f"Removed: {syswow64_dll}")
-            remove(syswow64_dll)
+            self._removeFile(syswow64_dll)
 
         self.reg("nvapi64", "delete")
         self.reg("nvapi", "delete")
@@ -369,6 +584,9 @@ class WineHandler(BaseHandler):
         if not self._gallium_nine_directory or not path.exists(self._gallium_nine_directory):
             self._gallium_nine_directory = self._download("https://github.com/iXit/wine-nine-standalone/releases", "gallium-nine")
 
+            # Without the package, the files that would be installed aren't known.
+            if self._dry_run: return
+
         if not self._gallium_nine_directory or not path.exists(self._gallium_nine_directory):
             die(f"Gallium Nine directory not found at: {self._gallium_nine_directory}.")
 
@@ -384,30 +602,24 @@ class WineHandler(BaseHandler):
         if not all(path.exists(file) for file in [ninewinecfg_32, ninewinecfg_64, d3d9_32, d3d9_64]):
             die(f"Some or all Gallium Nine dlls are missing: {self._gallium_nine_directory}.")
 
-        status_code: int = self.runCommandStatusChecked([self.getWine64Path(), "winepath"])
+        is_64bit: bool = self.isPrefix64Bit()
 
         _print("Installing Gallium Nine.")
 
-        if status_code != 0:
-            _print(f"{ninewinecfg_32} -> {self._system32_dir}")
-            copy(ninewinecfg_32, path.join(self._system32_dir, "ninewinecfg.exe"))
-            _print(f"{d3d9_32} -> {self._system32_dir}")
-            copy(d3d9_32, path.join(self._system32_dir, "d3d9-nine.dll"))
-            self.runCommand([self.getWinePath(), "ninewinecfg.exe", "-e"])
+        if not is_64bit:
+            self._copyFile(ninewinecfg_32, path.join(self._system32_dir, "ninewinecfg.exe"))
+            self._copyFile(d3d9_32, path.join(self._system32_dir, "d3d9-nine.dll"))
+            self.runCommand([self.getWinePath(), "ninewinecfg.exe", "-e"], output = "none")
             _print("Gallium Nine installed.")
 
             return
 
-        _print(f"{ninewinecfg_32} -> {self._syswow64_dir}")
-        copy(ninewinecfg_32, path.join(self._syswow64_dir, "ninewinecfg.exe"))
-        _print(f"{d3d9_32} -> {self._syswow64_dir}")
-        copy(d3d9_32, path.join(self._syswow64_dir, "d3d9-nine.dll"))
+        self._copyFile(ninewinecfg_32, path.join(self._syswow64_dir, "ninewinecfg.exe"))
+        self._copyFile(d3d9_32, path.join(self._syswow64_dir, "d3d9-nine.dll"))
 
-        _print(f"{ninewinecfg_64} -> {self._system32_dir}")
-        copy(ninewinecfg_64, path.join(self._system32_dir, "ninewinecfg.exe"))
-        _print(f"{d3d9_64} -> {self._system32_dir}")
-        copy(d3d9_64, path.join(self._system32_dir, "d3d9-nine.dll"))
-        self.runCommand([self.getWine64Path(), "ninewinecfg.exe", "-e"])
+        self._copyFile(ninewinecfg_64, path.join(self._system32_dir, "ninewinecfg.exe"))
+        self._copyFile(d3d9_64, path.join(self._system32_dir, "d3d9-nine.dll"))
+        self.runCommand([self.getWine64Path(), "ninewinecfg.exe", "-e"], output = "none")
 
         _print("Gallium Nine installed.")
 
@@ -419,7 +631,7 @@ class WineHandler(BaseHandler):
         :return:
         """
 
-        self.runCommand([self.getDefaultWinePath(), "ninewinecfg.exe", "-d"])
+        self.runCommand([self.getDefaultWinePath(), "ninewinecfg.exe", "-d"], output = "none")
 
         files_to_rename: List[str] = [
             path.join(self._system32_dir, "d3d9-nine.bak"),
@@ -438,13 +650,11 @@ class WineHandler(BaseHandler):
         for f in files_to_rename:
             if path.exists(f):
                 new_name: str = path.join(path.dirname(f), "d3d9.dll")
-                rename(f, new_name)
-                _print(f"Renamed file: {f} -> {new_name}")
+                self._renameFile(f, new_name)
 
         for f in files_to_remove:
             if path.exists(f):
-                remove(f)
-                _print(f"Removed file: {f}")
+                self._removeFile(f)
 
         _print("Gallium Nine Uninstalled.")
 
@@ -461,11 +671,11 @@ class WineHandler(BaseHandler):
             die(f"Winetricks not found at: {self._winetricks_path}")
 
         if not args:
-            self.runCommand([self._winetricks_path, "--help"], self._debug)
+            self.runCommand([self._winetricks_path, "--help"], output = "terminal" if self._debug else "none")
 
             return
 
-        self.runCommand([self._winetricks_path, *args], self._debug, self._debug_filepath)
+        self.runCommand([self._winetricks_path, *args])
 
 
     def getWinePath(self) -> str:
@@ -522,4 +732,4 @@ class WineHandler(BaseHandler):
         :return:
         """
 
-        self.runCommand([self.getDefaultWinePath(), "winecfg"], self._debug, self._debug_filepath)
+        self.runCommand([self.getDefaultWinePath(), "winecfg"])
@@ -0,0 +1,167 @@
+from os import chmod, environ, makedirs, path, walk
+from subprocess import CompletedProcess, run
+from sys import executable
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Set, Tuple
+
+ROOT_DIRECTORY: str = path.dirname(path.dirname(path.abspath(__file__)))
+WRUNNER_PATH: str = path.join(ROOT_DIRECTORY, "wrunner")
+
+# Runs wrunner in the interpreter and writes the names of the loaded modules to a file once it exits.
+_MODULES_DRIVER: str = """import atexit, runpy, sys
+modules_filepath = sys.argv[1]
+atexit.register(lambda: open(modules_filepath, "w").write("\\n".join(sys.modules)))
+sys.argv = sys.argv[2:]
+sys.path.insert(0, {root_directory!r})
+runpy.run_path(sys.argv[0], run_name = "__main__")
+"""
+
+# Stub of wine, wine64, wineserver and umu-run, it records its arguments and exits with WRUNNER_STUB_STATUS.
+_STUB: str = """#!/bin/sh
+echo "$(basename "$0") $*" >> "{calls_filepath}"
+[ "$1" = "--version" ] && echo wine-9.0
+exit ${{WRUNNER_STUB_STATUS:-0}}
+"""
+
+
+class Sandbox:
+    """
+    Sandbox
+
+    A temporary configuration directory with one profile, stub runners, DXVK and Gallium Nine packages
+    and a prefix holding system32 and syswow64, so wrunner can be run without wine.
+
+    :profile_id: Id of the profile.
+    :profile_options: (Optional) Extra lines of the [profile] table.
+    """
+
+    def __init__(self, profile_id: str = "game", profile_options: str = ""):
+        self._temporary_directory: TemporaryDirectory[str] = TemporaryDirectory()
+        self.root: str                                     = self._temporary_directory.name
+        self.profile_id: str                               = profile_id
+        self.config_directory: str                         = path.join(self.root, "config")
+        self.bin_directory: str                            = path.join(self.root, "bin")
+        self.application_directory: str                    = path.join(self.root, "app")
+        self.prefix: str                                   = path.join(self.application_directory, "pfx")
+        self.dxvk_directory: str                           = path.join(self.root, "dxvk")
+        self.gallium_nine_directory: str                   = path.join(self.root, "gallium-nine")
+        self.calls_filepath: str                           = path.join(self.root, "calls.log")
+
+        for directory in ["drive_c/windows/system32", "drive_c/windows/syswow64"]:
+            makedirs(path.join(self.prefix, directory))
+
+        for arch in ["x32", "x64"]:
+            makedirs(path.join(self.dxvk_directory, arch))
+
+            for dll in ["d3d10core.dll", "d3d11.dll", "d3d9.dll", "dxgi.dll"]:
+                with open(path.join(self.dxvk_directory, arch, dll), "w") as fp:
+                    fp.write(arch)
+
+        for filepath in ["bin32/ninewinecfg.exe.so", "lib32/d3d9-nine.dll.so", "bin64/ninewinecfg.exe.so", "lib64/d3d9-nine.dll.so"]:
+            makedirs(path.dirname(path.join(self.gallium_nine_directory, filepath)), exist_ok = True)
+
+            with open(path.join(self.gallium_nine_directory, filepath), "w") as fp:
+                fp.write(filepath)
+
+        makedirs(self.bin_directory)
+
+        for name in ["wine", "wine64", "wineserver", "umu-run"]:
+            filepath: str = path.join(self.bin_directory, name)
+
+            with open(filepath, "w") as fp:
+                fp.write(_STUB.format(calls_filepath = self.calls_filepath))
+
+            chmod(filepath, 0o755)
+
+        with open(path.join(self.application_directory, "game.exe"), "w") as fp:
+            fp.write("")
+
+        makedirs(path.join(self.config_directory, "profiles"))
+
+        with open(path.join(self.config_directory, "profiles", profile_id), "w") as fp:
+            fp.write(
+                f'[profile]\nprofile_id = "{profile_id}"\nwine_directory = "{self.bin_directory}"\n' \
+                + f'application_directory = "{self.application_directory}"\n{profile_options}\n' \
+                + f'[profile.executables_aliases]\nlauncher = "{path.join(self.application_directory, "game.exe")}"\n' \
+                + f'[profile.tools]\ndxvk_directory = "{self.dxvk_directory}"\n' \
+                + f'gallium_nine_directory = "{self.gallium_nine_directory}"\n'
+            )
+
+
+    def __enter__(self) -> "Sandbox":
+        return self
+
+
+    def __exit__(self, *_: object) -> None:
+        self._temporary_directory.cleanup()
+
+
+    def getEnvironment(self) -> Dict[str, str]:
+        """
+        getEnvironment
+
+        :return: wrunner's environment, with the sandbox's configuration directory and home.
+        """
+
+        return {
+            **environ,
+            "HOME": self.root,
+            "XDG_CONFIG_HOME": path.join(self.root, ".config"),
+            "XDG_DATA_HOME": path.join(self.root, ".local/share"),
+            "WRUNNER_CONFIG_DIR": self.config_directory,
+            "PYTHONDONTWRITEBYTECODE": "1"
+        }
+
+
+    def run(self, args: List[str], python_args: List[str] | None = None) -> CompletedProcess[str]:
+        """
+        run
+
+        :args: Arguments of wrunner.
+        :python_args: (Optional) Arguments of the interpreter.
+        :return: The finished wrunner process, with its output.
+        """
+
+        return run(
+            [executable, *(python_args if python_args else []), WRUNNER_PATH, *args],
+            capture_output = True,
+            text = True,
+            env = self.getEnvironment(),
+            cwd = self.root,
+            timeout = 60
+        )
+
+
+    def runWithModules(self, args: List[str]) -> Tuple[CompletedProcess[str], Set[str]]:
+        """
+        runWithModules
+
+        :args: Arguments of wrunner, it mustn't replace itself with the runner.
+        :return: The finished wrunner process, and the modules it loaded.
+        """
+
+        modules_filepath: str = path.join(self.root, "modules")
+        result: CompletedProcess[str] = self.run(args, ["-c", _MODULES_DRIVER.format(root_directory = ROOT_DIRECTORY), modules_filepath])
+
+        with open(modules_filepath) as fp:
+            return result, set(fp.read().split())
+
+
+    def snapshot(self) -> Dict[str, bytes | None]:
+        """
+        snapshot
+
+        :return: The content of every file under the application directory, by path, None for directories.
+        """
+
+        files: Dict[str, bytes | None] = {}
+
+        for dirpath, dirnames, filenames in walk(self.application_directory):
+            for dirname in dirnames:
+                files[path.join(dirpath, dirname)] = None
+
+            for filename in filenames:
+                with open(path.join(dirpath, filename), "rb") as fp:
+                    files[path.join(dirpath, filename)] = fp.read()
+
+        return files
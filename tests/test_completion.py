@@ -0,0 +1,123 @@
+from os import path, symlink
+from shutil import which
+from subprocess import CompletedProcess, run
+from typing import Dict, List
+from unittest import TestCase, main, skipUnless
+from sandbox import ROOT_DIRECTORY, WRUNNER_PATH, Sandbox
+
+
+class CompletionTest(TestCase):
+    """
+    CompletionTest
+
+    wrunner --complete and the bash script complete the same candidates, several verbs may be followed
+    by a launch option.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox()
+
+        symlink(WRUNNER_PATH, path.join(self.sandbox.bin_directory, "wrunner"))
+
+
+    def tearDown(self) -> None:
+        self.sandbox.__exit__()
+
+
+    def _complete(self, line: str) -> List[str]:
+        """
+        _complete
+
+        :line: The command line, the last word being the one completed.
+        :return: The names of the candidates of wrunner --complete.
+        """
+
+        words: List[str] = line.split(" ")
+        result: CompletedProcess[str] = self.sandbox.run(["--complete", str(len(words) - 1), *words])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+        return [candidate.split(":", 1)[0] for candidate in result.stdout.splitlines()]
+
+
+    def _completeBash(self, line: str) -> List[str]:
+        """
+        _completeBash
+
+        :line: The command line, the last word being the one completed.
+        :return: The candidates of the bash completion script.
+        """
+
+        words: List[str] = line.split(" ")
+        script: str = f"source {path.join(ROOT_DIRECTORY, 'completion/bash/_wrunner')}\n" \
+                      + f"COMP_WORDS=({' '.join(repr(word) for word in words)})\n" \
+                      + f"COMP_CWORD={len(words) - 1}\n" \
+                      + "_wrunner\n" \
+                      + "printf '%s\\n' \"${COMPREPLY[@]}\"\n"
+        env: Dict[str, str] = self.sandbox.getEnvironment()
+        env["PATH"] = f"{self.sandbox.bin_directory}:{env['PATH']}"
+        result: CompletedProcess[str] = run(["bash", "-c", script], capture_output = True, text = True, env = env, timeout = 60)
+
+        self.assertEqual(result.stderr, "")
+
+        return [candidate for candidate in result.stdout.splitlines() if candidate]
+
+
+    def testProfileIds(self) -> None:
+        self.assertEqual(self._complete("wrunner g"), ["game"])
+
+
+    def testFirstVerb(self) -> None:
+        candidates: List[str] = self._complete("wrunner game ")
+
+        self.assertIn("install-dxvk", candidates)
+        self.assertIn("--run", candidates)
+        self.assertIn("--list-aliases", candidates)
+
+
+    def testVerbAfterVerb(self) -> None:
+        candidates: List[str] = self._complete("wrunner game install-dxvk ")
+
+        self.assertIn("init", candidates)
+        self.assertNotIn("install-dxvk", candidates)
+
+        for launch in ["--run", "--runinprefix", "--waitforexitandrun", "--winetricks", "--dry-run"]:
+            self.assertIn(launch, candidates)
+
+        self.assertNotIn("--list-aliases", candidates)
+
+
+    def testOptionsAfterVerb(self) -> None:
+        self.assertEqual(self._complete("wrunner game install-dxvk init --w"), ["--waitforexitandrun", "--winetricks"])
+
+
+    def testNoVerbAfterOption(self) -> None:
+        candidates: List[str] = self._complete("wrunner game install-dxvk --dry-run ")
+
+        self.assertNotIn("init", candidates)
+        self.assertNotIn("--dry-run", candidates)
+        self.assertIn("--run", candidates)
+
+
+    def testAliasesAfterVerbs(self) -> None:
+        self.assertEqual(self._complete("wrunner game install-dxvk init --run "), ["launcher"])
+        self.assertEqual(self._complete("wrunner game install-dxvk --run launcher "), [])
+
+
+    @skipUnless(which("bash"), "bash isn't installed")
+    def testBashScript(self) -> None:
+        for line in [
+            "wrunner ",
+            "wrunner game ",
+            "wrunner game install-dxvk ",
+            "wrunner game install-dxvk init --w",
+            "wrunner game install-dxvk --dry-run ",
+            "wrunner game install-dxvk init --run ",
+            "wrunner game --dry-run "
+        ]:
+            # Without the static cache the script falls back to wrunner --complete, which generates it.
+            self.assertEqual(sorted(self._completeBash(line)), sorted(self._complete(line)), line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from os import path
+from subprocess import CompletedProcess
+from typing import Dict, List
+from unittest import TestCase, main
+from sandbox import Sandbox
+
+
+class DryRunTest(TestCase):
+    """
+    DryRunTest
+
+    The verbs changing the prefix only print what they would do with --dry-run.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox()
+
+        # Installed DLLs, so the uninstall verbs have files to remove.
+        for directory in ["system32", "syswow64"]:
+            for dll in ["d3d11.dll", "d3d9-nine.dll", "d3d9-nine.bak", "ninewinecfg.exe", "nvapi.dll", "nvapi64.dll"]:
+                with open(path.join(self.sandbox.prefix, "drive_c/windows", directory, dll), "w") as fp:
+                    fp.write(dll)
+
+
+    def tearDown(self) -> None:
+        self.sandbox.__exit__()
+
+
+    def _runDryRun(self, verb: str) -> CompletedProcess[str]:
+        """
+        _runDryRun
+
+        :verb: The verb to be run with --dry-run.
+        :return: The finished wrunner process, asserting it left the application directory and the runners untouched.
+        """
+
+        before: Dict[str, bytes | None] = self.sandbox.snapshot()
+        result: CompletedProcess[str] = self.sandbox.run([self.sandbox.profile_id, verb, "--dry-run"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self.sandbox.snapshot(), before)
+
+        calls: List[str] = []
+
+        if path.exists(self.sandbox.calls_filepath):
+            with open(self.sandbox.calls_filepath) as fp:
+                calls = [line for line in fp.read().splitlines() if not line.endswith("--version")]
+
+        self.assertEqual(calls, [])
+
+        return result
+
+
+    def testDestroyPrefix(self) -> None:
+        result: CompletedProcess[str] = self._runDryRun("destroy-prefix")
+
+        self.assertIn(f"rm -rf {self.sandbox.application_directory}", result.stdout)
+        self.assertNotIn("Removed prefix", result.stdout)
+
+
+    def testInstallDXVK(self) -> None:
+        result: CompletedProcess[str] = self._runDryRun("install-dxvk")
+
+        self.assertIn(f"cp {path.join(self.sandbox.dxvk_directory, 'x64', 'd3d11.dll')}", result.stdout)
+
+
+    def testUninstallDXVK(self) -> None:
+        self.assertIn("rm ", self._runDryRun("uninstall-dxvk").stdout)
+
+
+    def testInstallGalliumNine(self) -> None:
+        self.assertIn("cp ", self._runDryRun("install-gallium-nine").stdout)
+
+
+    def testUninstallGalliumNine(self) -> None:
+        result: CompletedProcess[str] = self._runDryRun("uninstall-gallium-nine")
+
+        self.assertIn("mv ", result.stdout)
+        self.assertIn("rm ", result.stdout)
+
+
+    def testUninstallDXVKNVAPI(self) -> None:
+        self.assertIn("rm ", self._runDryRun("uninstall-dxvk-nvapi").stdout)
+
+
+    def testDownload(self) -> None:
+        result: CompletedProcess[str] = self._runDryRun("install-dxvk-nvapi")
+
+        self.assertIn("Would download", result.stdout)
+        self.assertFalse(path.exists(path.join(self.sandbox.root, ".local/share/wine-runner")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from os import listdir, path
+from subprocess import CompletedProcess
+from typing import List
+from unittest import TestCase, main
+from sandbox import Sandbox
+
+
+class ExecModeTest(TestCase):
+    """
+    ExecModeTest
+
+    In exec mode nothing is left to wait for the runner, accounting and sampling are skipped with a warning.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox(profile_options = "accounting = true\nsampling_interval = 0.1")
+
+
+    def tearDown(self) -> None:
+        self.sandbox.__exit__()
+
+
+    def _getHistoryFiles(self) -> List[str]:
+        """
+        _getHistoryFiles
+
+        :return: The files in the launch history directory.
+        """
+
+        history_directory: str = path.join(self.sandbox.config_directory, "history")
+
+        return sorted(listdir(history_directory)) if path.isdir(history_directory) else []
+
+
+    def testExec(self) -> None:
+        result: CompletedProcess[str] = self.sandbox.run([self.sandbox.profile_id, "--exec", "--run", "launcher"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn("sampling_interval is ignored in exec mode", result.stderr)
+        self.assertIn("accounting is ignored in exec mode", result.stderr)
+        self.assertEqual(self._getHistoryFiles(), [])
+
+
+    def testSpawn(self) -> None:
+        result: CompletedProcess[str] = self.sandbox.run([self.sandbox.profile_id, "--run", "launcher"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertNotIn("ignored in exec mode", result.stderr)
+        self.assertIn(f"{self.sandbox.profile_id}.history", self._getHistoryFiles())
+
+
+if __name__ == "__main__":
+    main()
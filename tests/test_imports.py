@@ -0,0 +1,87 @@
+from typing import Set
+from unittest import TestCase, main
+from sandbox import Sandbox
+
+
+# wrunner's modules loaded by a launch of a profile without optional features, with its logs displayed.
+# The modules of the other options and verbs are imported by them, a module added here must be needed by every launch.
+LAUNCH_MODULES: Set[str] = {
+    "handlers", "handlers.basehandler", "handlers.createhandler", "handlers.umuhandler", "handlers.winehandler",
+    "utils", "utils.environment", "utils.environment.environment", "utils.funcs", "utils.funcs.funcs",
+    "utils.logforwarder", "utils.logforwarder.logforwarder", "utils.metadata", "utils.metadata.metadata",
+    "utils.parser", "utils.parser.arguments", "utils.parser.argumentsparser", "utils.parser.parser",
+    "utils.parser.profileindex", "utils.parser.repair", "utils.probecache", "utils.probecache.probecache",
+    "utils.profilesmanager", "utils.profilesmanager.profilesmanager", "utils.tracer", "utils.tracer.tracer"
+}
+
+# Standard library modules a launch must not load: the network, HTML, tar and compression stack of the install verbs,
+# and the ones only needed by optional features.
+HEAVY_MODULES: Set[str] = {
+    "shutil", "bz2", "lzma", "zlib", "hashlib", "_hashlib", "_blake2", "tarfile", "socket", "ssl", "platform",
+    "array", "string", "html", "html.parser", "urllib.request", "http.client", "email", "csv", "ctypes", "shlex"
+}
+
+# tomllib loads these when the profile is parsed, which a launch only does when the profile index is stale.
+TOMLLIB_MODULES: Set[str] = {"string", "datetime"}
+
+
+def getWrunnerModules(modules: Set[str]) -> Set[str]:
+    """
+    getWrunnerModules
+
+    :modules: Names of loaded modules.
+    :return: The names of wrunner's own modules.
+    """
+
+    return {module for module in modules if module.split(".", 1)[0] in ["handlers", "utils"]}
+
+
+class ImportsTest(TestCase):
+    """
+    ImportsTest
+
+    A launch only imports what it needs, the rest is imported by the verbs and options using it.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox()
+
+
+    def tearDown(self) -> None:
+        self.sandbox.__exit__()
+
+
+    def _runLaunch(self) -> Set[str]:
+        """
+        _runLaunch
+
+        :return: The modules loaded by a --run.
+        """
+
+        result, modules = self.sandbox.runWithModules([self.sandbox.profile_id, "--run", "launcher"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+        return modules
+
+
+    def testLaunch(self) -> None:
+        # The first launch parses the profile to build the index, the next ones read the index.
+        for heavy_modules in [HEAVY_MODULES - TOMLLIB_MODULES, HEAVY_MODULES]:
+            modules: Set[str] = self._runLaunch()
+
+            self.assertEqual(getWrunnerModules(modules), LAUNCH_MODULES)
+            self.assertEqual(modules & heavy_modules, set())
+
+
+    def testMetadataQuery(self) -> None:
+        for heavy_modules in [HEAVY_MODULES - TOMLLIB_MODULES, HEAVY_MODULES]:
+            result, modules = self.sandbox.runWithModules(["--show-ids"])
+
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+            self.assertIn(self.sandbox.profile_id, result.stdout)
+            self.assertEqual(modules & (heavy_modules | {"subprocess", "handlers"}), set())
+
+
+if __name__ == "__main__":
+    main()
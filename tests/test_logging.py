@@ -0,0 +1,53 @@
+from os import listdir, path
+from subprocess import CompletedProcess
+from typing import List
+from unittest import TestCase, main
+from sandbox import Sandbox
+
+
+class CrashBufferTest(TestCase):
+    """
+    CrashBufferTest
+
+    In exec mode nothing is left to hold the crash buffer, the logs are discarded with a warning.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox(profile_options = 'debug = true\n[profile.logging]\n' \
+                                        + 'directory = "$HOME/logs"\ncrash_buffer_size = "1M"')
+
+
+    def tearDown(self) -> None:
+        self.sandbox.__exit__()
+
+
+    def _getLogFiles(self) -> List[str]:
+        """
+        _getLogFiles
+
+        :return: The files in the profile's logs directory.
+        """
+
+        logs_directory: str = path.join(self.sandbox.root, "logs")
+
+        return listdir(logs_directory) if path.isdir(logs_directory) else []
+
+
+    def testExec(self) -> None:
+        result: CompletedProcess[str] = self.sandbox.run([self.sandbox.profile_id, "--exec", "--run", "launcher"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn("crash_buffer_size is ignored in exec mode", result.stderr)
+        self.assertEqual(self._getLogFiles(), [])
+
+
+    def testSpawn(self) -> None:
+        result: CompletedProcess[str] = self.sandbox.run([self.sandbox.profile_id, "--run", "launcher"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertNotIn("crash_buffer_size", result.stderr)
+        self.assertEqual(self._getLogFiles(), [])
+
+
+if __name__ == "__main__":
+    main()
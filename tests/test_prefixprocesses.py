@@ -0,0 +1,103 @@
+from os import chmod, makedirs, path
+from shutil import copy, which
+from subprocess import Popen
+from sys import path as sys_path
+from time import monotonic, sleep
+from typing import Dict, List
+from unittest import TestCase, main
+from sandbox import ROOT_DIRECTORY, Sandbox
+
+sys_path.insert(0, ROOT_DIRECTORY)
+
+from utils.prefixprocesses import findPrefixProcesses, killPrefixProcesses
+
+
+class PrefixProcessesTest(TestCase):
+    """
+    PrefixProcessesTest
+
+    Only wine's processes started with the prefix's WINEPREFIX, and their descendants, belong to the prefix.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox()
+        self.processes: List[Popen[bytes]] = []
+
+        # Copies of sleep and sh named like wine's binaries, which /proc/<pid>/exe of a Windows process points to.
+        self.wine_path: str = path.join(self.sandbox.root, "wine-build", "wine64-preloader")
+        self.wine_shell_path: str = path.join(self.sandbox.root, "wine-build", "wine")
+
+        makedirs(path.dirname(self.wine_path))
+
+        for src, dst in [(which("sleep") or "/bin/sleep", self.wine_path), ("/bin/sh", self.wine_shell_path)]:
+            copy(path.realpath(src), dst)
+            chmod(dst, 0o755)
+
+
+    def tearDown(self) -> None:
+        for p in self.processes:
+            p.kill()
+            p.wait()
+
+        self.sandbox.__exit__()
+
+
+    def _spawn(self, cmd: List[str], wineprefix: str | None) -> Popen[bytes]:
+        """
+        _spawn
+
+        :cmd: The command to be spawned.
+        :wineprefix: (Optional) WINEPREFIX of the command.
+        :return: The process, once it runs the command.
+        """
+
+        env: Dict[str, str] = self.sandbox.getEnvironment()
+
+        if wineprefix: env["WINEPREFIX"] = wineprefix
+
+        p: Popen[bytes] = Popen(cmd, env = env)
+        self.processes.append(p)
+
+        # Waits for the exec, until then the child still runs python.
+        deadline: float = monotonic() + 5
+
+        while monotonic() < deadline and path.realpath(f"/proc/{p.pid}/exe") != path.realpath(cmd[0]):
+            sleep(0.01)
+
+        return p
+
+
+    def testWineProcesses(self) -> None:
+        wine: Popen[bytes] = self._spawn([self.wine_path, "60"], self.sandbox.prefix)
+        other_prefix: Popen[bytes] = self._spawn([self.wine_path, "60"], self.sandbox.prefix + "2")
+
+        self.assertEqual([p[0] for p in findPrefixProcesses(self.sandbox.prefix)], [wine.pid])
+        self.assertNotIn(other_prefix.pid, [p[0] for p in findPrefixProcesses(self.sandbox.prefix + "2/..")])
+
+
+    def testShellWithWineprefix(self) -> None:
+        # A shell which exported WINEPREFIX, its children aren't wine's either.
+        shell: Popen[bytes] = self._spawn(["/bin/sh", "-c", "sleep 60; true"], self.sandbox.prefix)
+
+        self.assertEqual(findPrefixProcesses(self.sandbox.prefix), [])
+        self.assertEqual(killPrefixProcesses(self.sandbox.prefix, 1.0), (0, 0))
+        self.assertIsNone(shell.poll())
+
+
+    def testDescendants(self) -> None:
+        wine: Popen[bytes] = self._spawn([self.wine_shell_path, "-c", "sleep 60; true"], self.sandbox.prefix)
+        shell: Popen[bytes] = self._spawn(["/bin/sh", "-c", "sleep 60; true"], self.sandbox.prefix)
+        deadline: float = monotonic() + 5
+
+        # Waits for the wine process to spawn its child.
+        while monotonic() < deadline and len(findPrefixProcesses(self.sandbox.prefix)) < 2:
+            sleep(0.01)
+
+        self.assertEqual(len(findPrefixProcesses(self.sandbox.prefix)), 2)
+        self.assertEqual(killPrefixProcesses(self.sandbox.prefix, 1.0), (2, 0))
+        self.assertEqual(wine.wait(5), -15)
+        self.assertIsNone(shell.poll())
+
+
+if __name__ == "__main__":
+    main()
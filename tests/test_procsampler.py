@@ -0,0 +1,39 @@
+from os import path
+from sys import path as sys_path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from sandbox import ROOT_DIRECTORY
+
+sys_path.insert(0, ROOT_DIRECTORY)
+
+from utils.procsampler import getSamplesFilepaths
+
+
+class SamplesFilepathsTest(TestCase):
+    """
+    SamplesFilepathsTest
+
+    The sample files of a profile are matched by its whole id.
+    """
+
+    def testProfileIdWithDots(self) -> None:
+        with TemporaryDirectory() as directory:
+            for filename in [
+                "foo.20260101-000000-1.samples",
+                "foo.bar.20260101-000000-2.samples",
+                "foo.20260102-000000-3.samples",
+                "foobar.20260101-000000-4.samples",
+                "foo.history"
+            ]:
+                with open(path.join(directory, filename), "w") as fp:
+                    fp.write("")
+
+            self.assertEqual(
+                [path.basename(f) for f in getSamplesFilepaths("foo", directory)],
+                ["foo.20260101-000000-1.samples", "foo.20260102-000000-3.samples"]
+            )
+            self.assertEqual([path.basename(f) for f in getSamplesFilepaths("foo.bar", directory)], ["foo.bar.20260101-000000-2.samples"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from os import makedirs, path
+from sys import path as sys_path
+from tempfile import TemporaryDirectory
+from typing import Iterable
+from unittest import TestCase, main
+from sandbox import ROOT_DIRECTORY
+
+sys_path.insert(0, ROOT_DIRECTORY)
+
+from utils.scheduling.topology import CPUTopology
+
+
+class TopologyTest(TestCase):
+    """
+    TopologyTest
+
+    affinity = "auto" picks the biggest L3, then the fastest cores, from fake sysfs trees.
+    """
+
+    def setUp(self) -> None:
+        self._temporary_directory: TemporaryDirectory[str] = TemporaryDirectory()
+        self.sysfs_root: str = self._temporary_directory.name
+
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+
+    def _writeFile(self, filepath: str, value: str) -> None:
+        """
+        _writeFile
+
+        :filepath: Path to the file, relative to the sysfs root.
+        :value: Content of the file.
+        :return:
+        """
+
+        makedirs(path.dirname(path.join(self.sysfs_root, filepath)), exist_ok = True)
+
+        with open(path.join(self.sysfs_root, filepath), "w") as fp:
+            fp.write(f"{value}\n")
+
+
+    def _writeCPUs(self, cpus: Iterable[int], l3_cpus: str, l3_size: str, max_frequency: int) -> None:
+        """
+        _writeCPUs
+
+        Writes the cpuN directories of CPUs sharing the same topology, each CPU being its own core.
+
+        :cpus: The CPUs.
+        :l3_cpus: The CPUs sharing their L3, in the cpulist format.
+        :l3_size: Size of their L3, e.g. "32768K".
+        :max_frequency: Their maximum frequency in kHz.
+        :return:
+        """
+
+        for cpu in cpus:
+            self._writeFile(f"cpu{cpu}/topology/thread_siblings_list", str(cpu))
+            self._writeFile(f"cpu{cpu}/cache/index3/level", "3")
+            self._writeFile(f"cpu{cpu}/cache/index3/shared_cpu_list", l3_cpus)
+            self._writeFile(f"cpu{cpu}/cache/index3/size", l3_size)
+            self._writeFile(f"cpu{cpu}/cpufreq/cpuinfo_max_freq", str(max_frequency))
+
+
+    def testSMTSiblings(self) -> None:
+        # 4 cores with 2 threads each, CPU n and n + 4 are the threads of the same core.
+        self._writeFile("online", "0-7")
+        self._writeCPUs(range(0, 8), "0-7", "16384K", 4500000)
+
+        for cpu in range(0, 8):
+            self._writeFile(f"cpu{cpu}/topology/thread_siblings_list", f"{cpu % 4},{cpu % 4 + 4}")
+
+        topology: CPUTopology = CPUTopology(self.sysfs_root)
+
+        self.assertEqual(len(topology.getGroups()), 1)
+        self.assertEqual(topology.getGroups()[0][1], 4)
+        self.assertEqual(topology.getBestCPUs(set(range(8))), set(range(8)))
+        self.assertEqual(topology.getBestCPUs({0, 4, 9}), {0, 4})
+
+
+    def testDualCCDAsymmetricL3(self) -> None:
+        # The first CCD has the stacked L3 and lower clocks, the second one the regular L3 and higher clocks.
+        self._writeFile("online", "0-7")
+        self._writeCPUs(range(0, 4), "0-3", "98304K", 4200000)
+        self._writeCPUs(range(4, 8), "4-7", "32768K", 5000000)
+
+        topology: CPUTopology = CPUTopology(self.sysfs_root)
+
+        self.assertEqual(topology.getBestCPUs(set(range(8))), {0, 1, 2, 3})
+        # Without any CPU of the best CCD allowed, the next one is used.
+        self.assertEqual(topology.getBestCPUs({5, 6}), {5, 6})
+
+
+    def testHybridFrequencies(self) -> None:
+        # P-cores with SMT and E-cores without it, all sharing the same L3.
+        self._writeFile("online", "0-7")
+        self._writeCPUs(range(0, 4), "0-7", "30720K", 5400000)
+        self._writeCPUs(range(4, 8), "0-7", "30720K", 4200000)
+
+        for cpu in range(0, 4):
+            self._writeFile(f"cpu{cpu}/topology/thread_siblings_list", f"{cpu - cpu % 2}-{cpu - cpu % 2 + 1}")
+
+        topology: CPUTopology = CPUTopology(self.sysfs_root)
+
+        self.assertEqual(len(topology.getGroups()), 2)
+        self.assertEqual(topology.getGroups()[0][1], 2)
+        self.assertEqual(topology.getBestCPUs(set(range(8))), {0, 1, 2, 3})
+        self.assertEqual(topology.getBestCPUs({4, 5, 6, 7}), {4, 5, 6, 7})
+
+
+    def testNoTopology(self) -> None:
+        self.assertIsNone(CPUTopology(self.sysfs_root).getBestCPUs({0, 1}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from subprocess import CompletedProcess
+from typing import List
+from unittest import TestCase, main
+from sandbox import Sandbox
+
+
+class WineserverSessionTest(TestCase):
+    """
+    WineserverSessionTest
+
+    A launch after verbs keeps the wineserver the verbs shared.
+    """
+
+    def setUp(self) -> None:
+        self.sandbox: Sandbox = Sandbox()
+
+
+    def tearDown(self) -> None:
+        self.sandbox.__exit__()
+
+
+    def _getWineserverCalls(self) -> List[str]:
+        """
+        _getWineserverCalls
+
+        :return: The arguments wineserver was run with, in order.
+        """
+
+        with open(self.sandbox.calls_filepath) as fp:
+            return [line.split(" ", 1)[1] for line in fp.read().splitlines() if line.startswith("wineserver ")]
+
+
+    def testWaitForExitAndRunAfterVerbs(self) -> None:
+        result: CompletedProcess[str] = self.sandbox.run([self.sandbox.profile_id, "install-dxvk", "--waitforexitandrun", "launcher"])
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        # Started once for the verbs, then neither killed nor waited for by the launch.
+        self.assertEqual(self._getWineserverCalls(), ["-p300"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+
+from argparse import ArgumentParser, Namespace
+from importlib.util import MAGIC_NUMBER
+from marshal import dumps
+from os import chmod, makedirs, path, walk
+from typing import Generator, List, Tuple
+from zipfile import ZipFile, ZIP_STORED
+
+
+ROOT_DIRECTORY: str = path.dirname(path.dirname(path.abspath(__file__)))
+PACKAGES: List[str] = ["handlers", "utils"]
+
+
+def collectFiles() -> Generator[Tuple[str, str], None, None]:
+    """
+    collectFiles
+
+    Collects every file that must be shipped in the zipapp.
+
+    :return: A generator of tuples of format (path_on_disk, path_inside_the_archive).
+    """
+
+    yield path.join(ROOT_DIRECTORY, "wrunner"), "__main__.py"
+
+    for package in PACKAGES:
+        for dirpath, dirnames, filenames in walk(path.join(ROOT_DIRECTORY, package)):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+
+            for filename in sorted(filenames):
+                if filename.endswith((".pyc", ".pyo")) or filename == "testargumentparser.py": continue
+
+                filepath: str = path.join(dirpath, filename)
+
+                yield filepath, path.relpath(filepath, ROOT_DIRECTORY)
+
+
+def compileSource(filepath: str, arcname: str, optimize: int) -> bytes:
+    """
+    compileSource
+
+    Compiles a module to an unchecked hash based .pyc, so zipimport never compares it against the source.
+
+    :filepath: Path to the source file.
+    :arcname: Path of the source file inside the archive, used in tracebacks.
+    :optimize: Optimization level, same as python -O.
+    :return: The contents of the .pyc file.
+    """
+
+    with open(filepath, "rb") as fp:
+        source: bytes = fp.read()
+
+    code = compile(source, arcname, "exec", dont_inherit = True, optimize = optimize)
+
+    # Flags 0b01 means hash based and unchecked, the source hash is left empty.
+    return MAGIC_NUMBER + (1).to_bytes(4, "little") + bytes(8) + dumps(code)
+
+
+def build(output: str, optimize: int, interpreter: str) -> None:
+    """
+    build
+
+    Builds the zipapp. The sources are shipped next to the .pyc files, zipimport falls back to them
+    when the bundle is run by another Python version.
+
+    :output: Path to the zipapp.
+    :optimize: Optimization level, same as python -O.
+    :interpreter: Interpreter written to the shebang line.
+    :return:
+    """
+
+    makedirs(path.dirname(path.abspath(output)), exist_ok = True)
+
+    with open(output, "wb") as fp:
+        fp.write(f"#! {interpreter}\n".encode())
+
+        # Stored, not deflated, so modules are loaded without paying for zlib.
+        with ZipFile(fp, "w", ZIP_STORED) as zf:
+            for filepath, arcname in collectFiles():
+                zf.write(filepath, arcname)
+
+                if arcname.endswith(".py"):
+                    zf.writestr(arcname + "c", compileSource(filepath, arcname, optimize))
+
+    chmod(output, 0o755)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description = "Builds wine-runner as a single-file zipapp.")
+    parser.add_argument("-o", "--output", default = path.join(ROOT_DIRECTORY, "dist/wrunner"), help = "Output file.")
+    parser.add_argument("-O", "--optimize", type = int, default = 1, choices = [0, 1, 2], help = "Optimization level.")
+    parser.add_argument("-p", "--python", default = "/usr/bin/env python3", help = "Interpreter for the shebang line.")
+
+    namespace: Namespace = parser.parse_args()
+
+    build(namespace.output, namespace.optimize, namespace.python)
+    print(f"Built {namespace.output}")
@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+
+from argparse import ArgumentParser, Namespace
+from os import path
+from sys import path as sys_path, stdout
+
+ROOT_DIRECTORY: str = path.dirname(path.dirname(path.abspath(__file__)))
+sys_path.insert(0, ROOT_DIRECTORY)
+
+from utils.procsampler import getSamplesFilepaths, loadSamples, summarizeSamples, writeSamplesCSV
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description = "Summarizes or exports the processes sampled during a session.")
+    parser.add_argument("samples", help = "Sample file, or a profile id to use its last sampled session.")
+    parser.add_argument("-c", "--csv", metavar = "OUTPUT", help = "Exports the samples as CSV, - for stdout.")
+
+    namespace: Namespace = parser.parse_args()
+    samples_filepath: str = namespace.samples
+
+    if not path.isfile(samples_filepath):
+        samples_filepaths = getSamplesFilepaths(samples_filepath)
+
+        if not samples_filepaths: parser.error(f"No sample file or sampled sessions found for: {samples_filepath}")
+
+        samples_filepath = samples_filepaths[-1]
+
+    meta, columns = loadSamples(samples_filepath)
+
+    if not namespace.csv:
+        print(f"{samples_filepath}\n\n{summarizeSamples(meta, columns)}")
+    elif namespace.csv == "-":
+        writeSamplesCSV(meta, columns, stdout)
+    else:
+        with open(namespace.csv, "w", newline = "") as fp:
+            writeSamplesCSV(meta, columns, fp)
@@ -1,2 +1,17 @@
-from utils.profilesmanager import ProfilesManager
-from utils.parser import Parser
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first access so lightweight entry points (metadata queries, completion)
+    # don't pull in the handlers.
+    if name == "ProfilesManager":
+        from utils.profilesmanager import ProfilesManager
+
+        return ProfilesManager
+
+    if name == "Parser":
+        from utils.parser import Parser
+
+        return Parser
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
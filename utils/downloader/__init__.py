@@ -1 +1 @@
-from utils.downloader.downloader import Downloader
+from utils.downloader.downloader import Downloader, getPackageUrl
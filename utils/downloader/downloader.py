@@ -6,6 +6,7 @@ from email.message import Message
 from tarfile import open as topen
 from tarfile import TarInfo
 from utils.funcs import die, _print, removeExtentions
+from utils.basichtmlparser import BasicHtmlParser
 
 
 class Downloader:
@@ -152,3 +153,46 @@ class Downloader:
 
             return path.join(self._download_directory, dirname) if dirname else self._download_directory
 
+
+def getPackageUrl(url: str) -> str:
+    """
+    getPackageURL
+
+    Gets the package of a Github project given it's provided.
+
+    :url: Url of the github package that should be downloaded.
+    :return:
+    """
+
+    expanded_assets_url: str = ""
+
+    headers: Dict[str, str] = {
+        "User-Agent": "Mozilla/5.0"
+    }
+
+    request: Request = Request(url, headers=headers)
+
+    try:
+        with urlopen(request, timeout=30) as r:
+            if r.getcode() != 200: die(f"Failed to fetch html document for url: {url}")
+
+            html: str = r.read().decode("utf-8")
+            parser: BasicHtmlParser = BasicHtmlParser("include-fragment", ("src", None), (None, lambda s: s.startswith("http")))
+            parser.feed(html)
+            expanded_assets_url = parser.get_attribute()
+    except Exception as e:
+        die(f"Failed to make a request to the url: {url}.\nError: {e}")
+
+    if not expanded_assets_url != "": die("Failed to get expanded_assets_url.")
+
+    request = Request(expanded_assets_url, headers=headers)
+
+    with urlopen(request, timeout=30) as r:
+        if r.getcode() != 200: die(f"Failed to fetch html document for url: {expanded_assets_url}")
+
+        html: str = r.read().decode("utf-8")
+        parser: BasicHtmlParser = BasicHtmlParser("a", ("href", None), (None, lambda s: s.endswith(".tar.gz")))
+        parser.feed(html)
+        relative_url: str = parser.get_attribute()
+
+        return "https://github.com/" + relative_url if relative_url else relative_url
@@ -0,0 +1 @@
+from utils.environment.environment import Environment
@@ -0,0 +1,57 @@
+from os import environ, pathsep
+from typing import Dict, Iterator, Mapping
+
+
+class Environment(Mapping[str, str]):
+    """
+    Environment
+
+    Immutable set of environment variables passed to the commands of a handler, os.environ is never written.
+    Every change returns a new Environment, so an environment can be shared by several launches and threads,
+    and handlers of different profiles can live in the same process.
+
+    :variables: (Optional) Initial variables, defaults to a snapshot of wrunner's own environment.
+    """
+
+    __slots__ = ("_variables",)
+
+    def __init__(self, variables: Mapping[str, str] | None = None):
+        self._variables: Dict[str, str] = dict(environ if variables is None else variables)
+
+
+    def __getitem__(self, name: str) -> str:
+        return self._variables[name]
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._variables)
+
+
+    def __len__(self) -> int:
+        return len(self._variables)
+
+
+    def updated(self, variables: Mapping[str, str]) -> "Environment":
+        """
+        updated
+
+        :variables: Variables to be added or replaced.
+        :return: A new environment with the variables.
+        """
+
+        return Environment({**self._variables, **variables})
+
+
+    def withPath(self, directory: str) -> "Environment":
+        """
+        withPath
+
+        :directory: Directory appended to PATH.
+        :return: A new environment with the directory in PATH, the same environment if it's already there.
+        """
+
+        search_path: str = self._variables.get("PATH", "")
+
+        if directory in search_path.split(pathsep): return self
+
+        return self.updated({"PATH": f"{search_path}{pathsep}{directory}" if search_path else directory})
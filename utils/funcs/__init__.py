@@ -1,2 +1,3 @@
-from utils.funcs.funcs import die, getPackageUrl, getValue, findFiles, handleExceptionIfAny, \
-                              negate, negateBool, _print, removeExtentions, restoreEnvar
+from utils.funcs.funcs import die, getValue, findFiles, handleExceptionIfAny, \
+                              negate, negateBool, _print, removeExtentions, copyFile, \
+                              getBundlePath
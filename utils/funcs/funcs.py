@@ -1,9 +1,6 @@
-from typing import Any, Callable, Dict, List, Generator, NoReturn, TextIO, Union
+from typing import Any, Callable, List, Generator, NoReturn, TextIO, Union
 from sys import stderr, stdout
-from os import environ, path, scandir
-from tarfile import TarInfo
-from utils.basichtmlparser import BasicHtmlParser
-from urllib.request import Request, urlopen
+from os import path, remove, scandir
 
 
 def _print(msg: str, fs: TextIO = stdout, end: str = '\n') -> None:
@@ -146,79 +143,37 @@ def removeExtentions(filename: str, n_times: int = 1) -> str:
     return filename
 
 
-def tarfileHasRootDirectory(members: List[TarInfo]) -> bool:
+def copyFile(src: str, dst: str) -> str:
     """
-    tarfileHasRootDirectory
+    copyFile
 
-    Tells where the names are within a common high-level directory.
-    Paths must be in the order they appear.
+    Copies the file src to the file or directory dst, same as shutil.copy, but an existing destination is
+    unlinked first instead of being written in place, it may be a hardlink or symlink shared with a prefix template
+    or the wine build.
+    shutil is imported on use since it drags in the compression modules, which launching never needs.
 
-    :names: List of TarInfo objects.
-    :return: True if there's a single high-level directory for all other paths within the members.
+    :src: Path to the file to be copied.
+    :dst: Path to the destination file or directory.
+    :return: The path to the new file.
     """
 
-    return members[0].isdir() and path.commonpath([m.name for m in members]) == members[0].name if members else False
+    from shutil import copy
 
+    dst_filepath: str = path.join(dst, path.basename(src)) if path.isdir(dst) else dst
 
-def getPackageUrl(url: str) -> str:
-    """
-    getPackageURL
-
-    Gets the package of a Github project given it's provided.
-
-    :url: Url of the github package that should be downloaded.
-    :return:
-    """
+    if path.lexists(dst_filepath): remove(dst_filepath)
 
-    expanded_assets_url: str = ""
+    return copy(src, dst_filepath)
 
-    headers: Dict[str, str] = {
-        "User-Agent": "Mozilla/5.0"
-    }
-
-    request: Request = Request(url, headers=headers)
-
-    try:
-        with urlopen(request, timeout=30) as r:
-            if r.getcode() != 200: die(f"Failed to fetch html document for url: {url}")
-
-            html: str = r.read().decode("utf-8")
-            parser: BasicHtmlParser = BasicHtmlParser("include-fragment", ("src", None), (None, lambda s: s.startswith("http")))
-            parser.feed(html)
-            expanded_assets_url = parser.get_attribute()
-    except Exception as e:
-        die(f"Failed to make a request to the url: {url}.\nError: {e}")
 
-    if not expanded_assets_url != "": die("Failed to get expanded_assets_url.")
-
-    request = Request(expanded_assets_url, headers=headers)
-
-    with urlopen(request, timeout=30) as r:
-        if r.getcode() != 200: die(f"Failed to fetch html document for url: {expanded_assets_url}")
-
-        html: str = r.read().decode("utf-8")
-        parser: BasicHtmlParser = BasicHtmlParser("a", ("href", None), (None, lambda s: s.endswith(".tar.gz")))
-        parser.feed(html)
-        relative_url: str = parser.get_attribute()
-
-        return "https://github.com/" + relative_url if relative_url else relative_url
-
-
-def restoreEnvar(name: str, value: str | None) -> None:
+def getBundlePath() -> str | None:
     """
-    restoreEnvar
+    getBundlePath
 
-    Restore the value of the environment variable or pop it from the environ object.
+    Tells whether wine-runner is running from the zipapp built by tools/buildzipapp.py.
 
-    :name: Name of the environment variable.
-    :value: Original value of the environment variable.
-    :return:
+    :return: The path to the zipapp or None when running from the source tree.
     """
 
-    if not value:
-        environ.pop(name, None)
-
-        return
-
-    environ[name] = value
+    return getattr(__loader__, "archive", None)
 
@@ -0,0 +1 @@
+from utils.launchhistory.launchhistory import LaunchHistory, LaunchKey, Usage
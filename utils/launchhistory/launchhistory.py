@@ -0,0 +1,149 @@
+from marshal import dumps, load
+from os import O_APPEND, O_CREAT, O_WRONLY, close, environ, makedirs, path, write
+from os import open as osopen
+from time import time
+from typing import Any, Callable, Dict, Generator, List, Tuple
+from utils.parser.repair import getConfigDirectory
+
+
+# Format is (wall_seconds, user_cpu_seconds, system_cpu_seconds, max_rss_kib, blocks_read, blocks_written, return_code)
+Usage = Tuple[float, float, float, int, int, int, int]
+
+# Format is ( (setting, value), ... ), e.g. (("runner", "wine-9.0"), ("sync", "fsync"), ("dxvk", "on"))
+LaunchKey = Tuple[Tuple[str, str], ...]
+
+# Format is (version, timestamp, alias, launch_key, usage)
+Record = Tuple[int, int, str, LaunchKey, Usage]
+
+# Format is [ (name, getter, formatter) ], the columns of the stats summary.
+_COLUMNS: List[Tuple[str, Callable[[Usage], float], Callable[[float], str]]] = [
+    ("wall",        lambda u: u[0],         lambda v: f"{v:.2f}s"),
+    ("cpu",         lambda u: u[1] + u[2],  lambda v: f"{v:.2f}s"),
+    ("max rss",     lambda u: u[3],         lambda v: f"{v / 1024:.1f}MiB"),
+    ("read",        lambda u: u[4],         lambda v: f"{v * 512 / (1 << 20):.1f}MiB"),
+    ("written",     lambda u: u[5],         lambda v: f"{v * 512 / (1 << 20):.1f}MiB"),
+]
+
+_PERCENTILES: List[int] = [50, 90, 99]
+
+
+class LaunchHistory:
+    """
+    LaunchHistory
+
+    Append-only history of the resources used by each launch of a profile.
+    Every launch is a marshal record appended to <config>/history/<profile_id>.history with a single write,
+    keyed by the alias and by the settings that change the performance (runner build, sync method, DXVK).
+
+    :profile_id: Application's profile id.
+    :history_directory: (Optional) Directory of the history files, defaults to history in the configuration directory.
+    """
+
+    _VERSION: int = 1
+
+    def __init__(self, profile_id: str, history_directory: str | None = None):
+        self._history_directory: str    = history_directory if history_directory \
+                                          else path.join(environ.get("WRUNNER_CONFIG_DIR") or getConfigDirectory(), "history")
+        self._history_filepath: str     = path.join(self._history_directory, f"{profile_id}.history")
+        self._profile_id: str           = profile_id
+
+
+    def append(self, alias: str, launch_key: LaunchKey, usage: Usage) -> None:
+        """
+        append
+
+        Appends the record of a launch, failing silently as the history is only informative.
+
+        :alias: Executable alias (or path) that was launched.
+        :launch_key: Settings the launch ran with.
+        :usage: Resources used by the launch.
+        :return:
+        """
+
+        record: Record = (self._VERSION, int(time()), alias, launch_key, usage)
+
+        try:
+            makedirs(self._history_directory, exist_ok = True)
+            fd: int = osopen(self._history_filepath, O_WRONLY | O_APPEND | O_CREAT, 0o644)
+        except OSError:
+            return
+
+        try:
+            write(fd, dumps(record))
+        except OSError:
+            pass
+        finally:
+            close(fd)
+
+
+    def getRecords(self) -> Generator[Record, None, None]:
+        """
+        getRecords
+
+        :return: A generator with the records, a truncated last record (e.g. disk full) ends the history.
+        """
+
+        try:
+            fp = open(self._history_filepath, "rb")
+        except OSError:
+            return
+
+        with fp:
+            while True:
+                try:
+                    record: Any = load(fp)
+                except (EOFError, ValueError, TypeError):
+                    return
+
+                if isinstance(record, tuple) and len(record) == 5 and record[0] == self._VERSION: yield record
+
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        """
+        _percentile
+
+        :values: Sorted values.
+        :percentile: Percentile between 0 and 100.
+        :return: The nearest-rank percentile.
+        """
+
+        return values[max(0, -(-percentile * len(values) // 100) - 1)]
+
+
+    def summarize(self) -> str:
+        """
+        summarize
+
+        Summarizes the history with percentiles per alias and settings.
+
+        :return: The summary.
+        """
+
+        # Format is { (alias, launch_key): [usage] }
+        groups: Dict[Tuple[str, LaunchKey], List[Usage]] = {}
+
+        for _, _, alias, launch_key, usage in self.getRecords():
+            groups.setdefault((alias, launch_key), []).append(usage)
+
+        if not groups: return f"No launches recorded for the profile \"{self._profile_id}\"."
+
+        header: str = f"{'':<10}" + "".join(f"{f'p{p}':>10}" for p in _PERCENTILES) + f"{'max':>10}"
+        lines: List[str] = []
+
+        for (alias, launch_key), usages in groups.items():
+            failed: int = sum(1 for usage in usages if usage[6] != 0)
+            settings: str = " ".join(f"{k}={v}" for k, v in launch_key)
+
+            lines.append(f"{alias} [{settings}]: {len(usages)} launches" + (f", {failed} failed" if failed else ""))
+            lines.append(header)
+
+            for name, getter, formatter in _COLUMNS:
+                values: List[float] = sorted(getter(usage) for usage in usages)
+
+                lines.append(f"{name:<10}" + "".join(f"{formatter(self._percentile(values, p)):>10}" for p in _PERCENTILES) \
+                             + f"{formatter(values[-1]):>10}")
+
+            lines.append("")
+
+        return "\n".join(lines[:-1])
@@ -0,0 +1 @@
+from utils.launchwrappers.launchwrappers import LaunchWrappers, Wrapper, TEMPLATE_FIELDS, getTemplateFields
@@ -0,0 +1,95 @@
+from os import X_OK, access, path
+from typing import Dict, List, NoReturn, Set, Tuple
+from utils.funcs import die
+from utils.probecache import ProbeCache
+
+
+# Format is (command, [argument_templates]), e.g. ("gamescope", ["-W", "2560", "-f", "--"])
+Wrapper = Tuple[str, List[str]]
+
+# Fields the argument templates may use, e.g. "{prefix}".
+TEMPLATE_FIELDS: List[str] = ["profile_id", "prefix", "application_directory", "exe", "exe_directory", "affinity"]
+
+
+def getTemplateFields(template: str) -> Set[str] | None:
+    """
+    getTemplateFields
+
+    :template: An argument template, literal braces are written as {{ and }}.
+    :return: The fields used by the template or None if it's malformed.
+    """
+
+    # Only needed when the profile has launch wrappers.
+    from string import Formatter
+
+    try:
+        return {field for _, field, _, _ in Formatter().parse(template) if field is not None}
+    except ValueError:
+        return None
+
+
+class LaunchWrappers:
+    """
+    LaunchWrappers
+
+    Ordered chain of commands placed in front of the runner (gamescope, mangohud, gamemoderun, taskset, ...),
+    the first wrapper is the outermost one.
+    Each command is resolved from PATH once and the result is kept in the probes cache, until the resolved
+    binary changes or the cache is refreshed.
+
+    :wrappers: The wrappers in order.
+    :probe_cache: Cache where the resolved binaries are kept.
+    """
+
+    def __init__(self, wrappers: List[Wrapper], probe_cache: ProbeCache):
+        self._wrappers: List[Wrapper]   = wrappers
+        self._probe_cache: ProbeCache   = probe_cache
+
+
+    def _resolve(self, command: str, search_path: str) -> str | NoReturn:
+        """
+        _resolve
+
+        :command: A command name looked up in PATH, or a path to a binary.
+        :search_path: The PATH the command is looked up in.
+        :return: The path to the binary, or exits if it isn't an executable file.
+        """
+
+        if "/" in command:
+            if path.isfile(command) and access(command, X_OK): return command
+
+            die(f"Launch wrapper \"{command}\" is not an executable file.")
+
+        binary: str | None = self._probe_cache.getResolved(command, search_path)
+
+        if binary: return binary
+
+        # Only needed when a wrapper isn't in the probes cache, shutil drags in the compression modules.
+        from shutil import which
+
+        binary = which(command, path = search_path)
+
+        if not binary: die(f"Launch wrapper \"{command}\" not found in PATH.")
+
+        self._probe_cache.setResolved(command, search_path, binary)
+
+        return binary
+
+
+    def wrap(self, cmd: List[str], fields: Dict[str, str], search_path: str) -> List[str]:
+        """
+        wrap
+
+        :cmd: The runner's command.
+        :fields: The values of the template fields.
+        :search_path: The PATH of the runner's environment, where the wrappers are looked up.
+        :return: The command with the wrappers in front of it.
+        """
+
+        wrapped: List[str] = []
+
+        for command, templates in self._wrappers:
+            wrapped.append(self._resolve(command, search_path))
+            wrapped.extend(template.format_map(fields) for template in templates)
+
+        return wrapped + cmd
@@ -0,0 +1 @@
+from utils.logforwarder.logforwarder import LogForwarder
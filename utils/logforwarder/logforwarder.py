@@ -0,0 +1,129 @@
+from errno import EINVAL, ENOSYS
+from os import readv, write
+from typing import Callable, List
+
+try:
+    from os import splice
+except ImportError:
+    splice = None
+
+
+class LogForwarder:
+    """
+    LogForwarder
+
+    Forwards the output of a process to one or more file descriptors as raw bytes, nothing is decoded,
+    split into lines or flushed per write.
+    With a single destination the bytes are moved by the kernel with splice, otherwise, or when the destination
+    doesn't support it (terminals on recent kernels), they're copied through one reusable buffer.
+    A destination that can't be written to anymore is dropped, the source keeps being drained
+    so the process never blocks on a full pipe.
+
+    :src_fd: Read end of the process' output pipe.
+    :dst_fds: File descriptors the output is forwarded to.
+    :writers: (Optional) Callables the copied bytes are also handed to, e.g. LogSink.write.
+    :buffer_size: (Optional) Size of the copy buffer and of each splice, defaults to 1MiB.
+    """
+
+    def __init__(
+        self,
+        src_fd: int,
+        dst_fds: List[int],
+        writers: List[Callable[[memoryview], None]] | None = None,
+        buffer_size: int = 1 << 20
+    ):
+        self._src_fd: int                                   = src_fd
+        self._dst_fds: List[int]                            = list(dst_fds)
+        self._writers: List[Callable[[memoryview], None]]   = writers if writers else []
+        self._buffer_size: int                              = buffer_size
+        self._forwarded: int                                = 0
+
+
+    def _splice(self) -> bool:
+        """
+        _splice
+
+        Moves the bytes from the source to the only destination until the end of file.
+
+        :return: True on end of file, false if the remaining bytes must be copied instead.
+        """
+
+        dst_fd: int = self._dst_fds[0]
+
+        while True:
+            try:
+                n: int = splice(self._src_fd, dst_fd, self._buffer_size)
+            except OSError as e:
+                # Nothing is consumed when splice isn't supported, any other error comes from the destination.
+                if e.errno not in [EINVAL, ENOSYS]: self._dst_fds.clear()
+
+                return False
+
+            if not n: return True
+
+            self._forwarded += n
+
+
+    @staticmethod
+    def _writeAll(fd: int, data: memoryview) -> bool:
+        """
+        _writeAll
+
+        Writes the whole buffer, retrying on partial writes.
+
+        :fd: Destination file descriptor.
+        :data: Bytes to be written.
+        :return: False if the destination failed.
+        """
+
+        while data:
+            try:
+                data = data[write(fd, data):]
+            except OSError:
+                return False
+
+        return True
+
+
+    def _copy(self) -> None:
+        """
+        _copy
+
+        Copies the bytes from the source to every destination until the end of file.
+
+        :return:
+        """
+
+        buffer: bytearray = bytearray(self._buffer_size)
+        view: memoryview = memoryview(buffer)
+
+        while True:
+            try:
+                n: int = readv(self._src_fd, [buffer])
+            except OSError:
+                return
+
+            if not n: return
+
+            self._forwarded += n
+
+            for fd in [fd for fd in self._dst_fds if not self._writeAll(fd, view[:n])]:
+                self._dst_fds.remove(fd)
+
+            for writer in self._writers: writer(view[:n])
+
+
+    def run(self) -> int:
+        """
+        run
+
+        Forwards the output until the process closes it.
+
+        :return: The number of bytes forwarded.
+        """
+
+        if splice and len(self._dst_fds) == 1 and not self._writers and self._splice(): return self._forwarded
+
+        self._copy()
+
+        return self._forwarded
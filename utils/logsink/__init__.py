@@ -0,0 +1,2 @@
+from utils.logsink.ringbuffer import RingBuffer
+from utils.logsink.logsink import LogSink, parseSize, COMPRESSIONS
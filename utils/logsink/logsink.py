@@ -0,0 +1,395 @@
+from collections import deque
+from os import getpid, listdir, makedirs, path, remove, rename, stat
+from queue import Queue
+from re import Pattern, compile
+from subprocess import DEVNULL, run
+from threading import Condition, Thread
+from time import strftime
+from typing import BinaryIO, Deque, Dict, List, Tuple
+from utils.logsink.ringbuffer import RingBuffer
+
+
+# Format is { "compression": "extension of the compressed segments" }
+COMPRESSIONS: Dict[str, str] = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+_SIZE_SUFFIXES: Dict[str, int] = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+# Format is <session>.<segment>.log[.gz|.zst], sessions are named after the time they started.
+_SEGMENT_PATTERN: Pattern[str] = compile(r"^(\d{8}-\d{6}-\d+)\.(\d+)\.log(\.gz|\.zst)?$")
+
+
+def parseSize(value: int | str) -> int | None:
+    """
+    parseSize
+
+    Parses a size in bytes.
+
+    :value: The size as an integer, or a string with an optional K, M or G suffix (e.g. "64M", "1GiB").
+    :return: The size in bytes or None if it's malformed.
+    """
+
+    if isinstance(value, int): return value if value > 0 else None
+
+    value = value.strip().upper().removesuffix("B").removesuffix("I")
+    suffix: str = value[-1:] if value[-1:] in _SIZE_SUFFIXES else ""
+    digits: str = value[:len(value) - len(suffix)].strip()
+
+    return int(digits) * _SIZE_SUFFIXES[suffix] if digits.isdigit() and int(digits) > 0 else None
+
+
+class LogSink:
+    """
+    LogSink
+
+    Writes the logs of a session to <directory>/<session>.<segment>.log, rotating to a new segment once
+    the current one reaches segment_size. Rotated segments are compressed and the retention policy is applied
+    by a background thread.
+    write() never blocks the caller: the bytes are queued for a writer thread, and if the disk can't keep up
+    with queue_size bytes they're dropped and a note is left in the log.
+    With crash_buffer_size only the last bytes are kept in memory, and they're written to the session's file
+    only if the session failed.
+
+    :directory: Directory where the sessions are written.
+    :segment_size: (Optional) Size in bytes after which a segment is rotated, defaults to 64MiB.
+    :compression: (Optional) Compression of the rotated segments, "none", "gzip" or "zstd", defaults to "none".
+    :keep_sessions: (Optional) Number of sessions kept, including the current one, defaults to 10.
+    :max_total_size: (Optional) Maximum size in bytes of all the sessions, the oldest segments are removed first.
+    :queue_size: (Optional) Maximum of bytes waiting to be written, defaults to 32MiB.
+    :crash_buffer_size: (Optional) Size in bytes of the ring buffer, nothing touches the disk unless the session fails.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 64 << 20,
+        compression: str = "none",
+        keep_sessions: int = 10,
+        max_total_size: int | None = None,
+        queue_size: int = 32 << 20,
+        crash_buffer_size: int | None = None
+    ):
+        self._directory: str                        = directory
+        self._segment_size: int                     = segment_size
+        self._compression: str                      = compression
+        self._keep_sessions: int                    = keep_sessions
+        self._max_total_size: int | None            = max_total_size
+        self._queue_size: int                       = queue_size
+        self._session: str                          = f"{strftime('%Y%m%d-%H%M%S')}-{getpid()}"
+        self._segment: int                          = 0
+        self._fp: BinaryIO | None                   = None
+        self._queue: Deque[bytes]                   = deque()
+        self._queued: int                           = 0
+        self._dropped: int                          = 0
+        self._closed: bool                          = False
+        self._condition: Condition                  = Condition()
+        self._maintenance_queue: Queue[str | None]  = Queue()
+        self._writer: Thread                        = Thread(target = self._writeQueued, daemon = True)
+        self._maintenance: Thread                   = Thread(target = self._maintain, daemon = True)
+        self._ring_buffer: RingBuffer | None        = RingBuffer(crash_buffer_size) if crash_buffer_size else None
+
+
+    def _segmentPath(self, segment: int) -> str:
+        """
+        _segmentPath
+
+        :segment: Index of the segment in the current session.
+        :return: The path to the segment's file.
+        """
+
+        return path.join(self._directory, f"{self._session}.{segment}.log")
+
+
+    def sessionFilepath(self) -> str:
+        """
+        sessionFilepath
+
+        Applies the retention policy and creates the logs directory, for callers writing the session
+        to a single file by themselves.
+
+        :return: The path to the first segment of the session.
+        """
+
+        makedirs(self._directory, exist_ok = True)
+        self._applyRetention()
+
+        return self._segmentPath(0)
+
+
+    def open(self) -> None:
+        """
+        open
+
+        Opens the first segment of the session and starts the background threads,
+        errors opening the directory or the file are raised to the caller.
+        When capturing to the ring buffer only the directory is created.
+
+        :return:
+        """
+
+        makedirs(self._directory, exist_ok = True)
+
+        if self._ring_buffer: return
+
+        self._fp = open(self._segmentPath(0), "wb", buffering = 1 << 20)
+
+        # An empty path only applies the retention policy, so older sessions are cleaned up at startup too.
+        self._maintenance_queue.put("")
+
+        self._writer.start()
+        self._maintenance.start()
+
+
+    def write(self, data: bytes | memoryview) -> None:
+        """
+        write
+
+        Queues the bytes to be written, dropping them if the queue is full.
+
+        :data: The bytes to be written, copied so the caller can reuse its buffer.
+        :return:
+        """
+
+        if self._ring_buffer: return self._ring_buffer.write(data)
+
+        with self._condition:
+            if self._queued + len(data) > self._queue_size:
+                self._dropped += len(data)
+
+                return
+
+            self._queue.append(bytes(data))
+            self._queued += len(data)
+            self._condition.notify()
+
+
+    def close(self, failed: bool = False) -> str | None:
+        """
+        close
+
+        Writes whatever is still queued and waits for the background threads to finish.
+
+        :failed: (Optional) Tells if the session failed, so the ring buffer is written to disk.
+        :return: The path to the file the ring buffer was written to, if it was.
+        """
+
+        if self._ring_buffer: return self._dumpRingBuffer() if failed else None
+
+        if not self._fp: return None
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._writer.join()
+        self._maintenance_queue.put(None)
+        self._maintenance.join()
+
+        return None
+
+
+    def _dumpRingBuffer(self) -> str | None:
+        """
+        _dumpRingBuffer
+
+        Writes the ring buffer to the session's file and applies the retention policy.
+
+        :return: The path to the file or None if it couldn't be written.
+        """
+
+        ring_buffer: RingBuffer = self._ring_buffer # pyright: ignore[reportAssignmentType]
+        filepath: str = self._segmentPath(0)
+
+        try:
+            with open(filepath, "wb") as fp:
+                if ring_buffer.getDiscarded():
+                    fp.write(f"[wrunner] Only the last bytes were kept, {ring_buffer.getDiscarded()} bytes before them were discarded.\n".encode())
+
+                ring_buffer.dump(fp)
+        except OSError:
+            return None
+
+        self._applyRetention()
+
+        return filepath
+
+
+    def _writeQueued(self) -> None:
+        """
+        _writeQueued
+
+        Writer thread, writes the queued bytes and rotates the segments.
+
+        :return:
+        """
+
+        fp: BinaryIO = self._fp # pyright: ignore[reportAssignmentType]
+        size: int = 0
+
+        while True:
+            with self._condition:
+                while not self._queue and not self._dropped and not self._closed: self._condition.wait()
+
+                if not self._queue and not self._dropped: break
+
+                chunks: List[bytes] = list(self._queue)
+                dropped: int = self._dropped
+                self._queue.clear()
+                self._queued = 0
+                self._dropped = 0
+
+            if dropped: chunks.append(f"\n[wrunner] {dropped} bytes of logs dropped, the disk couldn't keep up.\n".encode())
+
+            for chunk in chunks:
+                try:
+                    fp.write(chunk)
+                except OSError:
+                    continue
+
+                size += len(chunk)
+
+                if size < self._segment_size: continue
+
+                fp.close()
+                self._maintenance_queue.put(self._segmentPath(self._segment))
+
+                self._segment += 1
+                size = 0
+
+                try:
+                    fp = open(self._segmentPath(self._segment), "wb", buffering = 1 << 20)
+                except OSError:
+                    fp = open(path.devnull, "wb")
+
+        fp.close()
+
+
+    def _maintain(self) -> None:
+        """
+        _maintain
+
+        Maintenance thread, compresses the rotated segments and applies the retention policy.
+
+        :return:
+        """
+
+        while True:
+            filepath: str | None = self._maintenance_queue.get()
+
+            if filepath is None: return
+
+            if filepath and self._compression != "none": self._compress(filepath)
+
+            self._applyRetention()
+
+
+    def _compress(self, filepath: str) -> None:
+        """
+        _compress
+
+        Compresses a rotated segment, the segment is only replaced once it's fully compressed.
+        zstd is run from the system and gzip is used if it isn't installed.
+
+        :filepath: Path to the segment.
+        :return:
+        """
+
+        if self._compression == "zstd":
+            try:
+                if run(["zstd", "-q", "-f", "-o", f"{filepath}.zst.tmp", filepath], stdout = DEVNULL, stderr = DEVNULL).returncode == 0:
+                    rename(f"{filepath}.zst.tmp", f"{filepath}.zst")
+                    remove(filepath)
+
+                    return
+            except OSError:
+                pass
+
+        # Only needed when compressing, most sessions never rotate.
+        from gzip import open as gopen
+
+        try:
+            with open(filepath, "rb") as src, gopen(f"{filepath}.gz.tmp", "wb", compresslevel = 6) as dst:
+                while True:
+                    chunk: bytes = src.read(1 << 20)
+
+                    if not chunk: break
+
+                    dst.write(chunk)
+
+            rename(f"{filepath}.gz.tmp", f"{filepath}.gz")
+            remove(filepath)
+        except OSError:
+            pass
+
+
+    def _applyRetention(self) -> None:
+        """
+        _applyRetention
+
+        Removes the sessions over keep_sessions, then the oldest segments until the logs fit in max_total_size.
+        The current session is always kept and so is the segment being written.
+
+        :return:
+        """
+
+        # Format is { session: [ (segment, filepath, size) ] }
+        sessions: Dict[str, List[Tuple[int, str, int]]] = {}
+
+        try:
+            files: List[str] = listdir(self._directory)
+        except OSError:
+            return
+
+        for f in files:
+            match = _SEGMENT_PATTERN.match(f)
+
+            if not match: continue
+
+            filepath: str = path.join(self._directory, f)
+
+            try:
+                size: int = stat(filepath).st_size
+            except OSError:
+                continue
+
+            sessions.setdefault(match[1], []).append((int(match[2]), filepath, size))
+
+        newest_first: List[str] = [self._session] + sorted([s for s in sessions if s != self._session], reverse = True)
+        # Oldest sessions first, and within a session its oldest segments.
+        removable: List[Tuple[str, int]] = []
+        total: int = 0
+
+        for i, session in reversed(list(enumerate(newest_first))):
+            for segment, filepath, size in sorted(sessions.get(session, [])):
+                if i >= self._keep_sessions:
+                    self._remove(filepath)
+
+                    continue
+
+                total += size
+
+                if session != self._session or segment < self._segment: removable.append((filepath, size))
+
+        if not self._max_total_size: return
+
+        for filepath, size in removable:
+            if total <= self._max_total_size: return
+
+            self._remove(filepath)
+            total -= size
+
+
+    @staticmethod
+    def _remove(filepath: str) -> None:
+        """
+        _remove
+
+        Removes a file, ignoring files already gone.
+
+        :filepath: Path to the file.
+        :return:
+        """
+
+        try:
+            remove(filepath)
+        except OSError:
+            pass
@@ -0,0 +1,76 @@
+from typing import BinaryIO
+
+
+class RingBuffer:
+    """
+    RingBuffer
+
+    Keeps the last size bytes written to it in a preallocated buffer, older bytes are overwritten.
+    Writing only copies into the buffer, nothing is allocated per write.
+
+    :size: Capacity in bytes.
+    """
+
+    def __init__(self, size: int):
+        self._size: int             = size
+        self._buffer: bytearray     = bytearray(size)
+        self._view: memoryview      = memoryview(self._buffer)
+        self._end: int              = 0
+        self._total: int            = 0
+
+
+    def write(self, data: bytes | memoryview) -> None:
+        """
+        write
+
+        Copies the bytes into the buffer, overwriting the oldest ones if it's full.
+
+        :data: The bytes to be written.
+        :return:
+        """
+
+        n: int = len(data)
+        self._total += n
+
+        if n >= self._size:
+            self._view[:] = data[n - self._size:]
+            self._end = 0
+
+            return
+
+        first: int = min(n, self._size - self._end)
+        self._view[self._end:self._end + first] = data[:first]
+        self._view[:n - first] = data[first:]
+        self._end = (self._end + n) % self._size
+
+
+    def getDiscarded(self) -> int:
+        """
+        getDiscarded
+
+        :return: The number of bytes that were overwritten because the buffer was full.
+        """
+
+        return max(0, self._total - self._size)
+
+
+    def dump(self, fp: BinaryIO) -> None:
+        """
+        dump
+
+        Writes the buffered bytes from the oldest to the newest,
+        once the buffer wrapped around the oldest line is skipped as it's likely cut.
+
+        :fp: Binary file the bytes are written to.
+        :return:
+        """
+
+        if self._total < self._size:
+            fp.write(self._view[:self._end])
+
+            return
+
+        start: int = self._buffer.find(b"\n", self._end) + 1
+
+        fp.write(self._view[start if start else self._end:])
+        fp.write(self._view[:self._end])
@@ -0,0 +1 @@
+from utils.metadata.metadata import formatAliases, getProfileIndex, isMetadataQuery, runMetadataQuery
@@ -0,0 +1,186 @@
+from os import path, stat, replace, getpid
+from typing import Any, Dict, List, NoReturn
+from utils.funcs import die, getBundlePath
+from utils.parser import arguments
+from utils.parser.arguments import VERBS, OPTIONAL_ARGS
+from utils.parser.repair import getConfigDirectory
+from utils.metadata.metadata import formatAliases, getProfileIndex
+
+
+_modes: List[str] = ["--run", "--runinprefix", "--waitforexitandrun"]
+
+# Options that may follow the verbs, one of them runs once the verbs are done.
+_launches: List[str] = [*_modes, "-w", "--winetricks"]
+
+# Options that modify the action instead of selecting one, they never count as an option already provided.
+# Format is [ "space separated group" ], once any option of a group is provided the whole group isn't offered again.
+_modifiers: List[str] = ["--use-umu --use-wine", "--exec", "--dry-run"]
+
+
+def getCompletionCachePath() -> str:
+    """
+    getCompletionCachePath
+
+    :return: The path to the static completion cache sourced by the shell completion scripts.
+    """
+
+    return path.join(getConfigDirectory(), "completion_cache")
+
+
+def _quote(word: str) -> str:
+    """
+    _quote
+
+    Single quotes a word so it can be sourced by both bash and zsh.
+
+    :word: The word to be quoted.
+    :return: The quoted word.
+    """
+
+    return "'" + word.replace("'", "'\\''") + "'"
+
+
+def _shellArray(name: str, words: List[str]) -> str:
+    """
+    _shellArray
+
+    :name: Name of the shell array.
+    :words: Elements of the array.
+    :return: The shell array assignment.
+    """
+
+    return f"{name}=({' '.join(_quote(w) for w in words)})\n"
+
+
+def _getOptionalArgs() -> List[str]:
+    """
+    _getOptionalArgs
+
+    :return: The optional arguments in the format "name:description".
+    """
+
+    return [f"{name}:{arg[2]}" for arg in OPTIONAL_ARGS for name in arg[1]]
+
+
+def generateCompletionCache(cache_filepath: str) -> None:
+    """
+    generateCompletionCache
+
+    Writes the verbs, optional arguments and modes as shell arrays, so the completion scripts
+    can complete them without spawning wrunner at all.
+
+    :cache_filepath: Path to the file where the cache should be written.
+    :return:
+    """
+
+    content: str = "# Generated by wrunner --generate-completion-cache, do not edit.\n"
+    content += _shellArray("_wrunner_cache_verbs", [f"{k}:{v}" for k, v in VERBS.items()])
+    content += _shellArray("_wrunner_cache_opts", _getOptionalArgs())
+    content += _shellArray("_wrunner_cache_modes", _modes)
+    content += _shellArray("_wrunner_cache_launches", _launches)
+    content += _shellArray("_wrunner_cache_modifiers", _modifiers)
+
+    tmp_filepath: str = f"{cache_filepath}.{getpid()}.tmp"
+
+    try:
+        with open(tmp_filepath, "w") as fp:
+            fp.write(content)
+
+        replace(tmp_filepath, cache_filepath)
+    except OSError:
+        pass
+
+
+def _refreshCompletionCache() -> None:
+    """
+    _refreshCompletionCache
+
+    Regenerates the static completion cache if it's missing or older than the arguments tables or this module
+    (or the zipapp when running from it).
+
+    :return:
+    """
+
+    cache_filepath: str = getCompletionCachePath()
+    bundle_filepath: str | None = getBundlePath()
+    source_filepaths: List[str] = [bundle_filepath] if bundle_filepath else [arguments.__file__, __file__]
+
+    try:
+        if stat(cache_filepath).st_mtime_ns >= max(stat(f).st_mtime_ns for f in source_filepaths): return
+    except OSError:
+        pass
+
+    generateCompletionCache(cache_filepath)
+
+
+def complete(cword: int, words: List[str]) -> List[str]:
+    """
+    complete
+
+    Computes the completion candidates for the word at the position cword.
+    Verbs are completed right after the profile id and after other verbs, once a verb is provided
+    only the launch options and modifiers may follow.
+
+    :cword: Index of the word being completed.
+    :words: All the words in the command line, the first one being the command itself.
+    :return: The candidates in the format "name" or "name:description".
+    """
+
+    words = words[:cword + 1]
+    current: str = words[-1] if words else ""
+    args: List[str] = words[2:-1]
+    opts: List[str] = _getOptionalArgs()
+
+    if len(words) < 2: return []
+
+    if len(words) == 2:
+        return [i for i in getProfileIndex().getIDs() if i.startswith(current)]
+
+    for group in _modifiers:
+        if any(word in group.split() for word in words):
+            opts = [opt for opt in opts if opt.split(":", 1)[0] not in group.split()]
+
+    modifiers: List[str] = " ".join(_modifiers).split()
+    actions: List[str] = [opt.split(":", 1)[0] for opt in _getOptionalArgs() if opt.split(":", 1)[0] not in modifiers]
+    verbs: List[str] = [word for word in args if word in VERBS]
+    candidates: List[str] = []
+
+    if any(word in actions for word in args):
+        # After a launch option come its alias and the application's arguments.
+        if args[-1] not in _modes: return []
+
+        profile: Dict[str, Any] | None = getProfileIndex().getProfile(words[1])
+        aliases: Any = profile.get("executables_aliases") if profile else None
+        candidates = [
+            alias.replace(": ", ":", 1)
+            for alias in formatAliases(aliases if isinstance(aliases, dict) else None).splitlines()
+        ]
+    else:
+        if verbs: opts = [opt for opt in opts if opt.split(":", 1)[0] in _launches + modifiers]
+
+        if len(verbs) == len(args) and not current.startswith("-"):
+            candidates = [f"{k}:{v}" for k, v in VERBS.items() if k not in verbs]
+
+        candidates += opts
+
+    return [c for c in candidates if c.split(":", 1)[0].startswith(current)]
+
+
+def runCompletion(argv: List[str]) -> NoReturn:
+    """
+    runCompletion
+
+    Answers wrunner --complete <cword> <words...> with one candidate per line and exits.
+
+    :argv: The cword followed by the words of the command line.
+    :return:
+    """
+
+    _refreshCompletionCache()
+
+    try:
+        cword: int = int(argv[0])
+    except (IndexError, ValueError):
+        die("Usage: wrunner --complete <cword> <words...>")
+
+    die("\n".join(complete(cword, argv[1:])), 0)
@@ -0,0 +1,114 @@
+from os import path
+from typing import Any, Dict, List, NoReturn
+from utils.funcs import die
+from utils.parser.arguments import getVerbHelp, getOptionalArgumentHelp
+from utils.parser.profileindex import ProfileIndex
+from utils.parser.repair import getConfigDirectory
+
+
+# These queries are read-only, so they are answered straight from the profile index
+# without running Repair, the full arguments parser or importing the handlers.
+_pre_flags: List[str] = ["--show-ids", "--show-verbs", "--show-optional-args"]
+
+
+def _getProfilesPath() -> str:
+    """
+    _getProfilesPath
+
+    :return: The path to the profiles directory.
+    """
+
+    return path.join(getConfigDirectory(), "profiles")
+
+
+def getProfileIndex() -> ProfileIndex:
+    """
+    getProfileIndex
+
+    :return: The profile index, reporting malformed configuration files without exiting.
+    """
+
+    profiles_path: str = _getProfilesPath()
+
+    return ProfileIndex(profiles_path, path.join(path.dirname(profiles_path), "profiles.index"), fatal = False)
+
+
+def formatAliases(executables_aliases: Dict[Any, Any] | None) -> str:
+    """
+    formatAliases
+
+    Formats the executables aliases whose paths exist, one "alias: path" per line.
+
+    :executables_aliases: Dictionary of format { "executable_aliase" : "/path/to/the/exectuable" }.
+    :return: A string with all available executables aliases.
+    """
+
+    if not executables_aliases: return ""
+
+    final_text: str = ""
+
+    for k, v in executables_aliases.items():
+        if not isinstance(k, str): continue
+
+        v = path.expandvars(str(v))
+
+        if not path.exists(v):
+            continue
+
+        final_text += f"{k}: {v}\n"
+
+    return final_text[:-1]
+
+
+def isMetadataQuery(argv: List[str]) -> bool:
+    """
+    isMetadataQuery
+
+    Tells whether the arguments are a read-only query that can be answered by runMetadataQuery.
+    Falls back to the full path if the configuration directory wasn't set up yet.
+
+    :argv: List of arguments without the program name.
+    :return: True if the arguments can take the fast path.
+    """
+
+    if not path.isdir(_getProfilesPath()): return False
+
+    if argv and argv[0] in ["--complete", "--generate-completion-cache"]: return True
+
+    if any(flag in argv for flag in _pre_flags): return True
+
+    return "--list-aliases" in argv and not argv[0].startswith("-")
+
+
+def runMetadataQuery(argv: List[str]) -> NoReturn:
+    """
+    runMetadataQuery
+
+    Answers --show-ids, --show-verbs, --show-optional-args, --list-aliases and the completion queries and exits.
+
+    :argv: List of arguments without the program name.
+    :return:
+    """
+
+    # Imported here since the completion module needs getProfileIndex and formatAliases from this one.
+    from utils.metadata.completion import generateCompletionCache, getCompletionCachePath, runCompletion
+
+    # Same precedence as the pre arguments in ProfilesManager, --show-ids comes first.
+    if "--show-ids" not in argv:
+        if "--show-verbs" in argv: die(getVerbHelp(), 0)
+        if "--show-optional-args" in argv: die(getOptionalArgumentHelp(), 0)
+
+    if argv[0] == "--complete": runCompletion(argv[1:])
+
+    if argv[0] == "--generate-completion-cache":
+        generateCompletionCache(argv[1] if len(argv) > 1 else getCompletionCachePath())
+        die("", 0)
+
+    profile_index: ProfileIndex = getProfileIndex()
+
+    if "--show-ids" in argv: die(" ".join(profile_index.getIDs()), 0)
+
+    profile: Dict[str, Any] | None = profile_index.getProfile(argv[0])
+    executables_aliases: Any = profile.get("executables_aliases") if profile else None
+
+    die(formatAliases(executables_aliases if isinstance(executables_aliases, dict) else None), 0)
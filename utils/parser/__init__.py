@@ -1,4 +1,24 @@
-from utils.parser.repair import Repair
-from utils.parser.parser import Parser
-from utils.parser.argumentsparser import ArgumentTypeError, Namespace, WRArgumentParser
-from argparse import RawTextHelpFormatter
+from importlib import import_module
+from typing import Any, Dict
+
+
+# Format is { exported_name: module_name }
+#
+# Imported on first access so lightweight entry points (metadata queries, completion)
+# only load the modules they use.
+_exports: Dict[str, str] = {
+    "Repair": "utils.parser.repair",
+    "ProfileIndex": "utils.parser.profileindex",
+    "Parser": "utils.parser.parser",
+    "ArgumentTypeError": "utils.parser.argumentsparser",
+    "Namespace": "utils.parser.argumentsparser",
+    "WRArgumentParser": "utils.parser.argumentsparser",
+    "RawTextHelpFormatter": "argparse",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(_exports[name]), name)
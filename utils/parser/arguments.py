@@ -0,0 +1,83 @@
+from typing import Dict, List, Tuple
+
+
+# ANY changes to these variables must be reflected also on utils/profilesmanager/profilesmanager.py
+# otherwise they won't have any effect.
+#
+# They live apart from WRArgumentParser so the metadata queries can read them without importing argparse.
+
+# Format is [ (nargs, name_of_the_arg, help) ]
+POSITIONAL_ARGS: List[Tuple[str | int, str, str]] = [
+    (1, "profile_id", "Application's profile id.")
+]
+
+# Format is { verb: help }
+VERBS: Dict[str, str] = {
+    "init": "Creates a WINE prefix if it doesn't exists or update an existent one.",
+    "kill-all": "Terminates the prefix's processes and wineserver, killing the ones still running after a second.",
+    "ps": "Lists the prefix's processes with their CPU usage and resident memory.",
+    "winecfg": "Calls winecfg.",
+    "config": "Calls winecfg.",
+    "cfg": "Calls winecfg.",
+    "destroy-prefix": "Removes the WINE prefix and all its applications installed under the prefix.",
+    "install-dxvk": "Installs DXVK.",
+    "uninstall-dxvk": "Uninstall DXVK.",
+    "install-dxvk-nvapi": "Installs DXVK NVAPI.",
+    "uninstall-dxvk-nvapi": "Uninstall DXVK NVAPI.",
+    "install-gallium-nine": "Installs Gallium Nine.",
+    "uninstall-gallium-nine": "Uninstall Gallium Nine.",
+    "stats": "Summarizes the resources used by the launches recorded with accounting = true.",
+    "samples": "Summarizes per process the last session sampled with sampling_interval.",
+    "prewarm": "Starts the prefix's wineserver ahead of the launches, it stays up for [profile.wineserver] persist seconds."
+}
+
+# Format is [ (nargs, [args_names], help, metaver) ]
+OPTIONAL_ARGS: List[Tuple[str | int, List[str], str, str | None]] = [
+    ("*", ["--run"],                "Run the application.", "EXE_NAME ARGS"),
+    ("*", ["--runinprefix"],        "Similar to --run, but run the application inside prefix." \
+                                    "(While using WINE is the same as --run.)", "EXE_NAME ARGS"),
+    ("*", ["--waitforexitandrun"],  "Similar to --run, but waits for the prefix's wineserver to exit before and after " \
+                                    "the launch and exits with the application's status.", "EXE_NAME ARGS"),
+    ("*", ["-w", "--winetricks"],   "Installs dlls/apps inside the prefix.", "ARGS"),
+    (0, ["--use-wine"],             "Overrides the default runners and runs the application using Wine.", None),
+    (0, ["--use-umu"],              "Overrides the default runners and runs the application using UMU.", None),
+    (0, ["--exec"],                 "Replaces wrunner with the runner instead of spawning it (--run and " \
+                                    "--waitforexitandrun), same as launch_mode = \"exec\".", None),
+    (0, ["--dry-run"],              "Prints the commands that would be run and their scheduling settings instead of running them.", None),
+    (0, ["--list-aliases"],         "Lists all executable aliases in the application's configuration file.", None)
+]
+
+# Format is [ (nargs, [args_names], help, metaver) ]
+PRE_OPTIONAL_ARGS: List[Tuple[str | int, List[str], str, str | None]] = [
+    (0, ["--show-ids"],             "Displays all application's profile ids.", None),
+    (0, ["--show-verbs"],           "Displays all verbs and its description.", None),
+    (0, ["--show-optional-args"],   "Displays all verbs and its description.", None),
+    (0, ["--refresh-probes"],       "Discards the cached results of probing the wine and umu-run binaries.", None),
+    (0, ["--show-topology"],        "Displays the CPU's core groups, the first one is used by affinity = \"auto\".", None),
+]
+
+
+def getVerbHelp() -> str:
+    """
+    getVerbHelp
+
+    :return: The help message for the verb positional argument.
+    """
+
+    return "\n".join([f"{k}: {v}" for k, v in VERBS.items()])
+
+
+def getOptionalArgumentHelp() -> str:
+    """
+    getOptionalArgumentHelp
+
+    :return: The help messages for all optional arguments.
+    """
+
+    final_text: str = ""
+
+    for arg in OPTIONAL_ARGS:
+        for _arg in arg[1]:
+            final_text += f"{_arg}: {arg[2]}\n"
+
+    return final_text[:-1]
@@ -1,5 +1,8 @@
-from argparse import ArgumentParser, ArgumentTypeError, ArgumentDefaultsHelpFormatter, Namespace
+from argparse import ArgumentParser, ArgumentTypeError, ArgumentDefaultsHelpFormatter, HelpFormatter, Namespace
+from os import environ, get_terminal_size
 from typing import Any, Dict, Generator, List, Tuple
+from utils.parser.arguments import POSITIONAL_ARGS, VERBS, OPTIONAL_ARGS, PRE_OPTIONAL_ARGS, \
+                                   getVerbHelp, getOptionalArgumentHelp
 
 
 class WRArgumentParser(ArgumentParser):
@@ -24,60 +27,44 @@ class WRArgumentParser(ArgumentParser):
             add_help = add_help
         )
 
-        # ANY changes to these variables must be reflected also on utils/appsmanager/appsmanager.py
-        # otherwise they won't have any effect.
-
-        # Format is [ (nargs, name_of_the_arg, help) ]
-        self._positional_args: List[Tuple[str | int, str, str]] = [
-            (1, "profile_id", "Application's profile id.")
-        ]
-
-        _choices: Dict[str, str] = {
-            "init": "Creates a WINE prefix if it doesn't exists or update an existent one.",
-            "kill-all": "Kills wineserver.",
-            "winecfg": "Calls winecfg.",
-            "config": "Calls winecfg.",
-            "cfg": "Calls winecfg.",
-            "destroy-prefix": "Removes the WINE prefix and all its applications installed under the prefix.",
-            "install-dxvk": "Installs DXVK.",
-            "uninstall-dxvk": "Uninstall DXVK.",
-            "install-dxvk-nvapi": "Installs DXVK NVAPI.",
-            "uninstall-dxvk-nvapi": "Uninstall DXVK NVAPI.",
-            "install-gallium-nine": "Installs Gallium Nine.",
-            "uninstall-gallium-nine": "Uninstall Gallium Nine."
-        }
+        self._positional_args: List[Tuple[str | int, str, str]] = POSITIONAL_ARGS
 
-        self._verb_help: str = "\n".join([f"{k}: {v}" for k, v in _choices.items()])
+        self._verb_help: str = getVerbHelp()
 
         # Format is { name_of_the_arg: (nargs, [choices], help) }
         self._optional_positional_args: Dict[str, Tuple[str | int, List[str], str]] = {
             "verb": # arg
             (
-                "?", # nargs
-                [key for key in _choices], # choices
+                "*", # nargs
+                [key for key in VERBS], # choices
                 self._verb_help
             )
         }
 
-        # Format is [ (nargs, [args_names], help, metaver) ]
-        self._optional_args: List[Tuple[str | int, List[str], str, str | None]] = [
-            ("*", ["--run"],                "Run the application.", "EXE_NAME ARGS"),
-            ("*", ["--runinprefix"],        "Similar to --run, but run the application inside prefix." \
-                                            "(While using WINE is the same as --run.)", "EXE_NAME ARGS"),
-            ("*", ["--waitforexitandrun"],  "Similar to --run, but waits for wineserver shutdown." \
-                                            "(While using WINE is the same as --run.)", "EXE_NAME ARGS"),
-            ("*", ["-w", "--winetricks"],   "Installs dlls/apps inside the prefix.", "ARGS"),
-            (0, ["--use-wine"],             "Overrides the default runners and runs the application using Wine.", None),
-            (0, ["--use-umu"],              "Overrides the default runners and runs the application using UMU.", None),
-            (0, ["--list-aliases"],         "Lists all executable aliases in the application's configuration file.", None)
-        ]
-
-        # Format is [ (nargs, [args_names], help, metaver) ]
-        self._pre_optional_args: List[Tuple[str | int, List[str], str, str | None]] = [
-            (0, ["--show-ids"],             "Displays all application's profile ids.", None),
-            (0, ["--show-verbs"],           "Displays all verbs and its description.", None),
-            (0, ["--show-optional-args"],   "Displays all verbs and its description.", None),
-        ]
+        self._optional_args: List[Tuple[str | int, List[str], str, str | None]] = OPTIONAL_ARGS
+
+        self._pre_optional_args: List[Tuple[str | int, List[str], str, str | None]] = PRE_OPTIONAL_ARGS
+
+
+    def _get_formatter(self) -> HelpFormatter:
+        """
+        _get_formatter
+
+        Same as ArgumentParser._get_formatter, but resolves the terminal width itself,
+        argparse would otherwise import shutil (and its compression modules) on every add_argument.
+
+        :return: The help formatter.
+        """
+
+        try:
+            width: int = int(environ["COLUMNS"])
+        except (KeyError, ValueError):
+            try:
+                width = get_terminal_size().columns
+            except OSError:
+                width = 80
+
+        return self.formatter_class(prog = self.prog, width = width - 2)
 
 
     def compilePreArgumentsParser(self) -> None:
@@ -113,8 +100,10 @@ class WRArgumentParser(ArgumentParser):
         for arg in self._positional_args:
             self.add_argument(arg[1], nargs = arg[0], help = arg[2])
 
+        # argparse checks the empty list of a "*" positional against its choices as well,
+        # so they're checked by positionalArgumentsCheck instead.
         for arg_name, arg in self._optional_positional_args.items():
-            self.add_argument(arg_name, nargs = arg[0], choices = arg[1], help = arg[2])
+            self.add_argument(arg_name, nargs = arg[0], metavar = arg_name.upper(), help = arg[2])
 
         for arg in self._optional_args:
             if arg[0] == 0:
@@ -129,7 +118,7 @@ class WRArgumentParser(ArgumentParser):
         """
         positionalArgumentsCheck
 
-        Checks if any of the optional was provided arguments.
+        Checks if any of the optional was provided arguments and if the optional positionals are valid choices.
         Will raise an ArgumentTypeError exception if no positional was provided.
 
         :namespace: Simple object that stores ArgumentParser attributes.
@@ -139,6 +128,12 @@ class WRArgumentParser(ArgumentParser):
         if not any(vars(namespace)[key] != None for key in vars(namespace)):
             raise ArgumentTypeError("At least one positional argument must be provided.")
 
+        for arg_name, arg in self._optional_positional_args.items():
+            for value in vars(namespace)[arg_name]:
+                if value in arg[1]: continue
+
+                self.error(f"argument {arg_name}: invalid choice: '{value}' (choose from {', '.join(map(repr, arg[1]))})")
+
 
     def getNextOptArg(self, namespace: Namespace) -> Any | None:
         """
@@ -173,11 +168,5 @@ class WRArgumentParser(ArgumentParser):
         :return: The help messages for all optional arguments.
         """
 
-        final_text: str = ""
-
-        for arg in self._optional_args:
-            for _arg in arg[1]:
-                final_text += f"{_arg}: {arg[2]}\n"
-
-        return final_text[:-1]
+        return getOptionalArgumentHelp()
 
@@ -1,8 +1,9 @@
-from os import path, listdir
-from tomllib import load
-from typing import Any, Dict, Generator, List, NoReturn
-from utils.funcs import die, getValue, handleExceptionIfAny, _print
-from utils.parser import Repair
+from os import path
+from typing import Any, Dict, Generator, List, NoReturn, Set, Tuple
+from utils.funcs import die, _print
+from utils.parser import Repair, ProfileIndex
+from utils.metadata import formatAliases
+from utils.tracer import tracer
 from handlers import createHandler, UMUHandler, WineHandler
 
 
@@ -12,70 +13,37 @@ class Parser(Repair):
     """
 
     def __init__(self):
-        super().__init__()
+        with tracer.phase("Repair"):
+            super().__init__()
 
-        self._application_data: List[Dict[str, str]] = [
-            app_data for app_data in self._generateApplicationData(self.getProfilesPath())
-        ]
-
-
-    @staticmethod
-    def _generateApplicationData(profiles_path: str) -> Generator[Dict[str, str], None, None]:
-        """
-        _generateApplicationData
-
-        Creates a list of dictionary like objects with the applications' configuration file.
-        It ignores configuration files with id "configuration_example" and malformed toml files.
-
-        :profiles_path: Path to search for the application's profile configuration file.
-        :return: A generator of possible application's configuration files.
-        """
-
-        files: Generator[str, None, None] = (
-            path.join(profiles_path, f)
-            for f in listdir(profiles_path)
-            if path.isfile(path.join(profiles_path, f))
-        )
-
-        for file_path in files:
-            with open(file_path, "rb") as fp:
-                app_data: Dict[str, Any] = {}
-
-                app_data = handleExceptionIfAny(
-                    f"Failed to parse the profile's configuration file: {file_path}.\n" \
-                    "Probably there's something wrong with the this toml file.",
-                    True,
-                    load,
-                    fp
-                )
-
-                app_data = handleExceptionIfAny(
-                    message = f"Didn't found the [profile] field in the profile's configuration file: {file_path}.",
-                    fatal = True,
-                    func = getValue,
-                    data = app_data,
-                    key="profile"
-                )
-
-                if not app_data: continue
-
-                yield app_data
+        with tracer.phase("Parser"):
+            self._profile_index: ProfileIndex = ProfileIndex(
+                self.getProfilesPath(),
+                path.join(self.getConfigPath(), "profiles.index")
+            )
 
 
-    def createHandlers(self, profile_id_arg: str, default_runner_arg: str | None = None) -> UMUHandler | WineHandler | None:
+    def createHandlers(
+        self,
+        profile_id_arg: str,
+        default_runner_arg: str | None = None,
+        launch_mode_arg: str | None = None,
+        dry_run_arg: bool = False
+    ) -> UMUHandler | WineHandler | None:
         """
-        Run through my-apps directory and creates a Handler class objects from the configuration files.
+        Looks up the profile in the profile index and creates a Handler class object from its configuration.
 
         :profile_id_arg: Application's profile id.
         :default_runner_arg: (Optional) Default runner, defaults to None.
+        :launch_mode_arg: (Optional) Overrides the launch mode of the profile, defaults to None.
+        :dry_run_arg: (Optional) Prints the commands instead of running them, defaults to False.
         :return: The handler that matches the application's profile id of type UMUHandler or WineHandler.
         """
 
-        for app_data in self._application_data:
-            profile_id: str | None = self._parseValue(app_data, "profile_id", str, fatal = True, expand_envars = False)
+        app_data: Dict[str, Any] | None = self._profile_index.getProfile(profile_id_arg)
 
-            # Skips the example configuration file
-            if profile_id == "example_configuration_file" or profile_id != profile_id_arg: continue
+        if app_data:
+            profile_id: str | None = self._parseValue(app_data, "profile_id", str, fatal = True, expand_envars = False)
 
             wine_directory: str | None = self._parseValue(app_data, "wine_directory", str)
             umu_directory: str | None = self._parseValue(app_data, "umu_directory", str)
@@ -87,7 +55,38 @@ class Parser(Repair):
 
             debug: bool | None = self._parseValue(app_data, "debug", bool, True)
             debug_filepath: str | None = self._parseValue(app_data, "debug_filepath", str)
+            launch_mode: str = launch_mode_arg if launch_mode_arg \
+                else self._parseValue(app_data, "launch_mode", str, "spawn")
+
+            if launch_mode not in ["spawn", "exec"]:
+                die(f"Invalid launch_mode \"{launch_mode}\", expected \"spawn\" or \"exec\".")
+
             application_directory: str | None = self._parseValue(app_data, "application_directory", str, fatal = True)
+            logging: Dict[str, Any] | None = self._parseValue(app_data, "logging", dict, expand_envars = False)
+            log_options: Dict[str, Any] | None = self._parseLogOptions(
+                logging,
+                debug_filepath,
+                application_directory   # pyright: ignore[reportArgumentType]
+            ) if logging is not None else None
+            accounting: bool = self._parseValue(app_data, "accounting", bool, False)
+            sampling_interval: float | None = self._parseValue(app_data, "sampling_interval", int | float) # pyright: ignore[reportArgumentType]
+
+            if sampling_interval is not None and sampling_interval <= 0:
+                die(f"Invalid sampling_interval \"{sampling_interval}\", expected a number of seconds greater than 0.")
+
+            scheduling: Dict[str, Any] | None = self._parseValue(app_data, "scheduling", dict, expand_envars = False)
+            scheduling_options: Dict[str, Any] | None = self._parseSchedulingOptions(scheduling) if scheduling else None
+            launch_wrappers: List[Any] | None = self._parseValue(app_data, "launch_wrappers", list)
+            wineserver: Dict[str, Any] | None = self._parseValue(app_data, "wineserver", dict, expand_envars = False)
+            wineserver_options: Dict[str, Any] = {
+                "session": self._parseValue(wineserver, "session", bool, True),
+                "persist": self._parseValue(wineserver, "persist", int, 300)
+            }
+
+            if wineserver_options["persist"] < 1:
+                die(f"Invalid persist \"{wineserver_options['persist']}\", expected a number of seconds greater than 0.")
+
+            prefix_templates: bool = self._parseValue(app_data, "prefix_templates", bool, True)
             environment_variables: Dict[str, str] | None = self._parseValue(
                 app_data,
                 "environment_variables",
@@ -116,12 +115,155 @@ class Parser(Repair):
                 dxvk_directory,
                 dxvk_nvapi_directory,
                 winetricks_path,
-                gallium_nine_directory
+                gallium_nine_directory,
+                launch_mode,
+                log_options,
+                accounting,
+                sampling_interval,
+                scheduling_options,
+                dry_run_arg,
+                self._parseLaunchWrappers(launch_wrappers) if launch_wrappers else None,
+                wineserver_options,
+                prefix_templates
             )
 
             return handler
 
 
+    def _parseLogOptions(
+        self,
+        logging: Dict[str, Any],
+        debug_filepath: str | None,
+        application_directory: str
+    ) -> Dict[str, Any]:
+        """
+        _parseLogOptions
+
+        Parses the [profile.logging] table into the LogSink options.
+
+        :logging: The [profile.logging] table.
+        :debug_filepath: Path to the file where logs were saved, its directory is the default logs directory.
+        :application_directory: Path to the application's directory, the logs go to its "logs" directory by default.
+        :return: The LogSink keyword arguments.
+        """
+
+        # Only needed when the profile has a [profile.logging] table.
+        from utils.logsink import COMPRESSIONS, parseSize
+
+        directory: str | None = self._parseValue(logging, "directory", str)
+        compression: str = self._parseValue(logging, "compression", str, "none")
+        keep_sessions: int = self._parseValue(logging, "keep_sessions", int, 10)
+
+        if compression not in COMPRESSIONS:
+            die(f"Invalid compression \"{compression}\", expected one of: {', '.join(COMPRESSIONS)}.")
+
+        if keep_sessions < 1:
+            die(f"Invalid keep_sessions \"{keep_sessions}\", at least the current session must be kept.")
+
+        log_options: Dict[str, Any] = {
+            "directory": directory if directory \
+                         else path.dirname(debug_filepath) if debug_filepath \
+                         else path.join(application_directory, "logs"),
+            "compression": compression,
+            "keep_sessions": keep_sessions
+        }
+
+        for key in ["segment_size", "max_total_size", "crash_buffer_size"]:
+            value: int | str | None = self._parseValue(logging, key, int | str) # pyright: ignore[reportArgumentType]
+
+            if value is None: continue
+
+            size: int | None = parseSize(value)
+
+            if not size: die(f"Invalid {key} \"{value}\", expected a size such as 1048576, \"512K\", \"64M\" or \"1G\".")
+
+            log_options[key] = size
+
+        return log_options
+
+
+    def _parseSchedulingOptions(self, scheduling: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        _parseSchedulingOptions
+
+        Parses the [profile.scheduling] table into the Scheduling options.
+
+        :scheduling: The [profile.scheduling] table.
+        :return: The Scheduling keyword arguments.
+        """
+
+        # Only needed when the profile has a [profile.scheduling] table.
+        from utils.scheduling import IO_CLASSES, POLICIES, parseCPUList
+
+        affinity: str | List[int] | None = self._parseValue(scheduling, "affinity", str | list) # pyright: ignore[reportArgumentType]
+        nice: int | None = self._parseValue(scheduling, "nice", int)
+        io_class: str | None = self._parseValue(scheduling, "io_class", str)
+        io_priority: int | None = self._parseValue(scheduling, "io_priority", int)
+        policy: str | None = self._parseValue(scheduling, "policy", str)
+        cpus: Set[int] | str | None = "auto" if affinity == "auto" else parseCPUList(affinity) if affinity is not None else None
+
+        if affinity is not None and not cpus:
+            die(f"Invalid affinity \"{affinity}\", expected \"auto\" or a list of CPUs such as [0, 1, 2] or \"0-7,16-23\".")
+
+        if nice is not None and not -20 <= nice <= 19:
+            die(f"Invalid nice \"{nice}\", expected a value from -20 to 19.")
+
+        if io_class is not None and io_class not in IO_CLASSES:
+            die(f"Invalid io_class \"{io_class}\", expected one of: {', '.join(IO_CLASSES)}.")
+
+        if io_priority is not None and not 0 <= io_priority <= 7:
+            die(f"Invalid io_priority \"{io_priority}\", expected a value from 0 to 7.")
+
+        if policy is not None and policy not in POLICIES:
+            die(f"Invalid policy \"{policy}\", expected one of: {', '.join(POLICIES)}.")
+
+        return {
+            "affinity": cpus,
+            "nice": nice,
+            "io_class": io_class,
+            "io_priority": io_priority,
+            "policy": policy
+        }
+
+
+    def _parseLaunchWrappers(self, launch_wrappers: List[Any]) -> List[Tuple[str, List[str]]]:
+        """
+        _parseLaunchWrappers
+
+        Parses the [[profile.launch_wrappers]] tables, skipping the disabled ones.
+
+        :launch_wrappers: The [[profile.launch_wrappers]] tables in order.
+        :return: The wrappers as (command, [argument_templates]).
+        """
+
+        # Only needed when the profile has [[profile.launch_wrappers]] tables.
+        from utils.launchwrappers import TEMPLATE_FIELDS, getTemplateFields
+
+        wrappers: List[Tuple[str, List[str]]] = []
+
+        for wrapper in launch_wrappers:
+            if not isinstance(wrapper, dict): die(f"Invalid launch wrapper \"{wrapper}\", expected a [[profile.launch_wrappers]] table.")
+
+            command: str = self._parseValue(wrapper, "command", str, fatal = True)
+            args: List[Any] = self._parseValue(wrapper, "args", list, [])
+
+            if not self._parseValue(wrapper, "enabled", bool, True): continue
+
+            for arg in args:
+                fields: Set[str] | None = getTemplateFields(arg) if isinstance(arg, str) else None
+
+                if fields is None:
+                    die(f"Invalid argument \"{arg}\" for the launch wrapper \"{command}\", expected a string (braces are written as {{{{ and }}}}).")
+
+                if fields - set(TEMPLATE_FIELDS):
+                    die(f"Unknown field \"{(fields - set(TEMPLATE_FIELDS)).pop()}\" in the arguments of the launch wrapper \"{command}\", " \
+                        + f"expected one of: {', '.join(TEMPLATE_FIELDS)}.")
+
+            wrappers.append((command, [path.expandvars(arg) for arg in args]))
+
+        return wrappers
+
+
     @staticmethod
     def _sanitizePaths(_dict: Dict[Any, Any]) -> Dict[str, str]:
         """
@@ -216,46 +358,12 @@ class Parser(Repair):
         """
         getAllIDs
 
-        Parse through all application's configuration files and get its ids.
+        Get the ids of all application's configuration files.
 
         :return:
         """
 
-        profiles_directory: str = self.getProfilesPath()
-        files: Generator[str, None, None] = (
-            path.join(profiles_directory, f)
-            for f in listdir(profiles_directory)
-            if path.isfile(path.join(profiles_directory, f))
-        )
-
-        for file_path in files:
-            with open(file_path, "rb") as fp:
-                app_data: Dict[str, Any] = {}
-
-                app_data = handleExceptionIfAny(
-                    f"Failed to parse the profile's configuration file: {file_path}.\n" \
-                    "Probably there's something wrong with the this toml file.",
-                    False,
-                    load,
-                    fp
-                )
-
-                app_data = handleExceptionIfAny(
-                    message = f"Didn't found the [profile] field in the profile's configuration file: {file_path}.",
-                    fatal = False,
-                    func = getValue,
-                    data = app_data,
-                    key = "profile"
-                )
-
-                if not app_data: continue
-
-                profile_id: str | None = self._parseValue(app_data, "profile_id", str, fatal = False, expand_envars = False)
-
-                # Skips the example configuration file
-                if not profile_id or profile_id == "example_configuration_file": continue
-
-                yield profile_id
+        yield from self._profile_index.getIDs()
 
 
     def listAliases(self, profile_id: str) -> str:
@@ -268,28 +376,5 @@ class Parser(Repair):
         :return: A string with all available executables aliases for the given profile id.
         """
 
-        executables_aliases: Dict[str, str] | None = None
-
-        for app_data in self._application_data:
-            _profile_id: str | None = self._parseValue(app_data, "profile_id", str, fatal = False, expand_envars = False)
-
-            # Skips the example configuration file
-            if not _profile_id or _profile_id == "example_configuration_file": continue
-
-            if _profile_id == profile_id:
-                executables_aliases = self._parseValue(app_data, "executables_aliases", dict, {})
-
-                break
-
-        if not executables_aliases: return ""
-
-        final_text: str = ""
-
-        for k, v in executables_aliases.items():
-            if not path.exists(v):
-                continue
-
-            final_text += f"{k}: {v}\n"
-
-        return final_text[:-1]
+        return formatAliases(self._parseValue(self._profile_index.getProfile(profile_id), "executables_aliases", dict, {}))
 
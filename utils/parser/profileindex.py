@@ -0,0 +1,182 @@
+from marshal import dump, dumps, load
+from os import listdir, path, replace, stat_result, stat, getpid
+from stat import S_ISREG
+from typing import Any, Dict, Generator, Tuple
+from utils.funcs import getValue, handleExceptionIfAny
+
+
+# Format is { file_path: (mtime_ns, size, profile_id, profile_table) }
+IndexEntry = Tuple[int, int, str | None, Dict[str, Any]]
+
+
+class ProfileIndex:
+    """
+    ProfileIndex
+
+    Persistent index of the profiles' configuration files.
+    Each file is keyed by its (path, mtime, size), so only the files that changed since the index
+    was last written are parsed again, every other lookup is a dictionary access.
+
+    :profiles_path: Path to the directory with the application's profile configuration files.
+    :index_filepath: Path to the file where the index is stored.
+    :fatal: (Optional) Tells if the program should quit on malformed configuration files, defaults to true.
+    """
+
+    _VERSION: int = 1
+
+    def __init__(self, profiles_path: str, index_filepath: str, fatal: bool = True):
+        self._profiles_path: str                    = profiles_path
+        self._index_filepath: str                   = index_filepath
+        self._fatal: bool                           = fatal
+        self._entries: Dict[str, IndexEntry]        = {}
+        self._profiles: Dict[str, Dict[str, Any]]   = {}
+
+        self._refresh()
+
+
+    def _loadIndex(self) -> Dict[str, IndexEntry]:
+        """
+        _loadIndex
+
+        Loads the index stored on disk.
+
+        :return: The stored entries, or an empty dictionary if there's no usable index.
+        """
+
+        try:
+            with open(self._index_filepath, "rb") as fp:
+                version, entries = load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+
+        return entries if version == self._VERSION and isinstance(entries, dict) else {}
+
+
+    def _saveIndex(self) -> None:
+        """
+        _saveIndex
+
+        Atomically writes the index to disk, entries that can't be serialized are left out
+        and will be parsed again on the next run.
+
+        :return:
+        """
+
+        entries: Dict[str, IndexEntry] = {}
+
+        for file_path, entry in self._entries.items():
+            try:
+                dumps(entry)
+            except ValueError:
+                continue
+
+            entries[file_path] = entry
+
+        tmp_filepath: str = f"{self._index_filepath}.{getpid()}.tmp"
+
+        try:
+            with open(tmp_filepath, "wb") as fp:
+                dump((self._VERSION, entries), fp)
+
+            replace(tmp_filepath, self._index_filepath)
+        except OSError:
+            pass
+
+
+    def _parseFile(self, file_path: str) -> Dict[str, Any] | None:
+        """
+        _parseFile
+
+        Parses the [profile] table of a configuration file.
+
+        :file_path: Path to the configuration file.
+        :return: The [profile] table or None if the file is malformed.
+        """
+
+        # Only needed on an index miss, most runs never import it.
+        from tomllib import load as tload
+
+        with open(file_path, "rb") as fp:
+            app_data: Dict[str, Any] | None = handleExceptionIfAny(
+                f"Failed to parse the profile's configuration file: {file_path}.\n" \
+                "Probably there's something wrong with the this toml file.",
+                self._fatal,
+                tload,
+                fp
+            )
+
+        if not app_data: return None
+
+        return handleExceptionIfAny(
+            message = f"Didn't found the [profile] field in the profile's configuration file: {file_path}.",
+            fatal = self._fatal,
+            func = getValue,
+            data = app_data,
+            key = "profile"
+        )
+
+
+    def _refresh(self) -> None:
+        """
+        _refresh
+
+        Stats every configuration file, parsing again only the new or modified ones.
+
+        :return:
+        """
+
+        cached_entries: Dict[str, IndexEntry] = self._loadIndex()
+        dirty: bool = False
+
+        for f in listdir(self._profiles_path):
+            file_path: str = path.join(self._profiles_path, f)
+
+            try:
+                st: stat_result = stat(file_path)
+            except OSError:
+                continue
+
+            if not S_ISREG(st.st_mode): continue
+
+            entry: IndexEntry | None = cached_entries.get(file_path)
+
+            if not entry or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+                dirty = True
+                app_data: Dict[str, Any] | None = self._parseFile(file_path)
+
+                # Malformed files aren't indexed so they keep being reported.
+                if not isinstance(app_data, dict): continue
+
+                profile_id: Any = app_data.get("profile_id")
+                entry = (st.st_mtime_ns, st.st_size, profile_id if isinstance(profile_id, str) else None, app_data)
+
+            self._entries[file_path] = entry
+
+            # Skips the example configuration file
+            if not entry[2] or entry[2] == "example_configuration_file": continue
+
+            self._profiles.setdefault(entry[2], entry[3])
+
+        if dirty or len(self._entries) != len(cached_entries):
+            self._saveIndex()
+
+
+    def getProfile(self, profile_id: str) -> Dict[str, Any] | None:
+        """
+        getProfile
+
+        :profile_id: Application's profile id.
+        :return: The [profile] table of the given profile id or None if it doesn't exist.
+        """
+
+        return self._profiles.get(profile_id)
+
+
+    def getIDs(self) -> Generator[str, None, None]:
+        """
+        getIDs
+
+        :return: A generator with all the application's profile ids.
+        """
+
+        yield from self._profiles
@@ -1,6 +1,23 @@
 from os import path, mkdir, makedirs, environ
 
 
+def getConfigDirectory() -> str:
+    """
+    getConfigDirectory
+
+    Resolves the wine-runner configuration directory without creating it.
+
+    :return: The path to the configuration directory.
+    """
+
+    config_dir: str | None = environ.get("WRUNNER_CONFIG_DIR")
+
+    try:
+        return config_dir if config_dir else path.join(environ["XDG_CONFIG_HOME"], "wine-runner")
+    except KeyError:
+        return path.join(environ["HOME"], ".config/wine-runner")
+
+
 class Repair:
     """
     Sets up the configuration directory and files.
@@ -9,12 +26,7 @@ class Repair:
     def __init__(self):
         config_example_filename: str = "example_profile_config"
         minimal_example_filename: str = "minimal_example_profile_config"
-        self._config_dir: str | None = environ.get("WRUNNER_CONFIG_DIR")
-
-        try:
-            self._config_dir = self._config_dir if self._config_dir else path.join(environ["XDG_CONFIG_HOME"], "wine-runner")
-        except KeyError:
-            self._config_dir = path.join(environ["HOME"], ".config/wine-runner")
+        self._config_dir: str = getConfigDirectory()
 
         if not path.exists(self._config_dir):
             makedirs(self._config_dir)
@@ -29,24 +41,33 @@ class Repair:
         config_example_filepath = path.join(self._config_profiles_dir, config_example_filename)
         minimal_example_filepath = path.join(self._config_profiles_dir, minimal_example_filename)
 
+        # Read through the module loader so the examples are also found inside the zipapp.
         if not path.exists(config_example_filepath):
-            with open(path.join(examples_path, "examples/example_profile_config"), "r") as fp:
-                content: str = fp.read()
+            content: bytes = __loader__.get_data(path.join(examples_path, "examples/example_profile_config"))
 
-            with open(config_example_filepath, "w") as fp:
+            with open(config_example_filepath, "wb") as fp:
                 fp.write(content)
 
         if not path.exists(minimal_example_filepath):
-            with open(path.join(examples_path, "examples/minimal_example_profile_config"), "r") as fp:
-                content = fp.read()
+            content = __loader__.get_data(path.join(examples_path, "examples/minimal_example_profile_config"))
 
-            with open(minimal_example_filepath, "w") as fp:
+            with open(minimal_example_filepath, "wb") as fp:
                 fp.write(content)
 
         environ["WRUNNER_CONFIG_DIR"] = self._config_dir
         environ["WRUNNER_PROFILES_DIR"] = self._config_profiles_dir
 
 
+    def getConfigPath(self) -> str:
+        """
+        getConfigPath
+
+        :return: the path to the wine-runner configuration directory.
+        """
+
+        return self._config_dir
+
+
     def getProfilesPath(self) -> str:
         """
         getProfilesPath
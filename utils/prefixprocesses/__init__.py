@@ -0,0 +1 @@
+from utils.prefixprocesses.prefixprocesses import PrefixProcess, findPrefixProcesses, formatPrefixProcesses, killPrefixProcesses
@@ -0,0 +1,272 @@
+from os import getpid, kill, listdir, path, readlink, sysconf
+from select import POLLIN, poll
+from signal import SIGKILL, SIGTERM, Signals
+from time import monotonic
+from typing import Dict, List, Set, Tuple
+from utils.wineserver import getServerDirectory
+
+
+# Format is (pid, ppid, name, cpu_ticks, start_ticks, rss_pages, cmdline)
+PrefixProcess = Tuple[int, int, str, int, int, int, str]
+
+# Binaries of wine's processes, every Windows process runs from one of the loaders.
+# The process names are truncated to 15 characters by the kernel, hence wine64-preloade.
+_WINE_BINARIES: Set[str] = {"wine", "wine64", "wine-preloader", "wine64-preloader", "wine64-preloade", "wineserver"}
+
+
+def _parseStat(data: bytes) -> Tuple[str, str, int, int, int, int]:
+    """
+    _parseStat
+
+    Parses /proc/<pid>/stat, the process name can have spaces and parentheses so it's delimited by the last ")".
+
+    :data: The content of the file.
+    :return: The process name, its state, its parent pid, the user plus system CPU time and the start time
+             in clock ticks, and its resident pages.
+    """
+
+    name_end: int = data.rfind(b")")
+    fields: List[bytes] = data[name_end + 2:].split()
+
+    return (
+        data[data.find(b"(") + 1:name_end].decode(errors = "replace"),
+        fields[0].decode(),
+        int(fields[1]),
+        int(fields[11]) + int(fields[12]),
+        int(fields[19]),
+        int(fields[21])
+    )
+
+
+def _hasPrefix(pid: int, wineprefix: bytes) -> bool:
+    """
+    _hasPrefix
+
+    :pid: Process id.
+    :wineprefix: The WINEPREFIX=<prefix> environment entry.
+    :return: True if the process was started with the entry in its environment.
+    """
+
+    try:
+        with open(f"/proc/{pid}/environ", "rb") as fp:
+            environment: bytes = fp.read()
+    except OSError:
+        return False
+
+    # Entries are NUL terminated, so matching the terminator rules out prefixes sharing a leading path.
+    return environment.startswith(wineprefix + b"\0") or b"\0" + wineprefix + b"\0" in environment
+
+
+def _isWineProcess(pid: int, name: str) -> bool:
+    """
+    _isWineProcess
+
+    :pid: Process id.
+    :name: The process name.
+    :return: True if the process runs one of wine's binaries, the name of a Windows process is its .exe.
+    """
+
+    if name in _WINE_BINARIES: return True
+
+    try:
+        # The link ends with " (deleted)" if wine was updated while the process runs.
+        return path.basename(readlink(f"/proc/{pid}/exe")).removesuffix(" (deleted)") in _WINE_BINARIES
+    except OSError:
+        return False
+
+
+def findPrefixProcesses(prefix: str) -> List[PrefixProcess]:
+    """
+    findPrefixProcesses
+
+    Walks /proc for the processes of a prefix without starting wine: wine's processes with the prefix's WINEPREFIX,
+    the prefix's wineserver, which runs from the directory of its socket, and the descendants of both.
+    Other processes with the prefix's WINEPREFIX, such as a shell which exported it, are left out with their
+    descendants, and so are wrunner and its ancestors and the zombies.
+
+    :prefix: Path to the wine prefix.
+    :return: The processes, sorted by pid.
+    """
+
+    wineprefixes: List[bytes] = [f"WINEPREFIX={p}".encode() for p in {prefix, prefix.rstrip("/"), path.realpath(prefix)}]
+    server_directory: str | None = getServerDirectory(prefix)
+    # Format is { pid: (name, state, ppid, cpu_ticks, start_ticks, rss_pages) }
+    stats: Dict[int, Tuple[str, str, int, int, int, int]] = {}
+    roots: List[int] = []
+
+    for entry in listdir("/proc"):
+        if not entry.isdigit(): continue
+
+        pid: int = int(entry)
+
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as fp:
+                stats[pid] = _parseStat(fp.read())
+        except (OSError, ValueError, IndexError):
+            continue
+
+        if stats[pid][1] == "Z": continue
+
+        if _isWineProcess(pid, stats[pid][0]) and any(_hasPrefix(pid, wineprefix) for wineprefix in wineprefixes):
+            roots.append(pid)
+
+            continue
+
+        if stats[pid][0] != "wineserver" or not server_directory: continue
+
+        try:
+            if readlink(f"/proc/{pid}/cwd") == server_directory: roots.append(pid)
+        except OSError:
+            pass
+
+    ancestors: Set[int] = set()
+    pid = getpid()
+
+    while pid in stats and pid not in ancestors:
+        ancestors.add(pid)
+        pid = stats[pid][2]
+
+    # Format is { ppid: [pid] }
+    children: Dict[int, List[int]] = {}
+
+    for pid, stat in stats.items():
+        children.setdefault(stat[2], []).append(pid)
+
+    tree: Set[int] = set()
+
+    while roots:
+        pid = roots.pop()
+
+        if pid in tree or pid in ancestors or stats[pid][1] == "Z": continue
+
+        tree.add(pid)
+        roots.extend(children.get(pid, []))
+
+    processes: List[PrefixProcess] = []
+
+    for pid in sorted(tree):
+        name, _, ppid, cpu_ticks, start_ticks, rss_pages = stats[pid]
+
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as fp:
+                cmdline: str = fp.read().rstrip(b"\0").replace(b"\0", b" ").decode(errors = "replace")
+        except OSError:
+            cmdline = ""
+
+        processes.append((pid, ppid, name, cpu_ticks, start_ticks, rss_pages, cmdline if cmdline else f"[{name}]"))
+
+    return processes
+
+
+def formatPrefixProcesses(processes: List[PrefixProcess]) -> str:
+    """
+    formatPrefixProcesses
+
+    :processes: The processes of a prefix.
+    :return: A table with the CPU time, average CPU usage since the process started and resident memory of each process.
+    """
+
+    ticks: int = sysconf("SC_CLK_TCK")
+    page_kib: int = sysconf("SC_PAGE_SIZE") // 1024
+
+    with open("/proc/uptime") as fp:
+        uptime_ticks: float = float(fp.read().split()[0]) * ticks
+
+    lines: List[str] = [f"{'PID':>8}{'PPID':>8}{'CPU':>7}{'TIME':>10}{'RSS':>10}  COMMAND"]
+
+    for pid, ppid, _, cpu_ticks, start_ticks, rss_pages, cmdline in processes:
+        elapsed_ticks: float = max(uptime_ticks - start_ticks, 1)
+
+        lines.append(
+            f"{pid:>8}{ppid:>8}{f'{cpu_ticks * 100 / elapsed_ticks:.1f}%':>7}{f'{cpu_ticks / ticks:.2f}s':>10}" \
+            + f"{f'{rss_pages * page_kib / 1024:.1f}MiB':>10}  {cmdline}"
+        )
+
+    return "\n".join(lines)
+
+
+def _signalProcesses(pids: List[int], signal: Signals, timeout: float) -> List[int]:
+    """
+    _signalProcesses
+
+    Signals the processes and waits for them to exit.
+    Each process is referred to by a pidfd, so a pid reused meanwhile is never signaled nor waited for.
+
+    :pids: Process ids.
+    :signal: The signal to send.
+    :timeout: Seconds to wait for the processes to exit.
+    :return: The processes still running.
+    """
+
+    # Only needed when processes are signaled, pidfd_open needs Linux 5.3.
+    from os import close, pidfd_open
+    from signal import pidfd_send_signal
+
+    # Format is { pidfd: pid }
+    pidfds: Dict[int, int] = {}
+    unwatched: List[int] = []
+    poller: poll = poll()
+
+    for pid in pids:
+        try:
+            pidfd: int = pidfd_open(pid)
+        except ProcessLookupError:
+            continue
+        except OSError:
+            # Without pidfds, a signal to a reused pid can't be ruled out, nor can the exit be polled.
+            try:
+                kill(pid, signal)
+                unwatched.append(pid)
+            except OSError:
+                pass
+
+            continue
+
+        try:
+            pidfd_send_signal(pidfd, signal)
+        except OSError:
+            close(pidfd)
+
+            continue
+
+        pidfds[pidfd] = pid
+        poller.register(pidfd, POLLIN)
+
+    deadline: float = monotonic() + timeout
+
+    # A pidfd becomes readable once its process exits.
+    while pidfds and monotonic() < deadline:
+        for pidfd, _ in poller.poll(max(deadline - monotonic(), 0) * 1000):
+            poller.unregister(pidfd)
+            close(pidfd)
+            del pidfds[pidfd]
+
+    for pidfd in pidfds: close(pidfd)
+
+    return list(pidfds.values()) + [pid for pid in unwatched if path.exists(f"/proc/{pid}")]
+
+
+def killPrefixProcesses(prefix: str, timeout: float) -> Tuple[int, int]:
+    """
+    killPrefixProcesses
+
+    Sends SIGTERM to the processes of a prefix and SIGKILL to the ones, or their children spawned meanwhile,
+    still running after the timeout. Unlike wineboot --kill, it doesn't need a working wineserver.
+
+    :prefix: Path to the wine prefix.
+    :timeout: Seconds the processes have to exit after SIGTERM.
+    :return: The number of processes terminated and of processes killed.
+    """
+
+    pids: List[int] = [p[0] for p in findPrefixProcesses(prefix)]
+
+    if not pids: return 0, 0
+
+    running: List[int] = _signalProcesses(pids, SIGTERM, timeout)
+
+    # The processes found again include the children spawned after the scan.
+    remaining: List[int] = [p[0] for p in findPrefixProcesses(prefix)] if running else []
+
+    if remaining: _signalProcesses(remaining, SIGKILL, timeout)
+
+    return len(pids) - len(running), len(remaining)
@@ -0,0 +1 @@
+from utils.prefixtemplates.prefixtemplates import CloneCounts, PrefixTemplates, isUpdateNeeded
@@ -0,0 +1,353 @@
+from marshal import dump, load
+from os import O_CREAT, O_EXCL, O_RDONLY, O_WRONLY, DirEntry, close, copy_file_range, environ, fchmod, getpid, link, makedirs
+from os import mkdir, path, readlink, rename, scandir, sendfile, stat, stat_result, symlink, utime
+from os import open as osopen
+from typing import List, Tuple
+from utils.parser.repair import getConfigDirectory
+
+
+# Format is ( (inode, mtime_ns, size), ... ), of the wine binary and of its wine.inf.
+WineIdentity = Tuple[Tuple[int, int, int], ...]
+
+# Format is (reflinked, hardlinked, copied), number of files cloned each way.
+CloneCounts = Tuple[int, int, int]
+
+# ioctl number of FICLONE, _IOW(0x94, 9, int).
+_FICLONE: int = 0x40049409
+
+# Read-only files with these extensions are hardlinked when the filesystem can't reflink,
+# being read-only they're replaced instead of written in place, so the shared inode isn't modified.
+_HARDLINK_EXTENSIONS: Tuple[str, ...] = (".dll", ".drv", ".exe", ".sys", ".acm", ".ax", ".cpl", ".ocx", ".tlb")
+
+
+def getWineInfPath(wine_path: str) -> str:
+    """
+    getWineInfPath
+
+    :wine_path: Path to the wine binary.
+    :return: Path to the wine.inf of the wine build, which wineboot compares to the prefix's .update-timestamp.
+    """
+
+    return path.normpath(path.join(path.dirname(path.realpath(wine_path)), "..", "share", "wine", "wine.inf"))
+
+
+class _Cloner:
+    """
+    _Cloner
+
+    Clones a directory tree, every file with the cheapest method the filesystem supports: a FICLONE reflink
+    sharing the extents until either copy is written, a hardlink for the read-only DLLs, or copy_file_range,
+    which copies within the kernel (or is offloaded to the storage). Symlinks are recreated as they are.
+    """
+
+    def __init__(self):
+        self._reflink: bool             = True
+        self._counts: List[int]         = [0, 0, 0]
+
+
+    def _cloneFile(self, src: str, dst: str, st: stat_result) -> None:
+        """
+        _cloneFile
+
+        :src: Path to the file.
+        :dst: Path to the clone, it must not exist.
+        :st: The file's stat.
+        :return:
+        """
+
+        if not self._reflink and not st.st_mode & 0o222 and src.lower().endswith(_HARDLINK_EXTENSIONS):
+            try:
+                link(src, dst)
+                self._counts[1] += 1
+
+                return
+            except OSError:
+                pass
+
+        src_fd: int = osopen(src, O_RDONLY)
+
+        try:
+            dst_fd: int = osopen(dst, O_WRONLY | O_CREAT | O_EXCL, 0o600)
+
+            try:
+                fchmod(dst_fd, st.st_mode & 0o7777)
+
+                if not self._reflinkFile(src_fd, dst_fd): self._copyFile(src_fd, dst_fd, st.st_size)
+            finally:
+                close(dst_fd)
+        finally:
+            close(src_fd)
+
+        utime(dst, ns = (st.st_atime_ns, st.st_mtime_ns))
+
+
+    def _reflinkFile(self, src_fd: int, dst_fd: int) -> bool:
+        """
+        _reflinkFile
+
+        :src_fd: File descriptor of the file.
+        :dst_fd: File descriptor of the empty clone.
+        :return: True if the clone shares the file's extents.
+        """
+
+        if not self._reflink: return False
+
+        # Only needed while the filesystem supports reflinks.
+        from fcntl import ioctl
+
+        try:
+            ioctl(dst_fd, _FICLONE, src_fd)
+        except OSError:
+            # Not supported by the filesystem (or across filesystems), so it isn't tried again.
+            self._reflink = False
+
+            return False
+
+        self._counts[0] += 1
+
+        return True
+
+
+    def _copyFile(self, src_fd: int, dst_fd: int, size: int) -> None:
+        """
+        _copyFile
+
+        Copies the file within the kernel, with sendfile on kernels without copy_file_range across filesystems.
+
+        :src_fd: File descriptor of the file.
+        :dst_fd: File descriptor of the empty clone.
+        :size: Size of the file.
+        :return:
+        """
+
+        copied: int = 0
+
+        while copied < size:
+            try:
+                n: int = copy_file_range(src_fd, dst_fd, size - copied)
+            except OSError:
+                n = sendfile(dst_fd, src_fd, copied, size - copied)
+
+            if n == 0: break
+
+            copied += n
+
+        self._counts[2] += 1
+
+
+    def clone(self, src: str, dst: str) -> CloneCounts:
+        """
+        clone
+
+        :src: Path to the directory.
+        :dst: Path to the clone, it must not exist.
+        :return: The number of files reflinked, hardlinked and copied so far.
+        """
+
+        mkdir(dst, stat(src).st_mode & 0o7777)
+
+        directories: List[Tuple[str, str]] = [(src, dst)]
+
+        while directories:
+            src_directory, dst_directory = directories.pop()
+
+            with scandir(src_directory) as entries:
+                for entry in entries:
+                    self._cloneEntry(entry, path.join(dst_directory, entry.name), directories)
+
+        return (self._counts[0], self._counts[1], self._counts[2])
+
+
+    def _cloneEntry(self, entry: DirEntry[str], dst: str, directories: List[Tuple[str, str]]) -> None:
+        """
+        _cloneEntry
+
+        :entry: The entry to be cloned.
+        :dst: Path to its clone.
+        :directories: Directories left to be cloned, a subdirectory is created and appended to it.
+        :return:
+        """
+
+        if entry.is_symlink():
+            symlink(readlink(entry.path), dst)
+        elif entry.is_dir():
+            mkdir(dst, entry.stat().st_mode & 0o7777)
+            directories.append((entry.path, dst))
+        elif entry.is_file():
+            self._cloneFile(entry.path, dst, entry.stat())
+
+
+class PrefixTemplates:
+    """
+    PrefixTemplates
+
+    Store of freshly initialized prefixes, one per wine build and architecture, so new prefixes are cloned
+    instead of being created by wineboot --init.
+    Each template is tied to the identity of the wine binary and of its wine.inf, updating wine invalidates it.
+
+    :templates_directory: (Optional) Directory of the templates, defaults to templates in the configuration directory.
+    """
+
+    _VERSION: int = 1
+
+    def __init__(self, templates_directory: str | None = None):
+        self._templates_directory: str = templates_directory if templates_directory \
+                                         else path.join(environ.get("WRUNNER_CONFIG_DIR") or getConfigDirectory(), "templates")
+
+
+    @staticmethod
+    def _identity(wine_path: str) -> WineIdentity | None:
+        """
+        _identity
+
+        :wine_path: Path to the wine binary.
+        :return: The identity of the wine build, or None if the binary doesn't exist.
+        """
+
+        identity: List[Tuple[int, int, int]] = []
+
+        for filepath in [wine_path, getWineInfPath(wine_path)]:
+            try:
+                st: stat_result = stat(filepath)
+            except OSError:
+                if filepath == wine_path: return None
+
+                continue
+
+            identity.append((st.st_ino, st.st_mtime_ns, st.st_size))
+
+        return tuple(identity)
+
+
+    def _getTemplateDirectory(self, wine_path: str, arch: str) -> str:
+        """
+        _getTemplateDirectory
+
+        :wine_path: Path to the wine binary.
+        :arch: The prefix's architecture, "win64" or "win32".
+        :return: The directory of the template, holding the prefix and its identity.
+        """
+
+        # Only needed by init, hashlib isn't loaded by the launches.
+        from hashlib import sha1
+
+        return path.join(self._templates_directory, f"{arch}-{sha1(path.realpath(wine_path).encode()).hexdigest()[:16]}")
+
+
+    def get(self, wine_path: str, arch: str) -> str | None:
+        """
+        get
+
+        Looks up the template, removing it if the wine build changed.
+
+        :wine_path: Path to the wine binary.
+        :arch: The prefix's architecture, "win64" or "win32".
+        :return: Path to the template's prefix, or None if there's none for the wine build.
+        """
+
+        template_directory: str = self._getTemplateDirectory(wine_path, arch)
+
+        try:
+            with open(path.join(template_directory, "identity"), "rb") as fp:
+                version, identity = load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if version == self._VERSION and identity == self._identity(wine_path): return path.join(template_directory, "pfx")
+
+        self._remove(template_directory)
+
+        return None
+
+
+    def create(self, prefix: str, wine_path: str, arch: str) -> CloneCounts | None:
+        """
+        create
+
+        Stores a clone of a freshly initialized prefix as the template, replacing the previous one.
+        The prefix's wineserver must have exited, so the registry is on disk.
+
+        :prefix: Path to the prefix.
+        :wine_path: Path to the wine binary the prefix was initialized with.
+        :arch: The prefix's architecture, "win64" or "win32".
+        :return: The number of files reflinked, hardlinked and copied, or None if it couldn't be stored.
+        """
+
+        identity: WineIdentity | None = self._identity(wine_path)
+
+        if not identity: return None
+
+        template_directory: str = self._getTemplateDirectory(wine_path, arch)
+        tmp_directory: str = f"{template_directory}.{getpid()}.tmp"
+
+        try:
+            makedirs(tmp_directory)
+
+            counts: CloneCounts = _Cloner().clone(prefix, path.join(tmp_directory, "pfx"))
+
+            with open(path.join(tmp_directory, "identity"), "wb") as fp:
+                dump((self._VERSION, identity), fp)
+
+            self._remove(template_directory)
+            rename(tmp_directory, template_directory)
+        except (OSError, ValueError):
+            self._remove(tmp_directory)
+
+            return None
+
+        return counts
+
+
+    @staticmethod
+    def clonePrefix(template: str, prefix: str) -> CloneCounts:
+        """
+        clonePrefix
+
+        :template: Path to the template's prefix.
+        :prefix: Path to the new prefix, it must not exist.
+        :return: The number of files reflinked, hardlinked and copied.
+        """
+
+        return _Cloner().clone(template, prefix)
+
+
+    @staticmethod
+    def _remove(directory: str) -> None:
+        """
+        _remove
+
+        :directory: Path to the directory to be removed, if it exists.
+        :return:
+        """
+
+        if not path.lexists(directory): return
+
+        # Only needed when a template is replaced or invalidated.
+        from shutil import rmtree
+
+        rmtree(directory, ignore_errors = True)
+
+
+def isUpdateNeeded(prefix: str, wine_path: str) -> bool:
+    """
+    isUpdateNeeded
+
+    wineboot updates a prefix when its .update-timestamp doesn't hold the mtime of the build's wine.inf.
+
+    :prefix: Path to the prefix.
+    :wine_path: Path to the wine binary.
+    :return: True if wineboot -u would update the prefix.
+    """
+
+    try:
+        inf_mtime: int = int(stat(getWineInfPath(wine_path)).st_mtime)
+    except OSError:
+        return False
+
+    try:
+        with open(path.join(prefix, ".update-timestamp")) as fp:
+            timestamp: str = fp.read().split()[0]
+    except (OSError, IndexError):
+        return True
+
+    return timestamp != "disable" and timestamp != str(inf_mtime)
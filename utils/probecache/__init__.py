@@ -0,0 +1 @@
+from utils.probecache.probecache import ProbeCache
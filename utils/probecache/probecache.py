@@ -0,0 +1,175 @@
+from marshal import dump, load
+from os import environ, getpid, path, replace, stat, stat_result
+from typing import Any, Dict, Tuple
+from utils.parser.repair import getConfigDirectory
+
+
+# Format is (binary_inode, binary_mtime_ns, binary_size, prefix_inode)
+Identity = Tuple[int, int, int, int]
+
+
+class ProbeCache:
+    """
+    ProbeCache
+
+    Persistent cache of probe results (wine version, which wine binary works with a prefix, etc.).
+    Each result is tied to the identity (inode, mtime and size) of the probed binary and to the inode of
+    the prefix, so updating the binary or recreating the prefix invalidates it.
+
+    :cache_filepath: (Optional) Path to the file where the cache is stored,
+                     defaults to probes.cache in the configuration directory.
+    """
+
+    _VERSION: int = 1
+
+    def __init__(self, cache_filepath: str | None = None):
+        self._cache_filepath: str = cache_filepath if cache_filepath \
+                                    else path.join(environ.get("WRUNNER_CONFIG_DIR") or getConfigDirectory(), "probes.cache")
+
+        # Format is { (kind, binary_path, prefix_path): (identity, value) }
+        self._entries: Dict[Tuple[str, str, str], Tuple[Identity, Any]] = self._load()
+
+
+    def _load(self) -> Dict[Tuple[str, str, str], Tuple[Identity, Any]]:
+        """
+        _load
+
+        Loads the cache stored on disk.
+
+        :return: The stored entries, or an empty dictionary if there's no usable cache.
+        """
+
+        try:
+            with open(self._cache_filepath, "rb") as fp:
+                version, entries = load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+
+        return entries if version == self._VERSION and isinstance(entries, dict) else {}
+
+
+    def _save(self) -> None:
+        """
+        _save
+
+        Atomically writes the cache to disk.
+
+        :return:
+        """
+
+        tmp_filepath: str = f"{self._cache_filepath}.{getpid()}.tmp"
+
+        try:
+            with open(tmp_filepath, "wb") as fp:
+                dump((self._VERSION, self._entries), fp)
+
+            replace(tmp_filepath, self._cache_filepath)
+        except (OSError, ValueError):
+            pass
+
+
+    @staticmethod
+    def _identity(binary: str, prefix: str | None) -> Identity | None:
+        """
+        _identity
+
+        :binary: Path to the probed binary.
+        :prefix: (Optional) Path to the prefix the probe depends on.
+        :return: The identity of the binary and the prefix, or None if either doesn't exist.
+        """
+
+        try:
+            st: stat_result = stat(binary)
+            prefix_inode: int = stat(prefix).st_ino if prefix else 0
+        except OSError:
+            return None
+
+        return (st.st_ino, st.st_mtime_ns, st.st_size, prefix_inode)
+
+
+    def get(self, kind: str, binary: str, prefix: str | None = None) -> Any | None:
+        """
+        get
+
+        :kind: Kind of the probe.
+        :binary: Path to the probed binary.
+        :prefix: (Optional) Path to the prefix the probe depends on.
+        :return: The cached result or None if there's none or the binary or prefix changed.
+        """
+
+        entry: Tuple[Identity, Any] | None = self._entries.get((kind, binary, prefix or ""))
+
+        if not entry or entry[0] != self._identity(binary, prefix): return None
+
+        return entry[1]
+
+
+    def set(self, kind: str, binary: str, value: Any, prefix: str | None = None) -> None:
+        """
+        set
+
+        Stores the result of a probe, nothing is stored if the binary or the prefix doesn't exist.
+
+        :kind: Kind of the probe.
+        :binary: Path to the probed binary.
+        :value: Result of the probe, must be serializable by marshal.
+        :prefix: (Optional) Path to the prefix the probe depends on.
+        :return:
+        """
+
+        identity: Identity | None = self._identity(binary, prefix)
+
+        if not identity: return
+
+        self._entries[(kind, binary, prefix or "")] = (identity, value)
+        self._save()
+
+
+    def getResolved(self, name: str, search_path: str) -> str | None:
+        """
+        getResolved
+
+        :name: Command name.
+        :search_path: The PATH the command was looked up in.
+        :return: The binary the command resolved to, or None if there's none or the binary changed.
+        """
+
+        entry: Tuple[Identity, Any] | None = self._entries.get(("which", name, search_path))
+
+        if not entry or entry[0] != self._identity(entry[1], None): return None
+
+        return entry[1]
+
+
+    def setResolved(self, name: str, search_path: str, binary: str) -> None:
+        """
+        setResolved
+
+        Stores the binary a command name resolved to in PATH.
+
+        :name: Command name.
+        :search_path: The PATH the command was looked up in.
+        :binary: Path to the binary.
+        :return:
+        """
+
+        identity: Identity | None = self._identity(binary, None)
+
+        if not identity: return
+
+        self._entries[("which", name, search_path)] = (identity, binary)
+        self._save()
+
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        """
+        invalidate
+
+        Drops the cached results.
+
+        :prefix: (Optional) Only drops the results depending on this prefix, drops everything if not provided.
+        :return:
+        """
+
+        self._entries = {k: v for k, v in self._entries.items() if prefix and k[2] != prefix}
+        self._save()
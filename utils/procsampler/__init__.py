@@ -0,0 +1 @@
+from utils.procsampler.procsampler import ProcessSampler, getSamplesFilepaths, loadSamples, summarizeSamples, writeSamplesCSV
@@ -0,0 +1,428 @@
+from marshal import dump, load
+from os import O_RDONLY, close, environ, getpid, listdir, makedirs, path, pread, readlink, remove, replace, sysconf
+from os import open as osopen
+from threading import Event, Thread
+from time import monotonic, strftime, time
+from typing import TYPE_CHECKING, Any, Dict, List, Set, TextIO, Tuple
+from utils.parser.repair import getConfigDirectory
+from utils.wineserver import getServerDirectory
+
+# array is imported on use, the annotations only need it for type checkers.
+if TYPE_CHECKING: from array import array
+
+
+# Format is { column: array_typecode }, every sample is one row of these columns.
+COLUMNS: Dict[str, str] = {
+    "time": "d",
+    "pid": "i",
+    "cpu_ticks": "Q",
+    "rss_kib": "Q",
+    "read_bytes": "Q",
+    "write_bytes": "Q",
+}
+
+# Format is { column: samples }, an array of the column's typecode each.
+SampleColumns = Dict[str, "array"]
+
+_VERSION: int = 1
+
+# Number of sample files kept per profile.
+_KEEP_SESSIONS: int = 10
+
+
+def _parseStat(data: bytes) -> Tuple[str, int, int]:
+    """
+    _parseStat
+
+    Parses /proc/<pid>/stat, the process name can have spaces and parentheses so it's delimited by the last ")".
+
+    :data: The content of the file.
+    :return: The process name, its parent pid and the user plus system CPU time in clock ticks.
+    """
+
+    name_end: int = data.rfind(b")")
+    fields: List[bytes] = data[name_end + 2:].split()
+
+    return data[data.find(b"(") + 1:name_end].decode(errors = "replace"), int(fields[1]), int(fields[11]) + int(fields[12])
+
+
+def _parseIO(data: bytes) -> Tuple[int, int]:
+    """
+    _parseIO
+
+    Parses /proc/<pid>/io.
+
+    :data: The content of the file.
+    :return: The bytes read from and written to the storage.
+    """
+
+    read_bytes: int = 0
+    write_bytes: int = 0
+
+    for line in data.splitlines():
+        if line.startswith(b"read_bytes:"): read_bytes = int(line[11:])
+        elif line.startswith(b"write_bytes:"): write_bytes = int(line[12:])
+
+    return read_bytes, write_bytes
+
+
+class ProcessSampler:
+    """
+    ProcessSampler
+
+    Samples the CPU time, resident memory and storage I/O of a launched command's process tree while it runs,
+    including the prefix's wineserver, which isn't a descendant once it daemonizes.
+    The /proc files of each process are opened once when it shows up and read with pread on every sample,
+    the tree is only walked again every rescan_interval seconds.
+    Samples are kept in array columns and saved in a marshal file when the sampler stops.
+
+    :profile_id: Application's profile id.
+    :prefix: Path to the wine prefix, used to find its wineserver.
+    :interval: Seconds between samples.
+    :rescan_interval: (Optional) Seconds between walks of the process tree, defaults to 2 seconds.
+    :samples_directory: (Optional) Directory of the sample files, defaults to history in the configuration directory.
+    """
+
+    def __init__(
+        self,
+        profile_id: str,
+        prefix: str,
+        interval: float,
+        rescan_interval: float = 2.0,
+        samples_directory: str | None = None
+    ):
+        # Only needed when sampling, launches without sampling never load array.
+        from array import array
+
+        self._profile_id: str                                   = profile_id
+        self._interval: float                                   = interval
+        self._rescan_interval: float                            = max(interval, rescan_interval)
+        self._samples_directory: str                            = samples_directory if samples_directory \
+                                                                  else path.join(environ.get("WRUNNER_CONFIG_DIR") or getConfigDirectory(), "history")
+        self._wineserver_directory: str | None                  = getServerDirectory(prefix)
+        self._columns: SampleColumns                            = {column: array(typecode) for column, typecode in COLUMNS.items()}
+        self._names: Dict[int, str]                             = {}
+        # Format is { pid: (stat_fd, statm_fd, io_fd) }, io_fd is -1 if it can't be read.
+        self._fds: Dict[int, Tuple[int, int, int]]              = {}
+        self._root_pid: int                                     = 0
+        self._start: float                                      = 0.0
+        self._started_at: int                                   = 0
+        self._page_kib: int                                     = sysconf("SC_PAGE_SIZE") // 1024
+        self._stop: Event                                       = Event()
+        self._thread: Thread                                    = Thread(target = self._run, daemon = True)
+
+
+    def _rescan(self) -> None:
+        """
+        _rescan
+
+        Walks /proc for the descendants of the launched command and of the prefix's wineserver,
+        opening the files of the processes that weren't tracked yet.
+
+        :return:
+        """
+
+        # Format is { ppid: [pid] }
+        children: Dict[int, List[int]] = {}
+        roots: List[int] = [self._root_pid]
+
+        for entry in listdir("/proc"):
+            if not entry.isdigit(): continue
+
+            pid: int = int(entry)
+
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as fp:
+                    name, ppid, _ = _parseStat(fp.read())
+            except (OSError, ValueError, IndexError):
+                continue
+
+            children.setdefault(ppid, []).append(pid)
+
+            if name != "wineserver" or not self._wineserver_directory: continue
+
+            try:
+                if readlink(f"/proc/{pid}/cwd") == self._wineserver_directory: roots.append(pid)
+            except OSError:
+                pass
+
+        tree: Set[int] = set()
+
+        while roots:
+            pid: int = roots.pop()
+
+            if pid in tree: continue
+
+            tree.add(pid)
+            roots.extend(children.get(pid, []))
+
+        for pid in tree - self._fds.keys():
+            try:
+                stat_fd: int = osopen(f"/proc/{pid}/stat", O_RDONLY)
+            except OSError:
+                continue
+
+            try:
+                statm_fd: int = osopen(f"/proc/{pid}/statm", O_RDONLY)
+            except OSError:
+                close(stat_fd)
+
+                continue
+
+            try:
+                io_fd: int = osopen(f"/proc/{pid}/io", O_RDONLY)
+            except OSError:
+                io_fd = -1
+
+            self._fds[pid] = (stat_fd, statm_fd, io_fd)
+
+
+    def _untrack(self, pid: int) -> None:
+        """
+        _untrack
+
+        Closes the files of a process.
+
+        :pid: Process id.
+        :return:
+        """
+
+        for fd in self._fds.pop(pid):
+            if fd != -1: close(fd)
+
+
+    def _sample(self) -> None:
+        """
+        _sample
+
+        Reads the tracked processes' files, untracking the ones that exited.
+
+        :return:
+        """
+
+        now: float = monotonic() - self._start
+
+        for pid, (stat_fd, statm_fd, io_fd) in list(self._fds.items()):
+            try:
+                name, _, cpu_ticks = _parseStat(pread(stat_fd, 1024, 0))
+                rss_pages: int = int(pread(statm_fd, 256, 0).split()[1])
+                read_bytes, write_bytes = _parseIO(pread(io_fd, 512, 0)) if io_fd != -1 else (0, 0)
+            except (OSError, ValueError, IndexError):
+                self._untrack(pid)
+
+                continue
+
+            self._names[pid] = name
+            self._columns["time"].append(now)
+            self._columns["pid"].append(pid)
+            self._columns["cpu_ticks"].append(cpu_ticks)
+            self._columns["rss_kib"].append(rss_pages * self._page_kib)
+            self._columns["read_bytes"].append(read_bytes)
+            self._columns["write_bytes"].append(write_bytes)
+
+
+    def _run(self) -> None:
+        """
+        _run
+
+        Sampler thread.
+
+        :return:
+        """
+
+        next_rescan: float = 0.0
+
+        while True:
+            if monotonic() >= next_rescan:
+                self._rescan()
+                next_rescan = monotonic() + self._rescan_interval
+
+            self._sample()
+
+            if self._stop.wait(self._interval): return
+
+
+    def start(self, root_pid: int) -> None:
+        """
+        start
+
+        Starts sampling the process tree of the launched command.
+
+        :root_pid: Process id of the launched command.
+        :return:
+        """
+
+        self._root_pid = root_pid
+        self._start = monotonic()
+        self._started_at = int(time())
+        self._thread.start()
+
+
+    def stop(self) -> str | None:
+        """
+        stop
+
+        Stops sampling and saves the samples.
+
+        :return: The path to the sample file or None if nothing was sampled or it couldn't be saved.
+        """
+
+        if not self._thread.is_alive(): return None
+
+        self._stop.set()
+        self._thread.join()
+
+        for pid in list(self._fds): self._untrack(pid)
+
+        if not self._columns["time"]: return None
+
+        filepath: str = path.join(self._samples_directory, f"{self._profile_id}.{strftime('%Y%m%d-%H%M%S')}-{getpid()}.samples")
+        meta: Dict[str, Any] = {
+            "interval": self._interval,
+            "clock_ticks": sysconf("SC_CLK_TCK"),
+            "started_at": self._started_at,
+            "names": self._names
+        }
+
+        try:
+            makedirs(self._samples_directory, exist_ok = True)
+
+            with open(f"{filepath}.tmp", "wb") as fp:
+                dump((_VERSION, meta, {column: values.tobytes() for column, values in self._columns.items()}), fp)
+
+            replace(f"{filepath}.tmp", filepath)
+        except OSError:
+            return None
+
+        for old_filepath in getSamplesFilepaths(self._profile_id, self._samples_directory)[:-_KEEP_SESSIONS]:
+            try:
+                remove(old_filepath)
+            except OSError:
+                pass
+
+        return filepath
+
+
+def getSamplesFilepaths(profile_id: str, samples_directory: str | None = None) -> List[str]:
+    """
+    getSamplesFilepaths
+
+    :profile_id: Application's profile id.
+    :samples_directory: (Optional) Directory of the sample files, defaults to history in the configuration directory.
+    :return: The sample files of the profile from the oldest to the newest.
+    """
+
+    directory: str = samples_directory if samples_directory \
+                     else path.join(environ.get("WRUNNER_CONFIG_DIR") or getConfigDirectory(), "history")
+
+    try:
+        files: List[str] = listdir(directory)
+    except OSError:
+        return []
+
+    # Files are named <profile_id>.<timestamp>-<pid>.samples, profile ids may have dots but timestamps don't,
+    # so the id is compared as a whole, otherwise the samples of "foo.bar" would be listed as samples of "foo".
+    return [path.join(directory, f) for f in sorted(files) if f.endswith(".samples") and f.rsplit(".", 2)[0] == profile_id]
+
+
+def loadSamples(filepath: str) -> Tuple[Dict[str, Any], SampleColumns]:
+    """
+    loadSamples
+
+    Loads a sample file.
+
+    :filepath: Path to the sample file.
+    :return: The session's metadata and the sample columns.
+    """
+
+    with open(filepath, "rb") as fp:
+        version, meta, raw_columns = load(fp)
+
+    if version != _VERSION: raise ValueError(f"Unsupported samples file version: {version}")
+
+    # Only needed by the samples verb.
+    from array import array
+
+    columns: SampleColumns = {}
+
+    for column, typecode in COLUMNS.items():
+        columns[column] = array(typecode)
+        columns[column].frombytes(raw_columns[column])
+
+    return meta, columns
+
+
+def summarizeSamples(meta: Dict[str, Any], columns: SampleColumns) -> str:
+    """
+    summarizeSamples
+
+    Summarizes the samples per process name: CPU time, average and peak CPU usage,
+    peak and growth of the resident memory and storage I/O.
+
+    :meta: The session's metadata.
+    :columns: The sample columns.
+    :return: The summary.
+    """
+
+    clock_ticks: int = meta["clock_ticks"]
+    # Format is { pid: [row] }
+    rows: Dict[int, List[int]] = {}
+
+    for row, pid in enumerate(columns["pid"]): rows.setdefault(pid, []).append(row)
+
+    # Format is { name: [pids, cpu_seconds, alive_seconds, peak_cpu_percent, peak_rss_kib, rss_growth_kib, read_bytes, written_bytes] }
+    summary: Dict[str, List[float]] = {}
+
+    for pid, pid_rows in rows.items():
+        first: int = pid_rows[0]
+        last: int = pid_rows[-1]
+        entry: List[float] = summary.setdefault(meta["names"].get(pid, str(pid)), [0, 0.0, 0.0, 0.0, 0, 0, 0, 0])
+        times: array = columns["time"]
+        ticks: array = columns["cpu_ticks"]
+
+        entry[0] += 1
+        entry[1] += (ticks[last] - ticks[first]) / clock_ticks
+        entry[2] += times[last] - times[first]
+        entry[4] = max(entry[4], max(columns["rss_kib"][row] for row in pid_rows))
+        entry[5] += columns["rss_kib"][last] - columns["rss_kib"][first]
+        entry[6] += columns["read_bytes"][last] - columns["read_bytes"][first]
+        entry[7] += columns["write_bytes"][last] - columns["write_bytes"][first]
+
+        for previous, current in zip(pid_rows, pid_rows[1:]):
+            elapsed: float = times[current] - times[previous]
+
+            if elapsed > 0: entry[3] = max(entry[3], (ticks[current] - ticks[previous]) / clock_ticks / elapsed * 100)
+
+    lines: List[str] = [
+        f"{'process':<16}{'pids':>5}{'cpu':>10}{'avg cpu':>9}{'peak cpu':>10}{'peak rss':>11}{'rss growth':>12}{'read':>10}{'written':>10}"
+    ]
+
+    for name, (pids, cpu, alive, peak_cpu, peak_rss, rss_growth, read, written) in sorted(summary.items(), key = lambda item: -item[1][1]):
+        lines.append(
+            f"{name[:15]:<16}{pids:>5}{cpu:>9.1f}s{(cpu / alive * 100 if alive else 0):>8.0f}%{peak_cpu:>9.0f}%"
+            f"{peak_rss / 1024:>8.0f}MiB{rss_growth / 1024:>+9.0f}MiB{read / (1 << 20):>7.0f}MiB{written / (1 << 20):>7.0f}MiB"
+        )
+
+    return "\n".join(lines)
+
+
+def writeSamplesCSV(meta: Dict[str, Any], columns: SampleColumns, fp: TextIO) -> None:
+    """
+    writeSamplesCSV
+
+    Writes the samples as CSV, one row per process and sample.
+
+    :meta: The session's metadata.
+    :columns: The sample columns.
+    :fp: Text file the CSV is written to.
+    :return:
+    """
+
+    # Only needed when exporting.
+    from csv import writer
+
+    csv = writer(fp)
+    csv.writerow(["time", "pid", "name", "cpu_seconds", "rss_kib", "read_bytes", "write_bytes"])
+
+    for time_, pid, cpu_ticks, rss_kib, read_bytes, write_bytes in zip(*[columns[column] for column in COLUMNS]):
+        csv.writerow([f"{time_:.3f}", pid, meta["names"].get(pid, ""), f"{cpu_ticks / meta['clock_ticks']:.2f}", rss_kib, read_bytes, write_bytes])
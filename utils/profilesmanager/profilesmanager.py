@@ -1,10 +1,37 @@
-from typing import Any, Callable, Dict, List, NoReturn
-from utils.funcs import die
+from contextlib import nullcontext
+from sys import stderr
+from time import monotonic
+from typing import Any, Callable, Dict, List, NoReturn, Tuple
+from utils.funcs import die, handleExceptionIfAny, _print
+from utils.tracer import tracer
 from utils.parser import Parser
+from utils.probecache import ProbeCache
 from utils.parser import ArgumentTypeError, Namespace, WRArgumentParser, RawTextHelpFormatter
 from handlers import UMUHandler, WineHandler
 
 
+# Verbs running several wine commands in a row, they share a single wineserver.
+_SESSION_VERBS: List[str] = [
+    "install-dxvk",
+    "uninstall-dxvk",
+    "install-dxvk-nvapi",
+    "uninstall-dxvk-nvapi",
+    "install-gallium-nine",
+    "uninstall-gallium-nine"
+]
+
+# Verbs only reading the launch history, they're answered without setting up a handler when run alone.
+_HISTORY_VERBS: List[str] = ["stats", "samples"]
+
+# Options launching something, at most one of them runs after the verbs, the first one provided in this order.
+_LAUNCH_ARGS: List[str] = ["--run", "--runinprefix", "--waitforexitandrun", "--winetricks"]
+
+# Format is (name, function), a verb or launch run by _callMappedFunction.
+Step = Tuple[str, Callable[[], Any]]
+
+# Format is (seconds, status), how a step went.
+StepResult = Tuple[float | None, str]
+
 class ProfilesManager(Parser):
     """
     Manages the profiles of the applications creating the appropriate handler.
@@ -19,21 +46,23 @@ class ProfilesManager(Parser):
         self._remainder: List[str]
 
         # Configure the arguments parser.
-        self._wr_arg_parser: WRArgumentParser = WRArgumentParser(add_help=False)
+        with tracer.phase("WRArgumentParser pre-parse"):
+            self._wr_arg_parser: WRArgumentParser = WRArgumentParser(add_help=False)
 
-        self._wr_arg_parser.compilePreArgumentsParser()
+            self._wr_arg_parser.compilePreArgumentsParser()
 
-        self._namespace, self._remainder = self._wr_arg_parser.parse_known_args()
+            self._namespace, self._remainder = self._wr_arg_parser.parse_known_args()
 
         # Check if any pre argument was provided
         self._preArgumentParse()
 
         # If not, parse the rest of the arguments
-        self._wr_arg_parser = WRArgumentParser(formatter_class = RawTextHelpFormatter)
+        with tracer.phase("WRArgumentParser full parse"):
+            self._wr_arg_parser = WRArgumentParser(formatter_class = RawTextHelpFormatter)
 
-        self._wr_arg_parser.compilePosArgumentsParser()
+            self._wr_arg_parser.compilePosArgumentsParser()
 
-        self._namespace = self._wr_arg_parser.parse_args(self._remainder)
+            self._namespace = self._wr_arg_parser.parse_args(self._remainder)
 
         # Check if at least one optional was provied.
         try:
@@ -45,9 +74,9 @@ class ProfilesManager(Parser):
         # Only at this stage that the profile id is available
         self._profileIdFunctions()
 
-        handler: UMUHandler | WineHandler = self._getHandler()
+        self._handler: UMUHandler | WineHandler = self._getHandler()
 
-        self._mapped_functions: Dict[str, Callable[..., Any]] = self._createMappedFunctions(handler, self._namespace)
+        self._mapped_functions: Dict[str, Callable[..., Any]] = self._createMappedFunctions(self._handler, self._namespace)
 
         try:
             # Call the mapped function if any argument provided is currently mapped
@@ -72,6 +101,7 @@ class ProfilesManager(Parser):
         mapped_functions: Dict[str, Callable[..., Any]] = {
             "init": handler.initWinePrefix,
             "kill-all": handler.killAll,
+            "ps": handler.ps,
             "init": handler.initWinePrefix,
             "winecfg": handler.winecfg,
             "config": handler.winecfg,
@@ -85,6 +115,9 @@ class ProfilesManager(Parser):
             "uninstall-dxvk-nvapi": handler.uninstallDXVKNVAPI,
             "install-gallium-nine": handler.installGalliumNine,
             "uninstall-gallium-nine": handler.uninstallGalliumNine,
+            "prewarm": handler.prewarm,
+            "stats": lambda: _print(ProfilesManager._summarizeHistory(handler.getProfileId())),
+            "samples": lambda: _print(ProfilesManager._summarizeLastSamples(handler.getProfileId())),
             "--run": lambda args = None: \
                 handler.runExe("run", args) \
                 if namespace.run else handler.runExe(mode="run"),
@@ -111,9 +144,54 @@ class ProfilesManager(Parser):
         """
 
         profile_id: str = self._namespace.profile_id[0]
+        verbs: List[str] = self._namespace.verb
 
         if self._namespace.list_aliases: die(self.listAliases(profile_id), 0)
 
+        # Only read the launch history, so there's no need to set up a handler.
+        if not verbs or any(verb not in _HISTORY_VERBS for verb in verbs): return
+
+        if profile_id not in self.getAllIDs(): die(f"Application with profile id \"{profile_id}\" not found.")
+
+        die("\n\n".join(self._summarizeHistory(profile_id) if verb == "stats" else self._summarizeLastSamples(profile_id) \
+                        for verb in verbs), 0)
+
+
+    @staticmethod
+    def _summarizeHistory(profile_id: str) -> str:
+        """
+        _summarizeHistory
+
+        :profile_id: Application's profile id.
+        :return: The summary of the launch history of the profile.
+        """
+
+        # Only needed for stats.
+        from utils.launchhistory import LaunchHistory
+
+        return LaunchHistory(profile_id).summarize()
+
+
+    @staticmethod
+    def _summarizeLastSamples(profile_id: str) -> str:
+        """
+        _summarizeLastSamples
+
+        :profile_id: Application's profile id.
+        :return: The summary of the last sampled session of the profile.
+        """
+
+        # Only needed for samples.
+        from utils.procsampler import getSamplesFilepaths, loadSamples, summarizeSamples
+
+        samples_filepaths: List[str] = getSamplesFilepaths(profile_id)
+
+        if not samples_filepaths: return f"No sessions sampled for the profile \"{profile_id}\"."
+
+        meta, columns = handleExceptionIfAny(f"Failed to load the samples {samples_filepaths[-1]}", True, loadSamples, samples_filepaths[-1])
+
+        return f"{samples_filepaths[-1]}\n\n{summarizeSamples(meta, columns)}"
+
 
     def _preArgumentParse(self) -> None | NoReturn:
         """
@@ -128,45 +206,133 @@ class ProfilesManager(Parser):
         if self._namespace.show_verbs: die(f"{self._wr_arg_parser.getVerbHelp()}", 0)
         if self._namespace.show_optional_args: die(f"{self._wr_arg_parser.getOptionalArgumentHelp()}", 0)
 
+        if self._namespace.show_topology:
+            # Only needed for --show-topology.
+            from utils.scheduling.topology import CPUTopology
 
-    def _callMappedFunction(self) -> None:
+            die(CPUTopology().describe(), 0)
+
+        if self._namespace.refresh_probes:
+            ProbeCache().invalidate()
+
+            if not self._remainder: die("Probes cache cleared.", 0)
+
+
+    def _getSteps(self) -> List[Step]:
         """
-        Calls the function mapped to the verb.
+        _getSteps
+
+        :return: The verbs in the order they were provided, followed by the launch if any.
+        """
+
+        steps: List[Step] = [(verb, self._mapped_functions[verb]) for verb in self._namespace.verb]
+
+        for name in _LAUNCH_ARGS:
+            args: List[str] | None = vars(self._namespace)[name[2:]]
 
+            if args is None: continue
+
+            steps.append((name, lambda name = name, args = args: self._mapped_functions[name](args)))
+
+            break
+
+        return steps
+
+
+    @staticmethod
+    def _summarizeSteps(steps: List[Step], results: List[StepResult], total: float) -> str:
+        """
+        _summarizeSteps
+
+        :steps: The steps of the invocation.
+        :results: How each step that was run went, in the same order.
+        :total: Seconds since the first step, the wineserver session's start included.
+        :return: The summary, one line per step.
+        """
+
+        lines: List[str] = []
+
+        for i, (name, _) in enumerate(steps):
+            seconds, status = results[i] if i < len(results) else (None, "skipped")
+
+            lines.append(f"{name:<24}{f'{seconds:.2f}s' if seconds is not None else '-':>10}  {status}")
+
+        lines.append(f"{'total':<24}{f'{total:.2f}s':>10}")
+
+        return "\n".join(lines)
+
+
+    def _runSteps(self, steps: List[Step]) -> None:
+        """
+        _runSteps
+
+        Runs the steps in order on the same handler, sharing a single wineserver, and summarizes them.
+        A launch ending the steps keeps the wineserver, so it isn't killed with the session.
+        A failed step stops the ones after it.
+
+        :steps: The steps to be run.
         :return:
         """
 
-        verb: str | None = self._namespace.verb
-        run: List[str] | None = self._namespace.run
-        runinprefix: List[str] | None = self._namespace.runinprefix
-        waitforexitandrun: List[str] | None = self._namespace.waitforexitandrun
-        winetricks: List[str] | None = self._namespace.winetricks
+        results: List[StepResult] = []
+        start: float = monotonic()
+        launch: bool = steps[-1][0] in _LAUNCH_ARGS[:3]
 
-        if verb != None:
-            self._mapped_functions[verb]()
+        with self._handler.wineserverSession(shared = True, keep = launch):
+            for name, function in steps:
+                # wrunner is replaced by the application, so there's nothing left to summarize afterwards.
+                if name in _LAUNCH_ARGS[:3] and self._handler.isExecReplaced(name[2:]):
+                    results.append((None, "replaces wrunner"))
+                    _print(self._summarizeSteps(steps, results, monotonic() - start))
+                    function()
 
-            return
+                    return
 
-        if run != None:
-            self._mapped_functions["--run"](run)
+                step_start: float = monotonic()
+                status: str = "failed"
 
-            return
+                try:
+                    with tracer.phase(f"step {name}"):
+                        function()
 
-        if runinprefix != None:
-            self._mapped_functions["--runinprefix"](runinprefix)
+                    status = "done"
+                except SystemExit as e:
+                    status = "failed" if e.code else "done"
 
-            return
+                    raise
+                except KeyboardInterrupt:
+                    status = "interrupted"
 
-        if self._namespace.waitforexitandrun != None:
-            self._mapped_functions["--waitforexitandrun"](waitforexitandrun)
+                    raise
+                finally:
+                    results.append((monotonic() - step_start, status))
 
-            return
+                    if status != "done": _print(self._summarizeSteps(steps, results, monotonic() - start), stderr)
 
-        if winetricks != None:
-            self._mapped_functions["--winetricks"](winetricks)
+        _print(self._summarizeSteps(steps, results, monotonic() - start))
+
+
+    def _callMappedFunction(self) -> None:
+        """
+        Calls the functions mapped to the verbs, then the one mapped to the launch.
+
+        :return:
+        """
+
+        steps: List[Step] = self._getSteps()
+
+        if not steps: return
+
+        if len(steps) > 1:
+            self._runSteps(steps)
 
             return
 
+        name, function = steps[0]
+
+        with self._handler.wineserverSession() if name in _SESSION_VERBS else nullcontext():
+            function()
+
 
     def _getHandler(self) -> UMUHandler | WineHandler:
         """
@@ -183,7 +349,12 @@ class ProfilesManager(Parser):
         default_runner: str | None = None if not self._namespace.use_wine and not self._namespace.use_umu \
             else "wine" if self._namespace.use_wine else "umu"
 
-        handler: UMUHandler | WineHandler | None = self.createHandlers(profile_id, default_runner)
+        handler: UMUHandler | WineHandler | None = self.createHandlers(
+            profile_id,
+            default_runner,
+            "exec" if self._namespace.exec else None,
+            self._namespace.dry_run
+        )
 
         return handler if handler else die(f"Application with profile id \"{profile_id}\" not found.")
 
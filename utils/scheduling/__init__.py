@@ -0,0 +1 @@
+from utils.scheduling.scheduling import Scheduling, formatCPUList, parseCPUList, IO_CLASSES, POLICIES
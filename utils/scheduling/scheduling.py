@@ -0,0 +1,216 @@
+from os import PRIO_PROCESS, SCHED_BATCH, SCHED_IDLE, SCHED_OTHER, getpriority, sched_getaffinity, sched_param
+from os import sched_setaffinity, sched_setscheduler, setpriority, uname
+from typing import Callable, Dict, List, Set
+
+
+# Format is { "io_class": ioprio_class }
+IO_CLASSES: Dict[str, int] = {"realtime": 1, "best-effort": 2, "idle": 3}
+
+# Format is { "policy": scheduling_policy }
+POLICIES: Dict[str, int] = {"other": SCHED_OTHER, "batch": SCHED_BATCH, "idle": SCHED_IDLE}
+
+# Format is { machine: ioprio_set_syscall_number }, ioprio_set has no wrapper in Python nor in libc.
+_IOPRIO_SET_SYSCALLS: Dict[str, int] = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "riscv64": 30,
+    "armv7l": 314,
+    "ppc64le": 273,
+}
+
+_IOPRIO_WHO_PROCESS: int = 1
+_IOPRIO_CLASS_SHIFT: int = 13
+
+
+def parseCPUList(value: str | List[int]) -> Set[int] | None:
+    """
+    parseCPUList
+
+    Parses a list of CPUs.
+
+    :value: A list of CPU numbers or a string in the kernel's cpulist format (e.g. "0-7,16-23").
+    :return: The set of CPUs or None if it's malformed.
+    """
+
+    if isinstance(value, list):
+        return set(value) if value and all(isinstance(cpu, int) and cpu >= 0 for cpu in value) else None
+
+    cpus: Set[int] = set()
+
+    for part in value.split(","):
+        first, _, last = part.strip().partition("-")
+
+        if not first.isdigit() or (last and not last.isdigit()): return None
+
+        cpus.update(range(int(first), int(last if last else first) + 1))
+
+    return cpus if cpus else None
+
+
+class Scheduling:
+    """
+    Scheduling
+
+    CPU affinity, nice value, I/O priority and scheduling policy applied to a launched command before it's executed,
+    so every process wine spawns afterwards inherits them.
+    Settings the process isn't allowed to apply (e.g. a lower nice without privileges) are skipped.
+
+    :affinity: (Optional) CPUs the command may run on, or "auto" for the best core group of the CPU's topology.
+    :nice: (Optional) Nice value, from -20 to 19.
+    :io_class: (Optional) I/O scheduling class, "realtime", "best-effort" or "idle".
+    :io_priority: (Optional) I/O priority within the class, from 0 (highest) to 7, defaults to 4.
+    :policy: (Optional) CPU scheduling policy, "other", "batch" or "idle".
+    """
+
+    def __init__(
+        self,
+        affinity: Set[int] | str | None = None,
+        nice: int | None = None,
+        io_class: str | None = None,
+        io_priority: int | None = None,
+        policy: str | None = None
+    ):
+        self._auto_affinity: bool               = affinity == "auto"
+        self._requested_affinity: Set[int]      = self._getAutoAffinity() if affinity == "auto" \
+                                                  else affinity if isinstance(affinity, set) else set()
+        self._affinity: Set[int] | None         = self._requested_affinity & sched_getaffinity(0) if self._requested_affinity else None
+        self._nice: int | None                  = nice
+        self._io_class: str | None              = io_class
+        self._io_priority: int                  = io_priority if io_priority is not None else 4
+        self._policy: str | None                = policy
+        self._ioprio_set: Callable[..., int] | None = self._getIOPrioSet() if io_class else None
+
+
+    @staticmethod
+    def _getAutoAffinity() -> Set[int]:
+        """
+        _getAutoAffinity
+
+        :return: The allowed CPUs of the best core group, empty if the topology is unknown.
+        """
+
+        # Only needed when affinity is "auto".
+        from utils.scheduling.topology import CPUTopology
+
+        return CPUTopology().getBestCPUs(sched_getaffinity(0)) or set()
+
+
+    @staticmethod
+    def _getIOPrioSet() -> Callable[..., int] | None:
+        """
+        _getIOPrioSet
+
+        Resolves the syscall function in the parent, so the child only has to call it.
+
+        :return: A callable taking the ioprio_set syscall arguments or None if the architecture isn't known.
+        """
+
+        syscall_number: int | None = _IOPRIO_SET_SYSCALLS.get(uname().machine)
+
+        if syscall_number is None: return None
+
+        # Only needed when an I/O class is set.
+        from ctypes import CDLL
+
+        syscall: Callable[..., int] = CDLL(None, use_errno = True).syscall
+
+        return lambda which, who, ioprio: syscall(syscall_number, which, who, ioprio)
+
+
+    def apply(self) -> None:
+        """
+        apply
+
+        Applies the settings to the current process, meant to run in the child between fork and exec.
+
+        :return:
+        """
+
+        if self._affinity:
+            try:
+                sched_setaffinity(0, self._affinity)
+            except OSError:
+                pass
+
+        if self._policy:
+            try:
+                sched_setscheduler(0, POLICIES[self._policy], sched_param(0))
+            except OSError:
+                pass
+
+        if self._nice is not None:
+            try:
+                setpriority(PRIO_PROCESS, 0, self._nice)
+            except OSError:
+                pass
+
+        if self._ioprio_set and self._io_class:
+            self._ioprio_set(_IOPRIO_WHO_PROCESS, 0, IO_CLASSES[self._io_class] << _IOPRIO_CLASS_SHIFT | self._io_priority)
+
+
+    def getAffinity(self) -> Set[int] | None:
+        """
+        getAffinity
+
+        :return: The CPUs the command will run on, or None if the affinity isn't changed.
+        """
+
+        return self._affinity
+
+
+    def describe(self) -> str:
+        """
+        describe
+
+        Describes the effective settings, pointing out the ones that won't be applied.
+
+        :return: The description.
+        """
+
+        lines: List[str] = []
+
+        if self._auto_affinity and not self._requested_affinity:
+            lines.append("affinity: unchanged, the CPU topology couldn't be read")
+
+        if self._requested_affinity:
+            dropped: Set[int] = self._requested_affinity - (self._affinity or set())
+            lines.append(f"affinity: {formatCPUList(self._affinity) if self._affinity else 'unchanged, none of the CPUs is available'}" \
+                         + (f" ({formatCPUList(dropped)} not available)" if dropped and self._affinity else "") \
+                         + (" (auto)" if self._auto_affinity else ""))
+
+        if self._policy:
+            lines.append(f"policy: {self._policy}")
+
+        if self._nice is not None:
+            lines.append(f"nice: {self._nice}" \
+                         + (" (needs privileges to go below the current nice, it may be ignored)" if self._nice < getpriority(PRIO_PROCESS, 0) else ""))
+
+        if self._io_class:
+            lines.append(f"io: {self._io_class}" + (f", priority {self._io_priority}" if self._io_class != "idle" else "") \
+                         + (" (not supported on this architecture, ignored)" if not self._ioprio_set else "") \
+                         + (" (needs privileges, it may be ignored)" if self._io_class == "realtime" else ""))
+
+        return "\n".join(lines) if lines else "unchanged"
+
+
+def formatCPUList(cpus: Set[int]) -> str:
+    """
+    formatCPUList
+
+    :cpus: Set of CPUs.
+    :return: The CPUs in the kernel's cpulist format.
+    """
+
+    ranges: List[str] = []
+    sorted_cpus: List[int] = sorted(cpus)
+    first: int = sorted_cpus[0]
+
+    for previous, cpu in zip(sorted_cpus, sorted_cpus[1:] + [-1]):
+        if cpu == previous + 1: continue
+
+        ranges.append(f"{first}-{previous}" if previous != first else str(first))
+        first = cpu
+
+    return ",".join(ranges)
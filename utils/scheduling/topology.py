@@ -0,0 +1,216 @@
+from os import listdir, path
+from typing import Dict, List, Set, Tuple
+from utils.scheduling.scheduling import formatCPUList
+
+
+# Format is (cpus, cores, l3_size_bytes, max_frequency_khz), a set of CPUs sharing the same L3 and performance class.
+CoreGroup = Tuple[Set[int], int, int, int]
+
+# CPUs whose maximum frequency (or capacity) is below this fraction of the fastest CPU sharing their L3
+# are another class of cores, e.g. the E-cores of hybrid Intel CPUs.
+_PERFORMANCE_CLASS_RATIO: float = 0.85
+
+
+def _readCPUList(filepath: str) -> Set[int]:
+    """
+    _readCPUList
+
+    :filepath: Path to a sysfs file in the cpulist format.
+    :return: The set of CPUs, empty if the file can't be read or parsed.
+    """
+
+    cpus: Set[int] = set()
+
+    try:
+        with open(filepath) as fp:
+            value: str = fp.read().strip()
+    except OSError:
+        return cpus
+
+    for part in value.split(","):
+        first, _, last = part.partition("-")
+
+        if not first.isdigit() or (last and not last.isdigit()): continue
+
+        cpus.update(range(int(first), int(last if last else first) + 1))
+
+    return cpus
+
+
+def _readInt(filepath: str) -> int:
+    """
+    _readInt
+
+    :filepath: Path to a sysfs file holding a number, with a K suffix for sizes in KiB.
+    :return: The number or 0 if it can't be read.
+    """
+
+    try:
+        with open(filepath) as fp:
+            value: str = fp.read().strip()
+    except OSError:
+        return 0
+
+    multiplier: int = 1024 if value.endswith("K") else 1
+    value = value.removesuffix("K")
+
+    return int(value) * multiplier if value.isdigit() else 0
+
+
+class CPUTopology:
+    """
+    CPUTopology
+
+    Model of the CPUs built from sysfs: the SMT siblings of each core, the CPUs sharing each L3 cache and
+    the maximum frequency of each CPU (or its capacity when there's no cpufreq).
+    The CPUs are split into core groups sharing an L3 and a performance class, so each CCD of a multi-CCD
+    CPU is a group, and the P-cores and E-cores of a hybrid CPU are different groups.
+
+    :sysfs_root: (Optional) Directory with the cpuN directories, defaults to /sys/devices/system/cpu.
+    """
+
+    def __init__(self, sysfs_root: str = "/sys/devices/system/cpu"):
+        self._sysfs_root: str           = sysfs_root
+        self._groups: List[CoreGroup]   = self._buildGroups()
+
+
+    def _getOnlineCPUs(self) -> Set[int]:
+        """
+        _getOnlineCPUs
+
+        :return: The online CPUs, or every cpuN directory if the online file is missing.
+        """
+
+        online: Set[int] = _readCPUList(path.join(self._sysfs_root, "online"))
+
+        if online: return online
+
+        try:
+            entries: List[str] = listdir(self._sysfs_root)
+        except OSError:
+            return online
+
+        return {int(e[3:]) for e in entries if e.startswith("cpu") and e[3:].isdigit()}
+
+
+    def _getL3(self, cpu_directory: str) -> Tuple[str, int]:
+        """
+        _getL3
+
+        :cpu_directory: Path to the cpuN directory.
+        :return: The CPUs sharing the CPU's L3 in the cpulist format and its size in bytes,
+                 the package's CPUs and 0 if it has no L3.
+        """
+
+        cache_directory: str = path.join(cpu_directory, "cache")
+
+        try:
+            indexes: List[str] = sorted(e for e in listdir(cache_directory) if e.startswith("index"))
+        except OSError:
+            indexes = []
+
+        # index3 is the L3 on most CPUs, but the level file is what tells it.
+        for index in indexes:
+            if _readInt(path.join(cache_directory, index, "level")) != 3: continue
+
+            shared: Set[int] = _readCPUList(path.join(cache_directory, index, "shared_cpu_list"))
+
+            return ",".join(map(str, sorted(shared))), _readInt(path.join(cache_directory, index, "size"))
+
+        package: Set[int] = _readCPUList(path.join(cpu_directory, "topology", "package_cpus_list"))
+
+        return ",".join(map(str, sorted(package))), 0
+
+
+    def _buildGroups(self) -> List[CoreGroup]:
+        """
+        _buildGroups
+
+        Reads the topology of every online CPU and ranks the core groups.
+
+        :return: The core groups, the best one first.
+        """
+
+        # Format is { l3_cpus: (l3_size, [ (cpu, core, performance, max_frequency) ]) }
+        l3_domains: Dict[str, Tuple[int, List[Tuple[int, str, int, int]]]] = {}
+
+        for cpu in sorted(self._getOnlineCPUs()):
+            cpu_directory: str = path.join(self._sysfs_root, f"cpu{cpu}")
+
+            if not path.isdir(cpu_directory): continue
+
+            siblings: Set[int] = _readCPUList(path.join(cpu_directory, "topology", "thread_siblings_list"))
+            core: str = ",".join(map(str, sorted(siblings))) if siblings else str(cpu)
+            max_frequency: int = _readInt(path.join(cpu_directory, "cpufreq", "cpuinfo_max_freq"))
+            performance: int = max_frequency if max_frequency else _readInt(path.join(cpu_directory, "cpu_capacity"))
+            l3_cpus, l3_size = self._getL3(cpu_directory)
+
+            l3_domains.setdefault(l3_cpus, (l3_size, []))[1].append((cpu, core, performance, max_frequency))
+
+        groups: List[CoreGroup] = []
+
+        for l3_size, cpus in l3_domains.values():
+            fastest: int = max(performance for _, _, performance, _ in cpus)
+            fast: List[Tuple[int, str, int, int]] = [c for c in cpus if c[2] >= fastest * _PERFORMANCE_CLASS_RATIO]
+            slow: List[Tuple[int, str, int, int]] = [c for c in cpus if c[2] < fastest * _PERFORMANCE_CLASS_RATIO]
+
+            for members in [fast, slow]:
+                if not members: continue
+
+                groups.append((
+                    {cpu for cpu, _, _, _ in members},
+                    len({core for _, core, _, _ in members}),
+                    l3_size,
+                    max(max_frequency for _, _, _, max_frequency in members)
+                ))
+
+        # The biggest L3 first (e.g. the 3D V-Cache CCD), then the fastest cores, then the most cores.
+        return sorted(groups, key = lambda g: (-g[2], -g[3], -g[1], min(g[0])))
+
+
+    def getGroups(self) -> List[CoreGroup]:
+        """
+        getGroups
+
+        :return: The core groups, the best one first.
+        """
+
+        return self._groups
+
+
+    def getBestCPUs(self, allowed: Set[int]) -> Set[int] | None:
+        """
+        getBestCPUs
+
+        :allowed: CPUs the process is allowed to run on.
+        :return: The allowed CPUs of the best core group with any of them, or None if the topology is unknown.
+        """
+
+        for cpus, _, _, _ in self._groups:
+            if cpus & allowed: return cpus & allowed
+
+        return None
+
+
+    def describe(self) -> str:
+        """
+        describe
+
+        :return: The core groups, the best one first, as pinned by affinity = "auto".
+        """
+
+        if not self._groups: return f"No CPU topology found in {self._sysfs_root}."
+
+        cores: int = sum(g[1] for g in self._groups)
+        threads: int = sum(len(g[0]) for g in self._groups)
+        lines: List[str] = [f"{self._sysfs_root}: {cores} cores, {threads} threads"]
+
+        for i, (cpus, group_cores, l3_size, max_frequency) in enumerate(self._groups):
+            lines.append(
+                f"  group {i}: CPUs {formatCPUList(cpus)}, {group_cores} cores" \
+                + (f", L3 {l3_size >> 20}MiB" if l3_size >= 1 << 20 else f", L3 {l3_size >> 10}KiB" if l3_size else ", no L3") \
+                + (f", max {max_frequency // 1000}MHz" if max_frequency else "") \
+                + (" <- affinity = \"auto\"" if i == 0 else "")
+            )
+
+        return "\n".join(lines)
@@ -0,0 +1 @@
+from utils.tracer.tracer import Tracer, tracer
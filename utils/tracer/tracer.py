@@ -0,0 +1,197 @@
+from atexit import register
+from contextlib import contextmanager
+from os import environ, getpid, path, sysconf
+from sys import stderr
+from time import CLOCK_BOOTTIME, clock_gettime_ns, perf_counter_ns
+from typing import Any, Dict, Generator, List
+
+
+class Tracer:
+    """
+    Tracer
+
+    Records high-resolution timestamps of wine-runner's startup phases and writes them
+    as a Chrome trace-event JSON file, which can be loaded in chrome://tracing or Perfetto.
+    Recording is a no-op unless it's enabled with --trace-startup or WRUNNER_TRACE.
+    """
+
+    _DEFAULT_FILENAME: str = "wrunner-trace.json"
+
+    def __init__(self):
+        self._start_ns: int                 = perf_counter_ns()
+        self._filepath: str | None          = None
+        self._events: List[Dict[str, Any]]  = []
+        self._pid: int                      = getpid()
+
+
+    def configure(self, argv: List[str]) -> None:
+        """
+        configure
+
+        Enables tracing if --trace-startup was provided, removing it from argv,
+        or if WRUNNER_TRACE is set to the trace file path (or 1 to use the default path).
+
+        :argv: List of arguments, modified in place.
+        :return:
+        """
+
+        filepath: str | None = environ.get("WRUNNER_TRACE")
+
+        if "--trace-startup" in argv:
+            argv.remove("--trace-startup")
+            filepath = filepath if filepath and filepath != "1" else self._DEFAULT_FILENAME
+        elif filepath == "1":
+            filepath = self._DEFAULT_FILENAME
+
+        if not filepath: return
+
+        # Absolute since runExe changes the current directory before the trace is written.
+        self._filepath = path.abspath(filepath)
+
+        self._recordInterpreterStart()
+        register(self.write)
+
+
+    def isEnabled(self) -> bool:
+        """
+        isEnabled
+
+        :return: True if tracing is enabled.
+        """
+
+        return self._filepath != None
+
+
+    def _recordInterpreterStart(self) -> None:
+        """
+        _recordInterpreterStart
+
+        Records the time between the process creation and the first wine-runner import.
+        The process start time only has clock tick resolution (usually 10ms).
+
+        :return:
+        """
+
+        try:
+            with open("/proc/self/stat", "rb") as fp:
+                # The process name may contain spaces, fields are counted after its closing parenthesis.
+                start_ticks: int = int(fp.read().rsplit(b")", 1)[1].split()[19])
+        except (OSError, IndexError, ValueError):
+            return
+
+        age_ns: int = clock_gettime_ns(CLOCK_BOOTTIME) - start_ticks * 1_000_000_000 // sysconf("SC_CLK_TCK")
+        process_start_ns: int = perf_counter_ns() - age_ns
+
+        self.complete("interpreter start", process_start_ns, self._start_ns)
+
+
+    def complete(self, name: str, start_ns: int, end_ns: int, args: Dict[str, Any] | None = None) -> None:
+        """
+        complete
+
+        Records a phase that has already finished.
+
+        :name: Name of the phase.
+        :start_ns: perf_counter_ns() when the phase started.
+        :end_ns: perf_counter_ns() when the phase ended.
+        :args: (Optional) Extra information displayed by the trace viewer.
+        :return:
+        """
+
+        if not self._filepath: return
+
+        self._events.append({
+            "name": name,
+            "ph": "X",
+            "ts": (start_ns - self._start_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": self._pid,
+            "args": args if args else {}
+        })
+
+
+    def instant(self, name: str, args: Dict[str, Any] | None = None) -> None:
+        """
+        instant
+
+        Records a point in time.
+
+        :name: Name of the event.
+        :args: (Optional) Extra information displayed by the trace viewer.
+        :return:
+        """
+
+        if not self._filepath: return
+
+        self._events.append({
+            "name": name,
+            "ph": "i",
+            "s": "p",
+            "ts": (perf_counter_ns() - self._start_ns) / 1000,
+            "pid": self._pid,
+            "tid": self._pid,
+            "args": args if args else {}
+        })
+
+
+    @contextmanager
+    def phase(self, name: str, args: Dict[str, Any] | None = None) -> Generator[None, None, None]:
+        """
+        phase
+
+        Records the duration of the code within the with statement.
+
+        :name: Name of the phase.
+        :args: (Optional) Extra information displayed by the trace viewer.
+        :return:
+        """
+
+        start_ns: int = perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            self.complete(name, start_ns, perf_counter_ns(), args)
+
+
+    def phaseSince(self, name: str) -> None:
+        """
+        phaseSince
+
+        Records a phase going from the creation of the tracer, the first wine-runner import, until now.
+
+        :name: Name of the phase.
+        :return:
+        """
+
+        self.complete(name, self._start_ns, perf_counter_ns())
+
+
+    def write(self) -> None:
+        """
+        write
+
+        Writes the recorded events, called at exit or right before the process image is replaced.
+
+        :return:
+        """
+
+        if not self._filepath or not self._events: return
+
+        from json import dump
+
+        try:
+            with open(self._filepath, "w") as fp:
+                dump({"traceEvents": self._events, "displayTimeUnit": "ms"}, fp)
+        except OSError as e:
+            stderr.write(f"Failed to write the startup trace to {self._filepath}: {e}\n")
+
+            return
+
+        self._events = []
+        stderr.write(f"Startup trace written to: {self._filepath}\n")
+
+
+# Shared by every module, so all phases end up in the same trace.
+tracer: Tracer = Tracer()
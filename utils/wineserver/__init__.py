@@ -0,0 +1 @@
+from utils.wineserver.wineserver import WineserverSession, getServerDirectory
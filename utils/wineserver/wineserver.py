@@ -0,0 +1,143 @@
+from os import getuid, path, stat, stat_result
+from subprocess import DEVNULL, run
+from time import monotonic, sleep
+from typing import List, Mapping
+
+
+def getServerDirectory(prefix: str) -> str | None:
+    """
+    getServerDirectory
+
+    wineserver runs from, and keeps its socket in, a directory named after the device and inode of its prefix.
+
+    :prefix: Path to the wine prefix.
+    :return: The wineserver's directory or None if the prefix doesn't exist.
+    """
+
+    try:
+        st: stat_result = stat(prefix)
+    except OSError:
+        return None
+
+    return f"/tmp/.wine-{getuid()}/server-{st.st_dev:x}-{st.st_ino:x}"
+
+
+class WineserverSession:
+    """
+    WineserverSession
+
+    Starts a persistent wineserver for a prefix, so the wine commands run afterwards connect to it
+    instead of each one starting (and loading the registry of) its own.
+    A wineserver that was already running is reused and left alone.
+
+    :wineserver_path: Path to the wineserver binary matching the wine build.
+    :prefix: Path to the wine prefix.
+    :env: Environment of the wine commands, WINEPREFIX included.
+    :persist: Seconds the wineserver stays up after the last wine process exits.
+    """
+
+    # wineserver returns once it's ready, so the socket is only polled for a short while.
+    _READY_TIMEOUT: float = 0.5
+
+    def __init__(self, wineserver_path: str, prefix: str, env: Mapping[str, str], persist: int):
+        self._wineserver_path: str      = wineserver_path
+        self._prefix: str               = prefix
+        self._env: Mapping[str, str]    = env
+        self._persist: int              = persist
+        self._started: bool             = False
+
+
+    def getPath(self) -> str:
+        """
+        getPath
+
+        :return: Path to the wineserver binary.
+        """
+
+        return self._wineserver_path
+
+
+    def isStarted(self) -> bool:
+        """
+        isStarted
+
+        :return: True if the wineserver was started by this session, and wasn't stopped since.
+        """
+
+        return self._started
+
+
+    def isRunning(self) -> bool:
+        """
+        isRunning
+
+        :return: True if a wineserver accepts connections for the prefix.
+        """
+
+        server_directory: str | None = getServerDirectory(self._prefix)
+
+        if not server_directory: return False
+
+        # Only needed when there's a session, getServerDirectory alone is imported by every launch.
+        from socket import AF_UNIX, SOCK_STREAM, socket
+
+        with socket(AF_UNIX, SOCK_STREAM) as s:
+            try:
+                s.connect(path.join(server_directory, "socket"))
+            except OSError:
+                return False
+
+        return True
+
+
+    def start(self) -> float | None:
+        """
+        start
+
+        Starts the wineserver and waits until it accepts connections.
+        wineserver only returns once its socket is bound, the socket is still polled in case it didn't.
+
+        :return: Seconds it took to be ready, 0 if it was already running, or None if it didn't start.
+        """
+
+        if self.isRunning(): return 0.0
+
+        start: float = monotonic()
+
+        try:
+            if run([self._wineserver_path, f"-p{self._persist}"], stdout = DEVNULL, stderr = DEVNULL, env = self._env).returncode != 0:
+                return None
+        except OSError:
+            return None
+
+        self._started = True
+
+        while not self.isRunning():
+            if monotonic() - start > self._READY_TIMEOUT: return None
+
+            sleep(0.005)
+
+        return monotonic() - start
+
+
+    def stop(self, kill: bool = False) -> None:
+        """
+        stop
+
+        Shuts down the wineserver if this session started it.
+
+        :kill: (Optional) Shuts it down right away, killing the prefix's wine processes left, instead of
+               waiting for them to exit and for the persist seconds to pass.
+        :return:
+        """
+
+        if not self._started: return
+
+        cmd: List[str] = [self._wineserver_path, "-k" if kill else "-w"]
+
+        try:
+            run(cmd, stdout = DEVNULL, stderr = DEVNULL, env = self._env)
+        except OSError:
+            pass
+
+        self._started = False